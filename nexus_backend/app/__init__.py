@@ -3,11 +3,14 @@
 # Initialisierungsdatei für das app-Modul
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import os
 from typing import List, Dict, Any, Optional
 import random
 
+from nexus_backend.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 # Vordefinierte Expertenprofile
@@ -106,6 +109,8 @@ def create_app() -> FastAPI:
         title="Nexus Backend",
         description="Backend-API für die Insight Synergy App",
         version="1.0.0",
+        # orjson serialisiert die (oft mehrere KB großen) Antworten schneller
+        default_response_class=ORJSONResponse if json_utils.ORJSON_AVAILABLE else JSONResponse,
     )
     
     # Health-Check-Endpunkt für Verbindungstests
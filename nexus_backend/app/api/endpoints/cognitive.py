@@ -76,6 +76,12 @@ def get_timestamp():
 openai_service = OpenAIService()
 perplexity_service = PerplexityService()
 
+@router.on_event("shutdown")
+async def close_service_clients():
+    """Schließt die HTTP-Clients der Dienste beim Herunterfahren."""
+    await openai_service.aclose()
+    await perplexity_service.aclose()
+
 # Endpunkte für Debatte
 @router.post("/debate", response_model=DebateResponse, tags=["cognitive-loop"])
 async def create_debate(request: DebateRequest):
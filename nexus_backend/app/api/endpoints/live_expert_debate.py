@@ -8,7 +8,6 @@ dynamischer Interaktion und tiefgreifenden Analysen.
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends, Body
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Union
-import json
 import asyncio
 import uuid
 from datetime import datetime
@@ -18,6 +17,7 @@ from nexus_backend.utils.logging import get_logger
 from nexus_backend.services.openai_service import OpenAIService
 from nexus_backend.services.perplexity_service import PerplexityService
 from nexus_backend.utils.adaptive_debug import debugger
+from nexus_backend.utils import json_utils
 
 # Router für Live-Expert-Debatten - WICHTIG: Diese Variable muss "router" heißen!
 router = APIRouter()
@@ -30,6 +30,12 @@ logger = get_logger("live_expert_debate_api")
 openai_service = OpenAIService()
 perplexity_service = PerplexityService()
 
+@router.on_event("shutdown")
+async def close_service_clients():
+    """Schließt die HTTP-Clients der Dienste beim Herunterfahren."""
+    await openai_service.aclose()
+    await perplexity_service.aclose()
+
 # Aktive WebSocket-Verbindungen verwalten
 active_connections: Dict[str, WebSocket] = {}
 active_debates: Dict[str, Dict[str, Any]] = {}
@@ -82,6 +88,23 @@ def get_timestamp():
     """Erzeugt einen Zeitstempel im ISO-Format."""
     return datetime.now().isoformat()
 
+async def _broadcast(debate_id: str, payload: Dict[str, Any], ignore_errors: bool = False):
+    """
+    Sendet eine Nachricht an alle Clients einer Debatte. Die Nachricht wird nur
+    einmal serialisiert statt per send_json für jede Verbindung erneut.
+    
+    Args:
+        ignore_errors: Fehler einzelner (z.B. bereits geschlossener) Verbindungen ignorieren
+    """
+    text = json_utils.dumps(payload)
+    for conn_id, conn in list(active_connections.items()):
+        if conn_id.startswith(debate_id):
+            try:
+                await conn.send_text(text)
+            except Exception:
+                if not ignore_errors:
+                    raise
+
 async def get_expert_response(topic: str, context: str, expert: ExpertProfile, 
                              messages: List[DebateMessage], debate_id: str) -> str:
     """Generiert eine Expertenantwort basierend auf dem Kontext und bisherigen Nachrichten."""
@@ -103,23 +126,22 @@ async def get_expert_response(topic: str, context: str, expert: ExpertProfile,
         5. Halte Antworten knapp und fokussiert (max. 3 Absätze)
         """
         
-        # Konversationsverlauf aufbauen
-        conversation_history = f"Thema: {topic}\n\nKontext: {context}\n\n"
+        # Konversationsverlauf als Liste aufbauen und einmal zusammenfügen
+        history_parts = [f"Thema: {topic}\n\nKontext: {context}\n\n"]
         
         # Nur die letzten 10 Nachrichten berücksichtigen
-        recent_messages = messages[-10:] if len(messages) > 10 else messages
-        
-        for msg in recent_messages:
-            sender = msg.sender
+        for msg in messages[-10:]:
             sender_type = msg.sender_type
             content = msg.content.text
             
             if sender_type == "expert":
-                conversation_history += f"{sender}: {content}\n\n"
+                history_parts.append(f"{msg.sender}: {content}\n\n")
             elif sender_type == "user":
-                conversation_history += f"Benutzer: {content}\n\n"
+                history_parts.append(f"Benutzer: {content}\n\n")
             elif sender_type == "system":
-                conversation_history += f"[System: {content}]\n\n"
+                history_parts.append(f"[System: {content}]\n\n")
+        
+        conversation_history = "".join(history_parts)
         
         # Anfrage an LLM senden
         response = await openai_service.get_completion(
@@ -224,7 +246,7 @@ async def websocket_live_debate(websocket: WebSocket, debate_id: str):
         # Auf Nachrichten warten
         while True:
             data = await websocket.receive_text()
-            message_data = json.loads(data)
+            message_data = json_utils.loads(data)
             
             message_type = message_data.get("type", "")
             
@@ -247,12 +269,10 @@ async def websocket_live_debate(websocket: WebSocket, debate_id: str):
                 debate_data["status"].last_activity = get_timestamp()
                 
                 # Allen verbundenen Clients die Nachricht senden
-                for conn_id, conn in active_connections.items():
-                    if conn_id.startswith(debate_id):
-                        await conn.send_json({
-                            "type": "new_message",
-                            "data": user_message.dict()
-                        })
+                await _broadcast(debate_id, {
+                    "type": "new_message",
+                    "data": user_message.dict()
+                })
                 
                 # Expertenantworten generieren (asynchron)
                 asyncio.create_task(
@@ -329,31 +349,23 @@ async def process_expert_responses(debate_id: str, debate_status: DebateStatus,
             debate_status.last_activity = get_timestamp()
             
             # Allen verbundenen Clients die Nachricht senden
-            for conn_id, conn in active_connections.items():
-                if conn_id.startswith(debate_id):
-                    await conn.send_json({
-                        "type": "new_message",
-                        "data": expert_message.dict()
-                    })
+            await _broadcast(debate_id, {
+                "type": "new_message",
+                "data": expert_message.dict()
+            })
     
     except Exception as e:
         logger.error(f"Fehler bei der Verarbeitung der Expertenantworten: {str(e)}")
         error_id = debugger.log_error(e, f"process_expert_responses:{debate_id}")
         
         # Fehlermeldung an alle verbundenen Clients senden
-        for conn_id, conn in active_connections.items():
-            if conn_id.startswith(debate_id):
-                try:
-                    await conn.send_json({
-                        "type": "error",
-                        "data": {
-                            "message": f"Fehler bei der Generierung der Expertenantworten: {str(e)}",
-                            "error_id": error_id
-                        }
-                    })
-                except:
-                    # Falls Verbindung bereits geschlossen ist
-                    pass
+        await _broadcast(debate_id, {
+            "type": "error",
+            "data": {
+                "message": f"Fehler bei der Generierung der Expertenantworten: {str(e)}",
+                "error_id": error_id
+            }
+        }, ignore_errors=True)
 
 async def generate_live_debate_summary(debate_id: str):
     """Generiert eine Zusammenfassung der aktuellen Debatte."""
@@ -404,31 +416,23 @@ async def generate_live_debate_summary(debate_id: str):
         debate_status.messages.append(summary_message)
         
         # Allen verbundenen Clients die Nachricht senden
-        for conn_id, conn in active_connections.items():
-            if conn_id.startswith(debate_id):
-                await conn.send_json({
-                    "type": "summary",
-                    "data": summary_message.dict()
-                })
+        await _broadcast(debate_id, {
+            "type": "summary",
+            "data": summary_message.dict()
+        })
     
     except Exception as e:
         logger.error(f"Fehler bei der Generierung der Zusammenfassung: {str(e)}")
         error_id = debugger.log_error(e, f"generate_summary:{debate_id}")
         
         # Fehlermeldung an alle verbundenen Clients senden
-        for conn_id, conn in active_connections.items():
-            if conn_id.startswith(debate_id):
-                try:
-                    await conn.send_json({
-                        "type": "error",
-                        "data": {
-                            "message": f"Fehler bei der Generierung der Zusammenfassung: {str(e)}",
-                            "error_id": error_id
-                        }
-                    })
-                except:
-                    # Falls Verbindung bereits geschlossen ist
-                    pass
+        await _broadcast(debate_id, {
+            "type": "error",
+            "data": {
+                "message": f"Fehler bei der Generierung der Zusammenfassung: {str(e)}",
+                "error_id": error_id
+            }
+        }, ignore_errors=True)
 
 @router.post("/live-debate/{debate_id}/complete", tags=["live-expert-debate"])
 async def complete_live_debate(debate_id: str):
@@ -451,19 +455,13 @@ async def complete_live_debate(debate_id: str):
         await generate_live_debate_summary(debate_id)
         
         # Allen verbundenen Clients die Statusänderung mitteilen
-        for conn_id, conn in active_connections.items():
-            if conn_id.startswith(debate_id):
-                try:
-                    await conn.send_json({
-                        "type": "status_change",
-                        "data": {
-                            "status": "completed",
-                            "message": "Die Debatte wurde beendet."
-                        }
-                    })
-                except:
-                    # Falls Verbindung bereits geschlossen ist
-                    pass
+        await _broadcast(debate_id, {
+            "type": "status_change",
+            "data": {
+                "status": "completed",
+                "message": "Die Debatte wurde beendet."
+            }
+        }, ignore_errors=True)
         
         return {
             "status": "success",
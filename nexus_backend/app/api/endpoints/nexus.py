@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from nexus_backend.utils import json_utils
+from ...services.nexus_service import NexusService
 from ...services.service_factory import get_nexus_service
 
 router = APIRouter()
-nexus_service = get_nexus_service()
 
 # Pydantic-Modelle für Request und Response
 class NexusRequest(BaseModel):
@@ -15,6 +17,9 @@ class NexusRequest(BaseModel):
     max_tokens: Optional[int] = Field(3000, description="Maximale Anzahl der Tokens in der Antwort")
 
 class NexusResponse(BaseModel):
+    # Feste Feldmenge: unerwartete Schlüssel werden bei der Validierung abgelehnt
+    model_config = ConfigDict(extra="forbid")
+    
     solution: str = Field(..., description="Die generierte Lösung")
     steps: List[str] = Field(..., description="Die durchgeführten Analyseschritte")
     references: Optional[List[str]] = Field(None, description="Verwendete Referenzen")
@@ -22,14 +27,14 @@ class NexusResponse(BaseModel):
 
 # Alias for /solve -> /solution für Frontend-Kompatibilität
 @router.post("/solution", response_model=NexusResponse, summary="Lösung mit The Nexus generieren")
-async def generate_solution_alias(request: NexusRequest):
+async def generate_solution_alias(request: NexusRequest, nexus_service: NexusService = Depends(get_nexus_service)):
     """
     Generiert eine strukturierte Lösung mit The Nexus (alias für /solve)
     """
-    return await generate_solution(request)
+    return await generate_solution(request, nexus_service)
 
 @router.post("/solve", response_model=NexusResponse, summary="Lösung mit The Nexus generieren")
-async def generate_solution(request: NexusRequest):
+async def generate_solution(request: NexusRequest, nexus_service: NexusService = Depends(get_nexus_service)):
     """
     Generiert eine strukturierte Lösung mit The Nexus
     
@@ -74,7 +79,7 @@ async def generate_solution(request: NexusRequest):
         }
 
 @router.post("/analyze", response_model=NexusResponse, summary="Analysiert ein komplexes Problem mit The Nexus")
-async def analyze_problem(request: NexusRequest):
+async def analyze_problem(request: NexusRequest, nexus_service: NexusService = Depends(get_nexus_service)):
     """
     Führt eine tiefgehende Analyse eines komplexen Problems durch
     """
@@ -112,8 +117,60 @@ async def analyze_problem(request: NexusRequest):
             "model": "Dummy-Modell"
         }
 
+@router.post("/analyze/bulk", response_model=List[NexusResponse], summary="Analysiert mehrere Probleme mit The Nexus")
+async def bulk_analyze(requests: List[NexusRequest], nexus_service: NexusService = Depends(get_nexus_service)):
+    """
+    Analysiert mehrere Probleme gemeinsam; mehrere Anfragen werden pro
+    Modellaufruf zusammengefasst, die Antworten behalten die Reihenfolge bei
+    """
+    responses = await nexus_service.bulk_analyze(requests)
+    return [
+        {
+            "solution": response.solution,
+            "steps": response.steps,
+            "references": response.references or [],
+            "model": response.model
+        }
+        for response in responses
+    ]
+
+async def _sse_events(events):
+    """
+    Wandelt Stream-Ereignisse in Server-Sent Events um. Bricht der Stream ab, wird
+    statt "[DONE]" ein Ereignis mit "error" gesendet.
+    """
+    try:
+        async for event in events:
+            yield f"data: {json_utils.dumps(event)}\n\n"
+    except Exception as e:
+        yield f"data: {json_utils.dumps({'error': str(e), 'done': True})}\n\n"
+        return
+    yield "data: [DONE]\n\n"
+
+@router.post("/solve/stream", summary="Lösung mit The Nexus streamen")
+async def stream_solution(request: NexusRequest, nexus_service: NexusService = Depends(get_nexus_service)):
+    """
+    Streamt eine Lösung als Server-Sent Events; jedes Event enthält das neue
+    Text-Fragment ("delta") und die neu extrahierten Schritte ("partial_steps")
+    """
+    return StreamingResponse(
+        _sse_events(nexus_service.stream_solution_deltas(request)),
+        media_type="text/event-stream"
+    )
+
+@router.post("/analyze/stream", summary="Analyse mit The Nexus streamen")
+async def stream_analysis(request: NexusRequest, nexus_service: NexusService = Depends(get_nexus_service)):
+    """
+    Streamt eine Analyse als Server-Sent Events; jedes Event enthält das neue
+    Text-Fragment ("delta") und die neu extrahierten Schritte ("partial_steps")
+    """
+    return StreamingResponse(
+        _sse_events(nexus_service.stream_analysis_deltas(request)),
+        media_type="text/event-stream"
+    )
+
 @router.get("/status", summary="Prüft den Status des Nexus-Services")
-async def check_status():
+async def check_status(nexus_service: NexusService = Depends(get_nexus_service)):
     """
     Prüft den Status des Nexus-Services und der verwendeten Modelle
     """
@@ -30,11 +30,20 @@ class APIConfig(BaseSettings):
     # Rate Limiting Konfiguration
     RATE_LIMIT_PERPLEXITY: int = int(os.getenv("RATE_LIMIT_PERPLEXITY", "60"))  # Anfragen pro Minute
     RATE_LIMIT_OPENAI: int = int(os.getenv("RATE_LIMIT_OPENAI", "100"))         # Anfragen pro Minute
+    # Rate Limits über alle Worker-Prozesse hinweg gemeinsam zählen
+    RATE_LIMIT_SHARED: bool = os.getenv("RATE_LIMIT_SHARED", "false").lower() == "true"
     
     # Fallback Konfiguration
     ENABLE_MODEL_FALLBACK: bool = os.getenv("ENABLE_MODEL_FALLBACK", "true").lower() == "true"
     ENABLE_INSIGHT_CORE_FALLBACK: bool = os.getenv("ENABLE_INSIGHT_CORE_FALLBACK", "true").lower() == "true"
     MAX_FALLBACK_ATTEMPTS: int = int(os.getenv("MAX_FALLBACK_ATTEMPTS", "2"))
+    # Sekunden ohne Antwort, nach denen die nächste Fallback-Stufe parallel gestartet wird
+    FALLBACK_HEDGE_DELAY: float = float(os.getenv("FALLBACK_HEDGE_DELAY", "10"))
+    # Circuit Breaker: Anbieter nach so vielen Fehlern in Folge für RESET_TIMEOUT Sekunden überspringen
+    CIRCUIT_BREAKER_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "3"))
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "30"))
+    # NexusService: Fallback-Anbieter gestaffelt parallel starten statt strikt nacheinander
+    NEXUS_HEDGED_FALLBACK: bool = os.getenv("NEXUS_HEDGED_FALLBACK", "false").lower() == "true"
     
     # Insight Synergy Core Konfiguration
     IS_CORE_ENABLED: bool = os.getenv("ENABLE_INSIGHT_CORE", "false").lower() == "true"
@@ -47,6 +56,32 @@ class APIConfig(BaseSettings):
     ALWAYS_USE_PERPLEXITY_FIRST: bool = os.getenv("ALWAYS_USE_PERPLEXITY_FIRST", "true").lower() == "true"
     COMBINE_PERPLEXITY_WITH_OPENAI: bool = os.getenv("COMBINE_PERPLEXITY_WITH_OPENAI", "true").lower() == "true"
     MAX_CONTEXT_LENGTH: int = int(os.getenv("MAX_CONTEXT_LENGTH", "12000"))
+    # Micro-Batching im NexusService (1 = deaktiviert)
+    NEXUS_MAX_BATCH_SIZE: int = int(os.getenv("NEXUS_MAX_BATCH_SIZE", "1"))
+    NEXUS_BATCH_WINDOW_MS: int = int(os.getenv("NEXUS_BATCH_WINDOW_MS", "25"))
+    # Analyse-Anfragen eines Batches zu gemeinsamen Prompts zusammenfassen
+    NEXUS_BATCH_PACK: bool = os.getenv("NEXUS_BATCH_PACK", "false").lower() == "true"
+    # Maximale Anzahl gleichzeitiger Modell-Anfragen des NexusService
+    NEXUS_MAX_INFLIGHT: int = int(os.getenv("NEXUS_MAX_INFLIGHT", "32"))
+    # Beim Start die Anbieter anpingen, um Verbindungen (TCP/TLS) vorzuwärmen
+    NEXUS_WARMUP_PING: bool = os.getenv("NEXUS_WARMUP_PING", "false").lower() == "true"
+    # Sekunden nach einer erfolgreichen Modellantwort, in denen is_available ohne Prüfung True liefert
+    NEXUS_AVAILABILITY_TTL: float = float(os.getenv("NEXUS_AVAILABILITY_TTL", "30"))
+    # Zeitlimit pro Modell-Probe der Statusabfrage in Sekunden
+    STATUS_PROBE_TIMEOUT: float = float(os.getenv("STATUS_PROBE_TIMEOUT", "5"))
+    # Simulierte Verarbeitungszeit der Demo-Antworten in Sekunden
+    NEXUS_DEMO_DELAY: float = float(os.getenv("NEXUS_DEMO_DELAY", "0"))
+    # Obergrenze pro Kontextteil in Tokens (wird verwendet, wenn tiktoken installiert ist)
+    MAX_CONTEXT_TOKENS: int = int(os.getenv("MAX_CONTEXT_TOKENS", "3000"))
+    
+    # Antwort-Cache Konfiguration (In-Process, LRU mit TTL)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))  # Sekunden
+    # Semantischer Cache: Treffer auch für ähnlich formulierte Anfragen (benötigt sentence-transformers)
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_MODEL: str = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
     
     model_config = {
         "env_file": ".env",
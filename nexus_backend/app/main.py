@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from typing import List, Optional, Dict, Any, Union
 import os
@@ -15,6 +15,7 @@ from .core.config import settings
 from .core.logging import setup_logger
 from .services.service_factory import get_nexus_service
 from .middleware import AdaptiveDebugMiddleware, RequestContextMiddleware
+from nexus_backend.utils import json_utils
 
 logger = setup_logger()
 
@@ -23,6 +24,8 @@ app = FastAPI(
     title="Nexus Backend",
     description="Backend API for the Nexus AI application",
     version="0.1.0",
+    # orjson serialisiert die (oft mehrere KB großen) Antworten schneller
+    default_response_class=ORJSONResponse if json_utils.ORJSON_AVAILABLE else JSONResponse,
 )
 
 # Configure CORS
@@ -46,12 +49,21 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Get services from factory
-nexus_service = get_nexus_service()
-
 # Include API router
 app.include_router(api_router, prefix="/api")
 
+@app.on_event("startup")
+async def warmup_services():
+    """Lädt Templates und baut Verbindungen vor der ersten Anfrage auf"""
+    await get_nexus_service().warmup()
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    """Schließt die gemeinsamen HTTP-Verbindungen der Services"""
+    # Nur schließen, wenn der Service tatsächlich erstellt wurde
+    if get_nexus_service.cache_info().currsize:
+        await get_nexus_service().close()
+
 # Direkte Experten-Profile-Endpunkte
 EXPERT_PROFILES = [
     {
@@ -289,5 +301,7 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        workers=settings.WORKERS
+        workers=settings.WORKERS,
+        # "auto" verwendet uvloop, sofern installiert (uvicorn[standard])
+        loop="auto"
     ) 
\ No newline at end of file
@@ -1,45 +1,516 @@
 import aiohttp
 import asyncio
-import json
 import time
+import random
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, AsyncIterator
 
 from ..core.api_config import api_config
+from nexus_backend.utils import json_utils
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Statuscodes, bei denen ein erneuter Versuch sinnvoll ist (vorübergehende Fehler)
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Exponentielles Backoff: min(CAP, BASE * 2^Versuch) + Zufallsanteil bis JITTER (Sekunden)
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 30.0
+BACKOFF_JITTER = 0.25
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Liest einen Retry-After-Header in Sekunden (HTTP-Datumsangaben werden ignoriert)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+async def _sleep_before_retry(attempt: int, retry_after: Optional[float], deadline: float) -> bool:
+    """
+    Wartet vor dem nächsten Versuch. Gibt False zurück, wenn die Wartezeit
+    die Deadline überschreiten würde und kein weiterer Versuch erfolgen soll.
+    """
+    if retry_after is not None:
+        delay = retry_after
+    else:
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+    
+    if asyncio.get_running_loop().time() + delay > deadline:
+        logger.warning(f"Kein weiterer Versuch: Wartezeit von {delay:.2f}s überschreitet die Deadline")
+        return False
+    
+    await asyncio.sleep(delay)
+    return True
+
+# Tokenizer je Modellname; wird einmalig im Hintergrund gefüllt (siehe _load_encodings)
+_ENCODINGS: Dict[str, Any] = {}
+_DEFAULT_ENCODING = "cl100k_base"
+
+def _load_encodings() -> None:
+    """
+    Lädt die Tokenizer für die konfigurierten Modelle einmalig. tiktoken lädt die
+    Kodierungsdateien beim ersten Zugriff ggf. aus dem Netz; das läuft deshalb in
+    einem eigenen Thread und nie in der Event-Loop. Schlägt das Laden fehl, bleibt
+    die Tabelle leer und _split_context teilt nach Zeichenlänge.
+    """
+    try:
+        default = tiktoken.get_encoding(_DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"Tokenizer nicht verfügbar, verwende Zeichenlänge: {str(e)}")
+        return
+    
+    encodings = {_DEFAULT_ENCODING: default}
+    for model in {api_config.PRIMARY_MODEL, api_config.FALLBACK_MODEL}:
+        try:
+            encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unbekannte Modellnamen verwenden die Standard-Kodierung der Chat-Modelle
+            pass
+        except Exception as e:
+            logger.warning(f"Tokenizer für {model} nicht verfügbar, verwende Standard-Kodierung: {str(e)}")
+    _ENCODINGS.update(encodings)
+
+if TIKTOKEN_AVAILABLE:
+    threading.Thread(target=_load_encodings, name="nexus-tiktoken", daemon=True).start()
+
+def _get_encoding(model: str):
+    """Liefert den geladenen Tokenizer für ein Modell oder None, solange keiner verfügbar ist"""
+    return _ENCODINGS.get(model) or _ENCODINGS.get(_DEFAULT_ENCODING)
+
+def _split_context(context: str, model: str) -> List[str]:
+    """
+    Teilt den Kontext in Abschnitte auf, die einzeln an das Modell gesendet werden.
+    Mit tiktoken wird exakt an Token-Grenzen geteilt, sonst nach Absätzen anhand der Zeichenlänge.
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        max_tokens = api_config.MAX_CONTEXT_TOKENS
+        tokens = encoding.encode(context)
+        if len(tokens) <= max_tokens:
+            return [context]
+        return [
+            encoding.decode(tokens[i:i + max_tokens])
+            for i in range(0, len(tokens), max_tokens)
+        ]
+    
+    max_context_length = api_config.MAX_CONTEXT_LENGTH
+    if len(context) <= max_context_length:
+        return [context]
+    
+    # Einfache Aufteilung nach Absätzen, falls der Kontext zu groß ist
+    # Absätze werden in einer Liste gesammelt und erst beim Abschluss
+    # eines Teils verbunden (linear statt wiederholter String-Kopien)
+    context_parts = []
+    current_part: List[str] = []
+    current_length = 0
+    
+    for paragraph in context.split("\n\n"):
+        paragraph_length = len(paragraph) + 2
+        if current_length + paragraph_length > max_context_length and current_part:
+            context_parts.append("".join(current_part))
+            current_part = []
+            current_length = 0
+        current_part.append(paragraph)
+        current_part.append("\n\n")
+        current_length += paragraph_length
+    
+    if current_part:
+        context_parts.append("".join(current_part))
+    return context_parts
+
+def _extract_stream_delta(chunk: Dict[str, Any]) -> Optional[str]:
+    """Liest das Text-Fragment aus einem Chunk einer Streaming-Antwort"""
+    choices = chunk.get("choices")
+    if not choices:
+        return None
+    return choices[0].get("delta", {}).get("content")
+
+async def run_hedged(
+    tiers: List[Tuple[str, Callable[[], Awaitable[Optional[Any]]]]],
+    hedge_delay: float,
+    first_wins: bool = False
+) -> Tuple[Optional[str], Optional[Any]]:
+    """
+    Führt die Stufen gestaffelt parallel aus.
+    
+    Die nächste Stufe startet, sobald eine laufende fehlschlägt oder nach
+    hedge_delay Sekunden noch keine Antwort vorliegt. Zurückgegeben wird die
+    Antwort der höchsten Stufe, die erfolgreich war (mit first_wins die erste
+    erfolgreiche Antwort); die übrigen Anfragen werden dann abgebrochen.
+    """
+    tasks: List[asyncio.Future] = []
+    results: Dict[int, Optional[Any]] = {}
+    
+    def start_next():
+        name, factory = tiers[len(tasks)]
+        if tasks:
+            logger.info(f"Starte Fallback-Stufe {name}")
+        tasks.append(asyncio.ensure_future(factory()))
+    
+    start_next()
+    try:
+        while len(results) < len(tiers):
+            pending = [task for task in tasks if not task.done()]
+            can_hedge = len(tasks) < len(tiers)
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if can_hedge else None,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            
+            if not done:
+                # Keine Antwort innerhalb der Hedging-Verzögerung
+                start_next()
+                continue
+            
+            for task in done:
+                index = tasks.index(task)
+                try:
+                    results[index] = task.result()
+                except Exception as e:
+                    logger.error(f"Fehler in Stufe {tiers[index][0]}: {str(e)}")
+                    results[index] = None
+                if results[index] is None and len(tasks) < len(tiers):
+                    start_next()
+                elif results[index] is not None and first_wins:
+                    return tiers[index][0], results[index]
+            
+            # Die höchste Stufe gewinnt, sobald alle höheren Stufen fehlgeschlagen sind
+            for index in range(len(tasks)):
+                if index not in results:
+                    break
+                if results[index] is not None:
+                    return tiers[index][0], results[index]
+        
+        return None, None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
 class RateLimiter:
-    """Rate Limiter für API-Anfragen"""
+    """Rate Limiter für API-Anfragen (Token-Bucket)"""
     
     def __init__(self, max_requests: int, time_window: int = 60):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
+        # Bucket startet voll; Nachfüllrate in Tokens pro Sekunde
+        self.tokens = float(max_requests)
+        self.rate = max_requests / time_window
+        # Zeitbasis ist die Uhr der laufenden Event-Loop; wird beim ersten acquire() gesetzt
+        self.last_refill: Optional[float] = None
         
     async def acquire(self):
         """Prüft und aktualisiert das Rate Limit"""
-        now = datetime.now()
-        self.requests = [ts for ts in self.requests if now - ts < timedelta(seconds=self.time_window)]
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.last_refill is None:
+            self.last_refill = now
+        self.tokens = min(self.max_requests, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
         
-        if len(self.requests) >= self.max_requests:
-            sleep_time = (self.requests[0] + timedelta(seconds=self.time_window) - now).total_seconds()
-            if sleep_time > 0:
-                logger.warning(f"Rate limit erreicht. Warte {sleep_time:.2f} Sekunden...")
-                await asyncio.sleep(sleep_time)
+        # Token vor dem Warten reservieren: der Stand darf negativ werden, sodass
+        # gleichzeitig wartende Aufrufer nacheinander statt gemeinsam an die Reihe kommen
+        self.tokens -= 1
+        if self.tokens < 0:
+            sleep_time = -self.tokens / self.rate
+            logger.warning(f"Rate limit erreicht. Warte {sleep_time:.2f} Sekunden...")
+            await asyncio.sleep(sleep_time)
+
+class SharedRateLimiter:
+    """
+    Token-Bucket, dessen Zustand sich alle Worker-Prozesse teilen.
+    
+    Token-Stand und Zeitpunkt der letzten Nachfüllung liegen in einer per mmap
+    eingeblendeten Datei; Änderungen erfolgen unter einer fcntl-Dateisperre, die
+    nur für das Lesen und Schreiben der beiden Werte gehalten wird. Die Datei liegt
+    pro Benutzer im Temp-Verzeichnis, sodass sich nur Prozesse desselben Benutzers
+    einen Bucket teilen.
+    """
+    
+    # tokens (double), last_refill (double, time.time); die Wanduhr bleibt auch über
+    # Neustarts hinweg vergleichbar, anders als time.monotonic
+    _STATE = struct.Struct("dd")
+    
+    def __init__(self, name: str, max_requests: int, time_window: int = 60):
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self.rate = max_requests / time_window
+        self.path = os.path.join(tempfile.gettempdir(), f"nexus_ratelimit_{os.getuid()}_{name}.bin")
         
-        self.requests.append(now)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, "r+b")
+        try:
+            with self._locked():
+                if os.fstat(fd).st_size < self._STATE.size:
+                    # Erster Prozess: Bucket startet voll
+                    os.ftruncate(fd, self._STATE.size)
+                    os.pwrite(fd, self._STATE.pack(float(max_requests), time.time()), 0)
+            self._state = mmap.mmap(fd, self._STATE.size)
+        except BaseException:
+            self._file.close()
+            raise
+        # Datei und mmap werden mit close() oder spätestens beim Beenden freigegeben
+        self._finalizer = weakref.finalize(self, SharedRateLimiter._close_handles, self._state, self._file)
+        # Serialisiert die Zugriffe innerhalb des Prozesses; flock-Sperren gelten pro
+        # Dateibeschreibung und schützen nur gegen andere Prozesse
+        self._process_lock = asyncio.Lock()
+    
+    @staticmethod
+    def _close_handles(state: mmap.mmap, file) -> None:
+        state.close()
+        file.close()
+    
+    def close(self):
+        """Gibt mmap und Dateihandle frei"""
+        self._finalizer()
+    
+    @contextmanager
+    def _locked(self, blocking: bool = True):
+        """
+        Sperrt die Zustandsdatei exklusiv für die Dauer des with-Blocks. Ohne
+        blocking wird BlockingIOError ausgelöst, wenn ein anderer Prozess sie hält.
+        """
+        fcntl.flock(self._file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+    
+    def _take(self, blocking: bool = True) -> float:
+        """Entnimmt ein Token; gibt 0 zurück oder die Wartezeit bis zum nächsten Token"""
+        with self._locked(blocking):
+            tokens, last_refill = self._STATE.unpack_from(self._state)
+            now = time.time()
+            # Eine zurückgestellte Uhr darf den Bucket nicht ins Minus treiben
+            elapsed = max(0.0, now - last_refill)
+            tokens = min(self.max_requests, max(0.0, tokens) + elapsed * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._STATE.pack_into(self._state, 0, tokens, now)
+        return wait
+    
+    async def acquire(self):
+        """Prüft und aktualisiert das prozessübergreifende Rate Limit"""
+        while True:
+            async with self._process_lock:
+                try:
+                    sleep_time = self._take(blocking=False)
+                except BlockingIOError:
+                    # Ein anderer Worker hält die Sperre: im Thread warten statt die Event-Loop zu blockieren
+                    sleep_time = await asyncio.to_thread(self._take)
+            if not sleep_time:
+                return
+            logger.warning(f"Rate limit erreicht. Warte {sleep_time:.2f} Sekunden...")
+            await asyncio.sleep(sleep_time)
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(name: str, max_requests: int, time_window: int = 60):
+    """
+    Liefert den Rate Limiter für einen Upstream-Dienst (eine Instanz pro Prozess).
+    Mit RATE_LIMIT_SHARED teilen sich alle Worker-Prozesse denselben Bucket.
+    """
+    if api_config.RATE_LIMIT_SHARED:
+        if FCNTL_AVAILABLE:
+            return SharedRateLimiter(name, max_requests, time_window)
+        logger.warning("RATE_LIMIT_SHARED wird auf dieser Plattform nicht unterstützt, verwende lokalen Rate Limiter")
+    return RateLimiter(max_requests, time_window)
+
+class ResponseCache:
+    """LRU-Cache mit TTL für erfolgreiche API-Antworten"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Erzeugt einen stabilen Schlüssel aus den Anfrageparametern"""
+        raw = json_utils.dumps_bytes(payload, sort_keys=True)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Liefert einen gültigen Eintrag oder None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any):
+        """Speichert einen Eintrag und verdrängt bei Bedarf den ältesten"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class APIClient:
     """Client für externe API-Anfragen mit Rate Limiting und Fallback"""
     
+    # Feste System-Nachrichten; pro Anfrage variiert nur die Nutzer-Nachricht
+    PERPLEXITY_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": "Du bist ein Experte für detaillierte Faktenrecherche. Führe eine gründliche Recherche durch und fasse die wichtigsten Fakten und Informationen zusammen."
+    }
+    
+    # Optimierter System-Prompt für faktenbasierte Antworten mit o1/4o mini
+    OPENAI_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": """Du bist eine präzise und faktenorientierte KI, die ausschließlich auf verifizierte Informationen zurückgreift.
+- Beziehe dich nur auf die bereitgestellten Rechercheergebnisse
+- Strukturiere deine Antwort klar und verständlich
+- Wenn du etwas nicht aus den Rechercheergebnissen ableiten kannst, gib ehrlich an, dass du es nicht weißt
+- Füge keine spekulativen Informationen hinzu"""
+    }
+    
+    # System-Prompt für faktenbezogene Antworten von IS Core
+    IS_CORE_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": "Du bist eine KI, die ausschließlich auf fundierte Fakten basiert."
+    }
+    
     def __init__(self):
-        self.perplexity_limiter = RateLimiter(api_config.RATE_LIMIT_PERPLEXITY)
-        self.openai_limiter = RateLimiter(api_config.RATE_LIMIT_OPENAI)
+        self.perplexity_limiter = get_rate_limiter("perplexity", api_config.RATE_LIMIT_PERPLEXITY)
+        self.openai_limiter = get_rate_limiter("openai", api_config.RATE_LIMIT_OPENAI)
+        # Gemeinsame Session (Connection-Pool mit Keep-Alive), wird beim ersten Aufruf erstellt
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Antwort-Cache und laufende Anfragen (gleiche Anfragen werden zusammengeführt)
+        self._cache = ResponseCache(api_config.RESPONSE_CACHE_SIZE, api_config.RESPONSE_CACHE_TTL)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Anzahl der Aufrufer, die auf eine laufende Anfrage warten
+        self._inflight_waiters: Dict[asyncio.Future, int] = {}
+        # Vorab serialisierte Payload-Präfixe pro (Modell, Streaming)
+        self._openai_payload_prefixes: Dict[Tuple[str, bool], bytes] = {}
+        # Header ändern sich zur Laufzeit nicht und werden nur einmal gebaut
+        self._perplexity_headers = {
+            "Authorization": f"Bearer {api_config.PERPLEXITY_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        self._openai_headers = {
+            "Authorization": f"Bearer {api_config.OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        }
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Liefert die gemeinsame HTTP-Session und erstellt sie bei Bedarf neu"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                json_serialize=json_utils.dumps
+            )
+        return self._session
+    
+    async def close(self):
+        """Schließt die gemeinsame HTTP-Session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _cached(
+        self,
+        payload: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """
+        Liefert eine gecachte Antwort oder führt die Anfrage aus.
+        Identische Anfragen, die gleichzeitig laufen, teilen sich ein Ergebnis.
+        Die gemeinsame Anfrage wird abgebrochen, sobald der letzte wartende
+        Aufrufer abbricht (z.B. eine verlorene Stufe in run_hedged).
+        """
+        if not api_config.RESPONSE_CACHE_ENABLED:
+            return await fetch()
+        
+        key = ResponseCache.make_key(payload)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Antwort aus dem Cache geliefert")
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # shield: Abbruch eines Aufrufers bricht die gemeinsame Anfrage nicht ab,
+        # solange noch andere Aufrufer auf sie warten
+        self._inflight_waiters[task] = self._inflight_waiters.get(task, 0) + 1
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            waiters = self._inflight_waiters.pop(task) - 1
+            if waiters:
+                self._inflight_waiters[task] = waiters
+            elif not task.done():
+                task.cancel()
+        if result is not None:
+            self._cache.set(key, result)
+        return result
     
     async def fetch_facts(self, query: str) -> Optional[str]:
         """Holt Fakten von der Perplexity API mit dem sonar-deep-research Modell"""
+        payload = {
+            "api": "perplexity",
+            "model": api_config.PERPLEXITY_MODEL,
+            "query": query,
+            "temperature": api_config.PERPLEXITY_TEMPERATURE,
+            "max_tokens": api_config.PERPLEXITY_MAX_TOKENS
+        }
+        return await self._cached(payload, lambda: self._fetch_facts(query))
+    
+    async def _fetch_facts(self, query: str) -> Optional[str]:
+        """Führt die Perplexity-Anfrage ohne Cache aus"""
         if not api_config.PERPLEXITY_API_KEY:
             logger.warning("Perplexity API Key nicht konfiguriert")
             return None
@@ -47,11 +518,6 @@ class APIClient:
         try:
             await self.perplexity_limiter.acquire()
             
-            headers = {
-                "Authorization": f"Bearer {api_config.PERPLEXITY_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
             # Optimierter Prompt für Perplexity sonar-deep-research
             research_query = f"Führe eine umfassende Recherche zu folgender Anfrage durch und erstelle einen detaillierten Bericht mit allen relevanten Fakten, Daten und Informationen: {query}"
             
@@ -59,53 +525,57 @@ class APIClient:
             data = {
                 "model": api_config.PERPLEXITY_MODEL,
                 "messages": [
-                    {"role": "system", "content": "Du bist ein Experte für detaillierte Faktenrecherche. Führe eine gründliche Recherche durch und fasse die wichtigsten Fakten und Informationen zusammen."},
+                    self.PERPLEXITY_SYSTEM_MESSAGE,
                     {"role": "user", "content": research_query}
                 ],
                 "temperature": api_config.PERPLEXITY_TEMPERATURE,
                 "max_tokens": api_config.PERPLEXITY_MAX_TOKENS
             }
             
-            async with aiohttp.ClientSession() as session:
-                for attempt in range(api_config.PERPLEXITY_MAX_RETRIES):
-                    try:
-                        async with session.post(
-                            f"{api_config.PERPLEXITY_API_BASE}/chat/completions",
-                            headers=headers,
-                            json=data,
-                            timeout=api_config.PERPLEXITY_TIMEOUT
-                        ) as response:
-                            if response.status == 200:
-                                result = await response.json()
+            session = await self._get_session()
+            max_retries = api_config.PERPLEXITY_MAX_RETRIES
+            deadline = asyncio.get_running_loop().time() + api_config.PERPLEXITY_TIMEOUT * max_retries
+            for attempt in range(max_retries):
+                retry_after = None
+                try:
+                    async with session.post(
+                        f"{api_config.PERPLEXITY_API_BASE}/chat/completions",
+                        headers=self._perplexity_headers,
+                        json=data,
+                        timeout=api_config.PERPLEXITY_TIMEOUT
+                    ) as response:
+                        if response.status == 200:
+                            result = json_utils.loads(await response.read())
+                            
+                            # Extrahiere die Antwort aus dem Chat-Completion-Format
+                            if result and "choices" in result and len(result["choices"]) > 0:
+                                facts = result["choices"][0]["message"]["content"]
+                                
+                                # Formatiere die Fakten für bessere Lesbarkeit
+                                formatted_facts = "## RECHERCHEERGEBNISSE:\n\n"
+                                formatted_facts += facts
                                 
-                                # Extrahiere die Antwort aus dem Chat-Completion-Format
-                                if result and "choices" in result and len(result["choices"]) > 0:
-                                    facts = result["choices"][0]["message"]["content"]
-                                    
-                                    # Formatiere die Fakten für bessere Lesbarkeit
-                                    formatted_facts = "## RECHERCHEERGEBNISSE:\n\n"
-                                    formatted_facts += facts
-                                    
-                                    logger.info(f"Perplexity Recherche abgeschlossen mit {api_config.PERPLEXITY_MODEL}")
-                                    return formatted_facts
-                                else:
-                                    logger.error("Unerwartetes Antwortformat von Perplexity API")
+                                logger.info(f"Perplexity Recherche abgeschlossen mit {api_config.PERPLEXITY_MODEL}")
+                                return formatted_facts
                             else:
-                                error_text = await response.text()
-                                logger.error(f"Perplexity API Fehler: {error_text}")
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Perplexity API Timeout (Versuch {attempt+1}/{api_config.PERPLEXITY_MAX_RETRIES})")
-                        if attempt < api_config.PERPLEXITY_MAX_RETRIES - 1:
-                            await asyncio.sleep(1)
-                            continue
+                                logger.error("Unerwartetes Antwortformat von Perplexity API")
+                        else:
+                            error_text = await response.text()
+                            logger.error(f"Perplexity API Fehler: {error_text}")
+                            if response.status not in RETRYABLE_STATUS:
+                                break
+                            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                except asyncio.TimeoutError:
+                    logger.warning(f"Perplexity API Timeout (Versuch {attempt+1}/{max_retries})")
+                    if attempt == max_retries - 1:
                         logger.error("Perplexity API endgültiger Timeout")
-                    except Exception as e:
-                        logger.error(f"Perplexity API Fehler: {str(e)}")
-                        if attempt < api_config.PERPLEXITY_MAX_RETRIES - 1:
-                            await asyncio.sleep(1)
-                            continue
-                logger.warning("Perplexity Recherche fehlgeschlagen nach allen Versuchen")
-                return None
+                except Exception as e:
+                    logger.error(f"Perplexity API Fehler: {str(e)}")
+                
+                if attempt < max_retries - 1 and not await _sleep_before_retry(attempt, retry_after, deadline):
+                    break
+            logger.warning("Perplexity Recherche fehlgeschlagen nach allen Versuchen")
+            return None
         except Exception as e:
             logger.error(f"Fehler bei der Faktenrecherche: {str(e)}")
             return None
@@ -119,33 +589,20 @@ class APIClient:
         """
         logger.info("Starte Antwortgenerierung mit mehrstufigem Fallback-Mechanismus")
         
-        # Versuch mit primärem Modell (o1 mini)
-        response = await self._generate_openai_answer(
-            query, 
-            context, 
-            model=api_config.PRIMARY_MODEL
-        )
-        
-        # Tracking des genutzten Modells
-        used_model = api_config.PRIMARY_MODEL
-        
+        # Stufen in absteigender Priorität
+        tiers: List[Tuple[str, Callable[[], Awaitable[Optional[Dict[str, Any]]]]]] = [
+            (api_config.PRIMARY_MODEL,
+             lambda: self._generate_openai_answer(query, context, model=api_config.PRIMARY_MODEL))
+        ]
         # Erster Fallback zu 4o mini, wenn o1 mini fehlschlägt
-        if response is None and api_config.ENABLE_MODEL_FALLBACK:
-            logger.info(f"Fallback zum sekundären Modell {api_config.FALLBACK_MODEL}")
-            response = await self._generate_openai_answer(
-                query, 
-                context, 
-                model=api_config.FALLBACK_MODEL
-            )
-            if response is not None:
-                used_model = api_config.FALLBACK_MODEL
-        
+        if api_config.ENABLE_MODEL_FALLBACK:
+            tiers.append((api_config.FALLBACK_MODEL,
+                          lambda: self._generate_openai_answer(query, context, model=api_config.FALLBACK_MODEL)))
         # Zweiter Fallback zu IS Core, wenn beide OpenAI-Modelle fehlschlagen
-        if response is None and api_config.ENABLE_INSIGHT_CORE_FALLBACK and api_config.IS_CORE_ENABLED:
-            logger.info("Fallback zu Insight Synergy Core")
-            response = await self._generate_is_core_answer(query, context)
-            if response is not None:
-                used_model = "insight-synergy-core"
+        if api_config.ENABLE_INSIGHT_CORE_FALLBACK and api_config.IS_CORE_ENABLED:
+            tiers.append(("insight-synergy-core", lambda: self._generate_is_core_answer(query, context)))
+        
+        used_model, response = await self._run_hedged(tiers, api_config.FALLBACK_HEDGE_DELAY)
         
         if response is not None:
             logger.info(f"Antwort erfolgreich generiert mit Modell: {used_model}")
@@ -154,6 +611,14 @@ class APIClient:
             
         return response
     
+    async def _run_hedged(
+        self,
+        tiers: List[Tuple[str, Callable[[], Awaitable[Optional[Dict[str, Any]]]]]],
+        hedge_delay: float
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Führt die Fallback-Stufen gestaffelt parallel aus (siehe run_hedged)"""
+        return await run_hedged(tiers, hedge_delay)
+    
     async def _generate_openai_answer(
         self, 
         query: str, 
@@ -161,6 +626,80 @@ class APIClient:
         model: str = api_config.PRIMARY_MODEL
     ) -> Optional[Dict[str, Any]]:
         """Generiert eine Antwort mit OpenAI-Modellen (o1 mini oder 4o mini) basierend auf Perplexity-Recherche"""
+        payload = {
+            "api": "openai",
+            "model": model,
+            "query": query,
+            "context": context,
+            "temperature": api_config.OPENAI_TEMPERATURE,
+            "max_tokens": api_config.OPENAI_MAX_TOKENS
+        }
+        return await self._cached(
+            payload,
+            lambda: self._request_openai_answer(query, context, model)
+        )
+    
+    def _build_openai_messages(self, query: str, context: Optional[str], model: str) -> List[Dict[str, str]]:
+        """
+        Baut die Nutzer-Nachrichten für eine OpenAI-Anfrage inkl. aufgeteiltem Rechercheergebnis.
+        Die System-Nachricht ist bereits im Payload-Präfix enthalten (siehe _build_openai_payload).
+        """
+        messages = []
+        
+        # Wenn relevante Fakten recherchiert wurden, füge sie als separaten Kontext hinzu
+        if context and api_config.COMBINE_PERPLEXITY_WITH_OPENAI:
+            # Teile den Kontext in kleinere Abschnitte auf, falls er zu lang ist
+            context_parts = _split_context(context, model)
+            
+            # Füge jeden Kontextteil als separate Nachricht hinzu
+            for i, part in enumerate(context_parts):
+                part_indicator = f"Teil {i+1}/{len(context_parts)}: " if len(context_parts) > 1 else ""
+                messages.append({"role": "user", "content": f"Hier sind Rechercheergebnisse zu deiner Anfrage {part_indicator}\n\n{part}"})
+            
+            # Füge die eigentliche Anfrage hinzu
+            messages.append({"role": "user", "content": f"Basierend auf diesen Rechercheergebnissen, beantworte bitte folgende Frage detailliert und strukturiert: {query}"})
+        else:
+            messages.append({"role": "user", "content": query})
+        
+        return messages
+    
+    def _build_openai_payload(self, model: str, messages: List[Dict[str, str]], stream: bool = False) -> bytes:
+        """
+        Serialisiert eine OpenAI-Anfrage. Der statische Teil (Modell, Parameter,
+        System-Nachricht) wird pro Modell einmal vorab serialisiert; pro Anfrage
+        werden nur die Nutzer-Nachrichten kodiert und angehängt.
+        """
+        prefix = self._openai_payload_prefixes.get((model, stream))
+        if prefix is None:
+            static = {
+                "model": model,
+                "temperature": api_config.OPENAI_TEMPERATURE,
+                "max_tokens": api_config.OPENAI_MAX_TOKENS
+            }
+            if stream:
+                static["stream"] = True
+            # Schließende Klammer entfernen und die Nachrichtenliste beginnen
+            prefix = (
+                json_utils.dumps_bytes(static)[:-1]
+                + b',"messages":['
+                + json_utils.dumps_bytes(self.OPENAI_SYSTEM_MESSAGE)
+            )
+            self._openai_payload_prefixes[(model, stream)] = prefix
+        
+        parts = [prefix]
+        for message in messages:
+            parts.append(b",")
+            parts.append(json_utils.dumps_bytes(message))
+        parts.append(b"]}")
+        return b"".join(parts)
+    
+    async def _request_openai_answer(
+        self,
+        query: str,
+        context: Optional[str],
+        model: str
+    ) -> Optional[Dict[str, Any]]:
+        """Führt die OpenAI-Anfrage ohne Cache aus"""
         if not api_config.OPENAI_API_KEY:
             logger.warning("OpenAI API Key nicht konfiguriert")
             return None
@@ -168,107 +707,112 @@ class APIClient:
         try:
             await self.openai_limiter.acquire()
             
-            headers = {
-                "Authorization": f"Bearer {api_config.OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            # Optimierter System-Prompt für faktenbasierte Antworten mit o1/4o mini
-            system_content = """Du bist eine präzise und faktenorientierte KI, die ausschließlich auf verifizierte Informationen zurückgreift.
-- Beziehe dich nur auf die bereitgestellten Rechercheergebnisse
-- Strukturiere deine Antwort klar und verständlich
-- Wenn du etwas nicht aus den Rechercheergebnissen ableiten kannst, gib ehrlich an, dass du es nicht weißt
-- Füge keine spekulativen Informationen hinzu"""
-            
-            messages = [
-                {"role": "system", "content": system_content}
-            ]
-            
-            # Wenn relevante Fakten recherchiert wurden, füge sie als separaten Kontext hinzu
-            if context and api_config.COMBINE_PERPLEXITY_WITH_OPENAI:
-                # Teile den Kontext in kleinere Abschnitte auf, falls er zu lang ist
-                context_parts = []
-                max_context_length = api_config.MAX_CONTEXT_LENGTH
-                
-                if len(context) > max_context_length:
-                    # Einfache Aufteilung nach Absätzen, falls der Kontext zu groß ist
-                    paragraphs = context.split("\n\n")
-                    current_part = ""
-                    
-                    for paragraph in paragraphs:
-                        if len(current_part) + len(paragraph) + 2 <= max_context_length:
-                            current_part += paragraph + "\n\n"
-                        else:
-                            if current_part:
-                                context_parts.append(current_part)
-                            current_part = paragraph + "\n\n"
-                    
-                    if current_part:
-                        context_parts.append(current_part)
-                else:
-                    context_parts = [context]
-                
-                # Füge jeden Kontextteil als separate Nachricht hinzu
-                for i, part in enumerate(context_parts):
-                    part_indicator = f"Teil {i+1}/{len(context_parts)}: " if len(context_parts) > 1 else ""
-                    messages.append({"role": "user", "content": f"Hier sind Rechercheergebnisse zu deiner Anfrage {part_indicator}\n\n{part}"})
-                
-                # Füge die eigentliche Anfrage hinzu
-                messages.append({"role": "user", "content": f"Basierend auf diesen Rechercheergebnissen, beantworte bitte folgende Frage detailliert und strukturiert: {query}"})
-            else:
-                messages.append({"role": "user", "content": query})
-            
-            data = {
-                "model": model,
-                "messages": messages,
-                "temperature": api_config.OPENAI_TEMPERATURE,
-                "max_tokens": api_config.OPENAI_MAX_TOKENS
-            }
+            body = self._build_openai_payload(model, self._build_openai_messages(query, context, model))
             
             logger.info(f"Starte OpenAI-Anfrage mit Modell {model}")
             
-            async with aiohttp.ClientSession() as session:
-                for attempt in range(api_config.OPENAI_MAX_RETRIES):
-                    try:
-                        async with session.post(
-                            f"{api_config.OPENAI_API_BASE}/chat/completions",
-                            headers=headers,
-                            json=data,
-                            timeout=api_config.OPENAI_TIMEOUT
-                        ) as response:
-                            if response.status == 200:
-                                result = await response.json()
-                                # Modell-Name für Tracking-Zwecke überschreiben
-                                result["model"] = model
-                                logger.info(f"OpenAI-Anfrage erfolgreich mit Modell {model}")
-                                return result
-                            else:
-                                error_text = await response.text()
-                                logger.error(f"OpenAI API Fehler mit {model}: {error_text}")
-                    except asyncio.TimeoutError:
-                        logger.warning(f"OpenAI API Timeout mit {model} (Versuch {attempt+1}/{api_config.OPENAI_MAX_RETRIES})")
-                        if attempt < api_config.OPENAI_MAX_RETRIES - 1:
-                            await asyncio.sleep(1)
-                            continue
+            session = await self._get_session()
+            max_retries = api_config.OPENAI_MAX_RETRIES
+            deadline = asyncio.get_running_loop().time() + api_config.OPENAI_TIMEOUT * max_retries
+            for attempt in range(max_retries):
+                retry_after = None
+                try:
+                    async with session.post(
+                        f"{api_config.OPENAI_API_BASE}/chat/completions",
+                        headers=self._openai_headers,
+                        data=body,
+                        timeout=api_config.OPENAI_TIMEOUT
+                    ) as response:
+                        if response.status == 200:
+                            result = json_utils.loads(await response.read())
+                            # Modell-Name für Tracking-Zwecke überschreiben
+                            result["model"] = model
+                            logger.info(f"OpenAI-Anfrage erfolgreich mit Modell {model}")
+                            return result
+                        else:
+                            error_text = await response.text()
+                            logger.error(f"OpenAI API Fehler mit {model}: {error_text}")
+                            if response.status not in RETRYABLE_STATUS:
+                                break
+                            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                except asyncio.TimeoutError:
+                    logger.warning(f"OpenAI API Timeout mit {model} (Versuch {attempt+1}/{max_retries})")
+                    if attempt == max_retries - 1:
                         logger.error(f"OpenAI API endgültiger Timeout mit {model}")
-                    except Exception as e:
-                        logger.error(f"OpenAI API Fehler mit {model}: {str(e)}")
-                        if attempt < api_config.OPENAI_MAX_RETRIES - 1:
-                            await asyncio.sleep(1)
-                            continue
-                logger.warning(f"OpenAI-Anfrage fehlgeschlagen mit Modell {model} nach allen Versuchen")
-                return None
+                except Exception as e:
+                    logger.error(f"OpenAI API Fehler mit {model}: {str(e)}")
+                
+                if attempt < max_retries - 1 and not await _sleep_before_retry(attempt, retry_after, deadline):
+                    break
+            logger.warning(f"OpenAI-Anfrage fehlgeschlagen mit Modell {model} nach allen Versuchen")
+            return None
         except Exception as e:
             logger.error(f"Fehler bei der Antwortgenerierung mit {model}: {str(e)}")
             return None
     
+    async def stream_openai_answer(
+        self,
+        query: str,
+        context: Optional[str] = None,
+        model: str = api_config.PRIMARY_MODEL
+    ) -> AsyncIterator[str]:
+        """
+        Streamt eine OpenAI-Antwort (Server-Sent Events) als Text-Fragmente.
+        
+        Die Antwort wird nicht vollständig gepuffert; jedes Fragment wird
+        weitergegeben, sobald es eintrifft. Streaming-Antworten werden weder
+        gecacht noch wiederholt, da bereits Teile ausgeliefert sein können.
+        Fehler werden nach dem Logging weitergereicht, damit Aufrufer einen
+        abgebrochenen Stream von einer vollständigen Antwort unterscheiden können.
+        """
+        if not api_config.OPENAI_API_KEY:
+            raise RuntimeError("OpenAI API Key nicht konfiguriert")
+        
+        await self.openai_limiter.acquire()
+        
+        body = self._build_openai_payload(
+            model, self._build_openai_messages(query, context, model), stream=True
+        )
+        
+        logger.info(f"Starte OpenAI-Streaming-Anfrage mit Modell {model}")
+        
+        session = await self._get_session()
+        try:
+            async with session.post(
+                f"{api_config.OPENAI_API_BASE}/chat/completions",
+                headers=self._openai_headers,
+                data=body,
+                # Kein Gesamt-Timeout: lange Antworten dürfen beliebig lange streamen,
+                # solange zwischen zwei Fragmenten nicht mehr als OPENAI_TIMEOUT vergeht
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=api_config.OPENAI_TIMEOUT)
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(f"OpenAI API Fehler {response.status}: {error_text}")
+                
+                # aiohttp liefert den Body zeilenweise; SSE-Frames beginnen mit "data:"
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == b"[DONE]":
+                        break
+                    delta = _extract_stream_delta(json_utils.loads(payload))
+                    if delta:
+                        yield delta
+        except asyncio.TimeoutError:
+            logger.error(f"OpenAI API Timeout beim Streaming mit {model}")
+            raise
+        except Exception as e:
+            logger.error(f"Fehler beim Streaming mit {model}: {str(e)}")
+            raise
+    
     async def _generate_is_core_answer(self, query: str, context: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Generiert eine Antwort mit Insight Synergy Core (lokaler Fallback)"""
         try:
             logger.info("Starte Insight Synergy Core Fallback-Anfrage")
             
-            # System-Prompt für faktenbezogene Antworten
-            system_prompt = "Du bist eine KI, die ausschließlich auf fundierte Fakten basiert."
             user_message = query
             
             # Wenn Kontext vorhanden ist, füge ihn hinzu
@@ -277,43 +821,43 @@ class APIClient:
             
             data = {
                 "messages": [
-                    {"role": "system", "content": system_prompt},
+                    self.IS_CORE_SYSTEM_MESSAGE,
                     {"role": "user", "content": user_message}
                 ],
                 "temperature": api_config.IS_CORE_TEMPERATURE,
                 "max_tokens": api_config.IS_CORE_MAX_TOKENS
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_config.IS_CORE_ENDPOINT,
-                    json=data,
-                    timeout=api_config.IS_CORE_TIMEOUT
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info("Insight Synergy Core Anfrage erfolgreich")
-                        
-                        # Konvertiere IS Core Antwort ins OpenAI-Format für einheitliche Verarbeitung
-                        return {
-                            "choices": [
-                                {
-                                    "message": {
-                                        "content": result.get("completion", ""),
-                                        "role": "assistant"
-                                    },
-                                    "finish_reason": "stop"
-                                }
-                            ],
-                            "model": "insight-synergy-core",
-                            "usage": {
-                                "total_tokens": result.get("token_count", 0)
+            session = await self._get_session()
+            async with session.post(
+                api_config.IS_CORE_ENDPOINT,
+                json=data,
+                timeout=api_config.IS_CORE_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    result = json_utils.loads(await response.read())
+                    logger.info("Insight Synergy Core Anfrage erfolgreich")
+                    
+                    # Konvertiere IS Core Antwort ins OpenAI-Format für einheitliche Verarbeitung
+                    return {
+                        "choices": [
+                            {
+                                "message": {
+                                    "content": result.get("completion", ""),
+                                    "role": "assistant"
+                                },
+                                "finish_reason": "stop"
                             }
+                        ],
+                        "model": "insight-synergy-core",
+                        "usage": {
+                            "total_tokens": result.get("token_count", 0)
                         }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"IS Core API Fehler: {error_text}")
-                        return None
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"IS Core API Fehler: {error_text}")
+                    return None
         except asyncio.TimeoutError:
             logger.error(f"Insight Synergy Core Timeout nach {api_config.IS_CORE_TIMEOUT} Sekunden")
             return None
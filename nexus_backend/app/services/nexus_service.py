@@ -1,25 +1,45 @@
 import os
-import json
 import time
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-import aiohttp
+from dataclasses import dataclass, replace
+from functools import lru_cache, partial
+from string import Formatter
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Mapping, Callable, Awaitable, Tuple, FrozenSet, AsyncIterator, TypedDict
+import httpx
 
-from pydantic import BaseModel
-
-from .api_client import APIClient
+from nexus_backend.utils import json_utils
+from nexus_backend.utils.circuit_breaker import CircuitBreaker, ProviderUnavailable
+from nexus_backend.utils.http_utils import HTTP2_AVAILABLE
+from .api_client import APIClient, ResponseCache, run_hedged
+from nexus_backend.utils.semantic_cache import SemanticCache, NUMPY_AVAILABLE
+from .nexus_text_utils import default_steps, extract_steps, iter_steps
 from ..core.api_config import api_config
 
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+
 logger = logging.getLogger(__name__)
 
-class NexusRequest(BaseModel):
+# OpenAI-kompatible Anbieter: Name -> (Umgebungsvariable des API-Keys, Basis-URL)
+_OPENAI_PROVIDERS: Mapping[str, Tuple[str, Optional[str]]] = MappingProxyType({
+    "perplexity": ("PERPLEXITY_API_KEY", "https://api.perplexity.ai"),
+    "o1_mini": ("O1_MINI_API_KEY", None),
+    "4o_mini": ("FOUR_O_MINI_API_KEY", None),
+})
+
+@dataclass(slots=True, kw_only=True)
+class NexusRequest:
     query: str
     context: Optional[str] = None
     goals: Optional[List[str]] = None
     max_tokens: Optional[int] = 3000
 
-class NexusResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class NexusResponse:
     solution: str
     steps: List[str]
     references: Optional[List[str]] = None
@@ -29,44 +49,48 @@ class NexusResponse(BaseModel):
     facts_found: Optional[bool] = None
     model_used: Optional[str] = None  # Speichert das tatsächlich verwendete Modell für Monitoring
 
-class ChatMessage(BaseModel):
+class ChatMessage(TypedDict):
+    """Chat-Nachricht im Format der API; als TypedDict ohne Validierungs-Overhead pro Anfrage"""
     role: str
     content: str
 
-class NexusService:
+@lru_cache(maxsize=None)
+def _load_templates_file(path: str, mtime: float) -> Mapping[str, str]:
     """
-    NexusService verarbeitet Anfragen für Analysen und Lösungsgenerierungen
-    über eine API-basierte Implementierung mit Perplexity und OpenAI-Modellen (o1 mini, 4o mini),
-    sowie Insight Synergy Core als Fallback.
+    Liest eine Template-Datei einmalig ein und liefert sie unveränderlich zurück.
+    Der Änderungszeitpunkt ist Teil des Cache-Schlüssels, sodass geänderte Dateien neu gelesen werden.
     """
+    with open(path, "rb") as f:
+        return MappingProxyType(json_utils.loads(f.read()))
+
+@lru_cache(maxsize=256)
+def _template_fields(template: str) -> FrozenSet[str]:
+    """Ermittelt einmalig die Platzhalter, die ein Template tatsächlich verwendet"""
+    return frozenset(
+        field_name for _, field_name, _, _ in Formatter().parse(template) if field_name
+    )
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """
+    Zerlegt ein Template einmalig in (Textfragment, Platzhalter)-Paare, sodass beim
+    Ausfüllen nur noch verkettet wird. Liefert None für Templates mit Formatangaben,
+    Konvertierungen oder Attributzugriffen; diese werden mit str.format_map ausgefüllt.
+    """
+    parts = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+            return None
+        parts.append((literal, field_name))
+    return tuple(parts)
+
+# Standard-Templates, falls keine Datei geladen werden kann (schreibgeschützt, einmal pro Prozess)
+_DEFAULT_TEMPLATES: Mapping[str, str] = MappingProxyType({
+    "solution_system_prompt": "Du bist The Nexus, eine hochspezialisierte KI für komplexe Problemlösungen. Deine Aufgabe ist es, strukturierte und durchdachte Lösungen zu generieren, die sowohl theoretisch fundiert als auch praktisch umsetzbar sind. Verwende Markdown für eine klare Formatierung.",
     
-    def __init__(self):
-        self.templates_path = os.path.join(os.path.dirname(__file__), "../templates/nexus_templates.json")
-        self.templates = self._load_templates()
-        self.api_client = APIClient()
-        logger.info("NexusService initialisiert")
-    
-    def _load_templates(self) -> Dict[str, str]:
-        """Lädt Template-Texte aus einer JSON-Datei"""
-        try:
-            if os.path.exists(self.templates_path):
-                with open(self.templates_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            else:
-                logger.warning(f"Templates-Datei nicht gefunden: {self.templates_path}")
-                return self._get_default_templates()
-        except Exception as e:
-            logger.error(f"Fehler beim Laden der Templates: {str(e)}")
-            return self._get_default_templates()
+    "analysis_system_prompt": "Du bist The Nexus, eine hochspezialisierte KI für tiefgehende Analysen. Deine Aufgabe ist es, komplexe Probleme zu analysieren, in ihre Bestandteile zu zerlegen und strukturierte Einsichten zu liefern. Verwende Markdown für eine klare Formatierung.",
     
-    def _get_default_templates(self) -> Dict[str, str]:
-        """Liefert Standard-Templates zurück, falls keine Datei geladen werden kann"""
-        return {
-            "solution_system_prompt": "Du bist The Nexus, eine hochspezialisierte KI für komplexe Problemlösungen. Deine Aufgabe ist es, strukturierte und durchdachte Lösungen zu generieren, die sowohl theoretisch fundiert als auch praktisch umsetzbar sind. Verwende Markdown für eine klare Formatierung.",
-            
-            "analysis_system_prompt": "Du bist The Nexus, eine hochspezialisierte KI für tiefgehende Analysen. Deine Aufgabe ist es, komplexe Probleme zu analysieren, in ihre Bestandteile zu zerlegen und strukturierte Einsichten zu liefern. Verwende Markdown für eine klare Formatierung.",
-            
-            "solution_prompt": """# Anfrage zur Lösungsgenerierung
+    "solution_prompt": """# Anfrage zur Lösungsgenerierung
 
 ## Problem
 {query}
@@ -83,8 +107,8 @@ Generiere eine durchdachte, strukturierte Lösung für dieses Problem. Die Lösu
 5. Risiken und Alternativen berücksichtigen
 
 Strukturiere deine Antwort mit Markdown für bessere Lesbarkeit.""",
-            
-            "analysis_prompt": """# Anfrage zur Problemanalyse
+    
+    "analysis_prompt": """# Anfrage zur Problemanalyse
 
 ## Zu analysierendes Problem
 {query}
@@ -99,33 +123,694 @@ Führe eine tiefgehende, strukturierte Analyse des Problems durch. Deine Analyse
 5. Eine evidenzbasierte Bewertung vornehmen
 
 Strukturiere deine Antwort mit Markdown für bessere Lesbarkeit."""
+})
+
+# Fallback-Reihen: (Anzeigename, Methode) in absteigender Priorität
+_SOLUTION_PROVIDERS: Tuple[Tuple[str, str], ...] = (
+    ("Perplexity", "_generate_with_perplexity"),
+    ("O1 mini", "_generate_with_o1_mini"),
+    ("4o-mini", "_generate_with_4o_mini"),
+    ("Insight Core", "_generate_with_insight_core"),
+)
+_ANALYSIS_PROVIDERS: Tuple[Tuple[str, str], ...] = (
+    ("Perplexity", "_analyze_with_perplexity"),
+    ("O1 mini", "_analyze_with_o1_mini"),
+    ("4o-mini", "_analyze_with_4o_mini"),
+    ("Insight Core", "_analyze_with_insight_core"),
+)
+
+# Antworttexte der Demo-Funktionen; werden pro Aufruf nur noch ausgefüllt
+_DEMO_SOLUTION_TEMPLATE = """
+# Lösungsvorschlag für: {query}
+
+## Analyse des Problems
+{query} stellt ein komplexes Problem dar, das mehrere Facetten hat:
+1. Die Hauptherausforderung liegt in der Strukturierung und Organisation der Daten
+2. Es gibt verschiedene Stakeholder mit unterschiedlichen Interessen
+3. Die Skalierbarkeit der Lösung muss berücksichtigt werden
+
+## Empfohlene Lösung
+Eine mehrstufige Strategie ist hier am sinnvollsten:
+
+1. Zunächst sollten die Anforderungen klar definiert werden
+2. Die Datenstrukturen müssen entsprechend modelliert werden
+3. Ein iterativer Entwicklungsprozess ermöglicht kontinuierliches Feedback
+4. Automatisierte Tests sichern die Qualität
+5. Dokumentation für alle Beteiligten erstellen
+
+## Technische Umsetzung
+```python
+# Beispiel-Implementierung eines zentralen Datenmodells
+class SolutionModel:
+    def __init__(self, id, title, steps):
+        self.id = id
+        self.title = title
+        self.steps = steps
+```
+
+## Nächste Schritte
+1. Erstellen eines Prototyps
+2. Sammeln von Feedback
+3. Iterative Verbesserung
+4. Ausrollen der Lösung
+        """
+
+_DEMO_ANALYSIS_TEMPLATE = """
+# Strukturierte Analyse von: {query}
+
+## Zerlegung des Problems
+1. **Kernaspekte**:
+   - Hauptfragestellung: {topic}
+   - Komplexitätsgrad: Mittel bis hoch
+   - Domänenspezifisches Wissen erforderlich: Ja
+
+2. **Kontextuelle Faktoren**:
+   {context_line}
+   - Relevante Einflussfaktoren: Technologie, Marktbedingungen, Ressourcenverfügbarkeit
+
+## Hauptkomponenten der Analyse
+1. **Technische Dimension**:
+   - Erforderliche Technologien: Cloud-Infrastruktur, Datenbanksysteme, API-Management
+   - Skalierbarkeitsanforderungen: Hoch
+   - Integration mit bestehenden Systemen: Mittlerer Komplexitätsgrad
+
+2. **Organisatorische Dimension**:
+   - Stakeholder-Management: 5-7 Hauptbeteiligte
+   - Change-Management-Bedarf: Signifikant
+   - Schulungsbedarf: Moderat
+
+3. **Wirtschaftliche Dimension**:
+   - Investitionsbedarf: Mittel bis hoch
+   - ROI-Zeitrahmen: 18-24 Monate
+   - Risikofaktoren: Technologische Veralterung, Marktveränderungen
+
+## Handlungsempfehlungen
+1. Detaillierte Anforderungsanalyse durchführen
+2. Proof-of-Concept für kritische Komponenten entwickeln
+3. Stakeholder-Workshop zur Validierung der Anforderungen organisieren
+4. Risikomanagement-Plan erstellen
+5. Iterativen Implementierungsplan mit Meilensteinen entwickeln
+        """
+
+# Sammelanalyse: Trennzeichen zwischen den Einzelantworten und maximale Anzahl
+# Probleme pro Prompt (darüber steigt die Latenz pro Aufruf überproportional)
+BULK_DELIMITER = "---END---"
+BULK_MAX_ROWS = 8
+
+@lru_cache(maxsize=None)
+def _get_embedding_model(model_name: str):
+    """Lädt das Embedding-Modell für den semantischen Cache einmal pro Prozess"""
+    from sentence_transformers import SentenceTransformer  # schwerer Import, nur bei Bedarf
+    return SentenceTransformer(model_name)
+
+def _embed_query(text: str):
+    """Berechnet das Embedding einer Anfrage für den semantischen Cache"""
+    return _get_embedding_model(api_config.SEMANTIC_CACHE_MODEL).encode(text, normalize_embeddings=True)
+
+class _TemplateValues(dict):
+    """Werte für str.format_map; fehlende Platzhalter werden durch einen Leerstring ersetzt"""
+    
+    def __missing__(self, key: str) -> str:
+        return ""
+
+@lru_cache(maxsize=64)
+def _fill_template(template: str, items: Tuple[Tuple[str, Any], ...]) -> str:
+    """
+    Füllt ein Template mit den (Name, Wert)-Paaren aus. Wiederholte Aufrufe mit
+    denselben Werten (z.B. identische System-Prompts) kommen aus dem Cache.
+    """
+    kwargs = dict(items)
+    
+    # Abschnitte nur aufbauen, wenn das Template sie verwendet
+    fields = _template_fields(template)
+    template_values = _TemplateValues(kwargs)
+    template_values["query"] = kwargs.get("query", "")
+    
+    # Kontext und Ziele formatieren, falls vorhanden
+    if "context_section" in fields:
+        context = kwargs.get("context")
+        template_values["context_section"] = f"## Kontext\n{context}\n\n" if context else ""
+    
+    if "goals_section" in fields:
+        goals = kwargs.get("goals")
+        goals_section = ""
+        if goals and isinstance(goals, (list, tuple)):
+            goals_section = "## Ziele\n" + "\n".join(f"- {goal}" for goal in goals) + "\n\n"
+        template_values["goals_section"] = goals_section
+    
+    # Template in einem Durchlauf ausfüllen; unbekannte Platzhalter bleiben leer
+    compiled = _compile_template(template)
+    if compiled is None:
+        return template.format_map(template_values)
+    
+    parts = []
+    for literal, field_name in compiled:
+        parts.append(literal)
+        if field_name is not None:
+            parts.append(format(template_values[field_name], ""))
+    return "".join(parts)
+
+class NexusService:
+    """
+    NexusService verarbeitet Anfragen für Analysen und Lösungsgenerierungen
+    über eine API-basierte Implementierung mit Perplexity und OpenAI-Modellen (o1 mini, 4o mini),
+    sowie Insight Synergy Core als Fallback.
+    """
+    
+    def __init__(self, max_batch_size: int = 1, batch_window_ms: int = 25):
+        """
+        Args:
+            max_batch_size: Maximale Anzahl an Anfragen, die gemeinsam abgearbeitet werden
+                (1 deaktiviert das Micro-Batching)
+            batch_window_ms: Zeitfenster, in dem eingehende Anfragen gesammelt werden
+        """
+        self.templates_path = os.path.normpath(
+            os.path.join(os.path.dirname(__file__), "../templates/nexus_templates.json")
+        )
+        self.templates = self._load_templates()
+        self.api_client = APIClient()
+        
+        # Micro-Batching; Queue und Worker werden beim ersten Bedarf in der laufenden Event-Loop erstellt
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+        
+        # Gemeinsamer Connection-Pool für alle OpenAI-kompatiblen Clients, wird beim ersten Aufruf erstellt
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._openai_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        # API-Keys werden einmalig gelesen statt bei jeder Anfrage
+        self._provider_keys: Dict[str, Optional[str]] = {
+            provider: os.getenv(env_var) for provider, (env_var, _) in _OPENAI_PROVIDERS.items()
         }
+        
+        # Zeitpunkt der letzten erfolgreichen Modellantwort (time.monotonic) für is_available
+        self._last_success = float("-inf")
+        
+        # Circuit Breaker pro Anbieter-Methode, sodass Fehler bei der Analyse
+        # die Lösungsgenerierung desselben Anbieters nicht sperren
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        # Cache für vollständige Antworten auf identische Anfragen
+        self._response_cache = ResponseCache(api_config.RESPONSE_CACHE_SIZE, api_config.RESPONSE_CACHE_TTL)
+        # Optional zusätzlich für inhaltlich gleiche, anders formulierte Anfragen
+        self._semantic_cache: Optional[SemanticCache] = None
+        if api_config.SEMANTIC_CACHE_ENABLED:
+            if NUMPY_AVAILABLE:
+                self._semantic_cache = SemanticCache(
+                    _embed_query,
+                    maxsize=api_config.RESPONSE_CACHE_SIZE,
+                    ttl=api_config.RESPONSE_CACHE_TTL,
+                    threshold=api_config.SEMANTIC_CACHE_THRESHOLD
+                )
+            else:
+                logger.warning("SEMANTIC_CACHE_ENABLED gesetzt, aber numpy ist nicht installiert")
+        
+        # Begrenzt gleichzeitige Anfragen an die Modelle; weitere warten in-process statt
+        # den Connection-Pool bzw. die Rate Limits der Anbieter zu überlasten
+        self._inflight = asyncio.Semaphore(api_config.NEXUS_MAX_INFLIGHT)
+        
+        # Simulierte Verarbeitungszeit der Demo-Funktionen (Standard: keine)
+        self._demo_delay = api_config.NEXUS_DEMO_DELAY
+        logger.info("NexusService initialisiert")
+    
+    async def warmup(self, ping: Optional[bool] = None) -> None:
+        """
+        Bereitet den Service beim Start vor, damit die erste Anfrage nicht die
+        einmaligen Kosten trägt: Templates laden und zerlegen, HTTP-Session öffnen
+        und optional per Ping die Verbindungen zu den Anbietern aufbauen.
+        
+        Args:
+            ping: Anbieter anpingen (Standard: api_config.NEXUS_WARMUP_PING)
+        """
+        self.templates = self._load_templates()
+        for template in self.templates.values():
+            _template_fields(template)
+            _compile_template(template)
+        await self.api_client._get_session()
+        for provider, api_key in self._provider_keys.items():
+            if api_key and AsyncOpenAI is not None:
+                self._provider_client(provider)
+        
+        if ping if ping is not None else api_config.NEXUS_WARMUP_PING:
+            available = await self.is_available()
+            logger.info(f"NexusService vorgewärmt (verfügbar: {available})")
+        else:
+            logger.info("NexusService vorgewärmt")
+    
+    async def close(self):
+        """Beendet den Batch-Worker und gibt offene HTTP-Verbindungen der API-Clients frei"""
+        if self._batch_worker_task is not None:
+            self._batch_worker_task.cancel()
+            self._batch_worker_task = None
+        self._openai_clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        await self.api_client.close()
+    
+    def _get_openai_client(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Liefert einen OpenAI-kompatiblen Client pro API-Key und Basis-URL.
+        Alle Clients teilen sich einen HTTP-Connection-Pool, sodass Verbindungen
+        (TCP/TLS) über Anfragen hinweg wiederverwendet werden.
+        """
+        if AsyncOpenAI is None:
+            raise RuntimeError("Das Paket 'openai' ist nicht installiert")
+        
+        key = (api_key, base_url)
+        client = self._openai_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self._get_http_client())
+            self._openai_clients[key] = client
+        return client
     
-    def get_template(self, template_name: str, **kwargs) -> str:
-        """Holt ein Template und füllt es mit den übergebenen Werten aus"""
-        template = self.templates.get(template_name, "")
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Liefert den gemeinsamen HTTP-Connection-Pool und erstellt ihn bei Bedarf neu"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=api_config.NEXUS_MAX_INFLIGHT
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                http2=HTTP2_AVAILABLE
+            )
+        return self._http_client
+    
+    async def _ping(self, url: str, api_key: Optional[str] = None) -> bool:
+        """
+        Prüft die Erreichbarkeit eines Anbieters ohne Token-Kosten: mit API-Key per
+        GET (z.B. auf /models, Key muss gültig sein), sonst per HEAD (Server antwortet).
+        """
+        client = self._get_http_client()
+        if api_key:
+            response = await client.get(url, headers={"Authorization": f"Bearer {api_key}"})
+            return response.status_code < 400
+        response = await client.head(url)
+        return response.status_code < 500
+    
+    def _provider_client(self, provider: str):
+        """Liefert den wiederverwendeten Client für einen Anbieter aus _OPENAI_PROVIDERS"""
+        env_var, base_url = _OPENAI_PROVIDERS[provider]
+        api_key = self._provider_keys[provider]
+        if not api_key:
+            raise ValueError(f"{env_var} not found in environment variables")
+        return self._get_openai_client(api_key, base_url=base_url)
+    
+    async def _submit(
+        self,
+        handler: Callable[[NexusRequest], Awaitable[NexusResponse]],
+        request: NexusRequest
+    ) -> NexusResponse:
+        """Reiht eine Anfrage in den nächsten Batch ein oder führt sie direkt aus"""
+        if self.max_batch_size <= 1:
+            return await self._call_limited(handler, request)
+        
+        if self._batch_worker_task is None or self._batch_worker_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker_task = asyncio.create_task(self._batch_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((handler, request, future))
+        return await future
+    
+    async def _call_limited(
+        self,
+        handler: Callable[[NexusRequest], Awaitable[NexusResponse]],
+        request: NexusRequest
+    ) -> NexusResponse:
+        """Führt eine Anfrage aus, sobald ein Platz unter NEXUS_MAX_INFLIGHT frei ist"""
+        async with self._inflight:
+            return await handler(request)
+    
+    async def _batch_worker(self):
+        """Sammelt Anfragen innerhalb des Zeitfensters und startet sie gemeinsam"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + self.batch_window
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Der Batch läuft eigenständig, damit bereits der nächste gesammelt werden kann
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(
+        self,
+        batch: List[Tuple[Callable[[NexusRequest], Awaitable[NexusResponse]], NexusRequest, asyncio.Future]]
+    ):
+        """
+        Führt alle Anfragen eines Batches parallel aus und verteilt die Ergebnisse.
+        Mit NEXUS_BATCH_PACK werden Analyse-Anfragen zu gemeinsamen Prompts
+        zusammengefasst (wie bei bulk_analyze), sodass weniger Modellaufrufe nötig sind.
+        """
+        logger.debug(f"Verarbeite Batch mit {len(batch)} Anfragen")
+        groups: List[list] = []
+        calls: List[Awaitable[List[NexusResponse]]] = []
+        
+        packable = []
+        if api_config.NEXUS_BATCH_PACK:
+            packable = [item for item in batch if item[0] == self._analyze_problem]
+            if len(packable) < 2:
+                packable = []
+        for start in range(0, len(packable), BULK_MAX_ROWS):
+            group = packable[start:start + BULK_MAX_ROWS]
+            groups.append(group)
+            calls.append(self._bulk_analyze_chunk(
+                [request for _, request, _ in group],
+                fallback=partial(self._call_limited, self._analyze_problem)
+            ))
+        packed_ids = {id(item) for item in packable}
+        for item in batch:
+            if id(item) not in packed_ids:
+                groups.append([item])
+                calls.append(self._call_limited_batch(item[0], item[1]))
+        
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        for group, result in zip(groups, results):
+            for index, (_, _, future) in enumerate(group):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result[index])
+    
+    async def _call_limited_batch(
+        self,
+        handler: Callable[[NexusRequest], Awaitable[NexusResponse]],
+        request: NexusRequest
+    ) -> List[NexusResponse]:
+        """Führt eine einzelne Anfrage eines Batches aus (Ergebnis als Liste wie bei gepackten Gruppen)"""
+        return [await self._call_limited(handler, request)]
+    
+    def _load_templates(self) -> Mapping[str, str]:
+        """Lädt Template-Texte aus einer JSON-Datei (pro Pfad nur einmal je Prozess)"""
+        try:
+            if os.path.exists(self.templates_path):
+                return _load_templates_file(self.templates_path, os.path.getmtime(self.templates_path))
+            else:
+                logger.warning(f"Templates-Datei nicht gefunden: {self.templates_path}")
+                return self._get_default_templates()
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Templates: {str(e)}")
+            return self._get_default_templates()
+    
+    def _get_default_templates(self) -> Mapping[str, str]:
+        """Liefert Standard-Templates zurück, falls keine Datei geladen werden kann"""
+        return _DEFAULT_TEMPLATES
+    
+    def get_template(self, template_name: str, values: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+        """
+        Holt ein Template und füllt es mit den übergebenen Werten aus. Fehlt es in der
+        geladenen Datei, wird das gleichnamige Standard-Template verwendet.
+        """
+        template = self.templates.get(template_name) or _DEFAULT_TEMPLATES.get(template_name, "")
         if not template:
             logger.warning(f"Template '{template_name}' nicht gefunden")
             return ""
         
-        # Kontext und Ziele formatieren, falls vorhanden
-        context_section = ""
-        if kwargs.get("context"):
-            context_section = f"## Kontext\n{kwargs['context']}\n\n"
+        if values:
+            kwargs = {**values, **kwargs}
         
-        goals_section = ""
-        if kwargs.get("goals") and isinstance(kwargs["goals"], list) and len(kwargs["goals"]) > 0:
-            goals_section = "## Ziele\n" + "\n".join([f"- {goal}" for goal in kwargs["goals"]]) + "\n\n"
-        
-        # Template mit Werten ausfüllen
-        return template.format(
-            query=kwargs.get("query", ""),
-            context_section=context_section,
-            goals_section=goals_section,
-            **{k: v for k, v in kwargs.items() if k not in ["query", "context_section", "goals_section"]}
-        )
+        # Listen als Tupel einfrieren, damit identische Prompts aus dem Cache kommen
+        try:
+            frozen = tuple(sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in kwargs.items()
+            ))
+            return _fill_template(template, frozen)
+        except TypeError:
+            # Nicht hashbare Werte (z.B. Dicts): ohne Cache ausfüllen
+            return _fill_template.__wrapped__(template, tuple(kwargs.items()))
+    
+    def _build_messages(self, template_name: str, request: NexusRequest, default_goals: str) -> List[ChatMessage]:
+        """
+        Baut die Chat-Nachrichten einer Anbieter-Anfrage. Der System-Prompt kommt für
+        wiederkehrende (Ziele, Kontext)-Kombinationen aus dem Template-Cache, pro
+        Anfrage ändert sich nur die Nutzernachricht.
+        """
+        system_message = self.get_template(template_name, {
+            "goals": request.goals or default_goals,
+            "details": request.context or ""
+        })
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": request.query}
+        ]
 
     async def generate_solution(self, request: NexusRequest) -> NexusResponse:
+        """Generate a solution based on the request (ggf. gebündelt mit weiteren Anfragen)."""
+        return await self._cached_response("solution", self._generate_solution, request)
+    
+    async def analyze_problem(self, request: NexusRequest) -> NexusResponse:
+        """Analyze a problem based on the request (ggf. gebündelt mit weiteren Anfragen)."""
+        return await self._cached_response("analysis", self._analyze_problem, request)
+    
+    async def _cached_response(
+        self,
+        kind: str,
+        handler: Callable[[NexusRequest], Awaitable[NexusResponse]],
+        request: NexusRequest
+    ) -> NexusResponse:
+        """Liefert eine gecachte Antwort für identische Anfragen oder erzeugt sie neu"""
+        if not api_config.RESPONSE_CACHE_ENABLED:
+            return await self._submit(handler, request)
+        
+        start_time = time.time()
+        key = ResponseCache.make_key({
+            "kind": kind,
+            "query": request.query,
+            "context": request.context,
+            "goals": request.goals,
+            "max_tokens": request.max_tokens
+        })
+        
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Cache-Treffer für {kind}-Anfrage")
+            return replace(cached, processing_time=time.time() - start_time)
+        
+        semantic_cache = self._semantic_cache
+        if semantic_cache is not None:
+            # Anfragen mit anderen Zielen oder Längen sind nicht austauschbar
+            namespace = json_utils.dumps([kind, request.goals, request.max_tokens])
+            try:
+                embedding = await asyncio.to_thread(
+                    semantic_cache.embedding, f"{request.query}\n{request.context or ''}"
+                )
+            except Exception as e:
+                logger.warning(f"Semantischer Cache nicht verfügbar: {str(e)}")
+                semantic_cache = None
+            else:
+                cached = semantic_cache.get(namespace, embedding)
+                if cached is not None:
+                    logger.debug(f"Semantischer Cache-Treffer für {kind}-Anfrage")
+                    self._response_cache.set(key, cached)
+                    return replace(cached, processing_time=time.time() - start_time)
+        
+        response = await self._submit(handler, request)
+        self._response_cache.set(key, response)
+        if semantic_cache is not None:
+            semantic_cache.set(namespace, embedding, response)
+        return response
+
+    async def analyze_and_solve(self, request: NexusRequest) -> Tuple[NexusResponse, NexusResponse]:
+        """
+        Erstellt Lösung und Analyse für dieselbe Anfrage parallel.
+        
+        Returns:
+            Tupel aus (Lösung, Analyse)
+        """
+        solution, analysis = await asyncio.gather(
+            self.generate_solution(request),
+            self.analyze_problem(request)
+        )
+        return solution, analysis
+    
+    async def bulk_analyze(self, requests: List[NexusRequest]) -> List[NexusResponse]:
+        """
+        Analysiert mehrere Probleme mit wenigen Modellaufrufen: jeweils bis zu
+        BULK_MAX_ROWS Probleme werden in einem Prompt zusammengefasst und die
+        Antwort am Trennzeichen wieder aufgeteilt.
+        
+        Returns:
+            Analysen in der Reihenfolge der Anfragen
+        """
+        chunks = [requests[i:i + BULK_MAX_ROWS] for i in range(0, len(requests), BULK_MAX_ROWS)]
+        results = await asyncio.gather(*(self._bulk_analyze_chunk(chunk) for chunk in chunks))
+        return [response for chunk_result in results for response in chunk_result]
+    
+    async def _bulk_analyze_chunk(
+        self,
+        requests: List[NexusRequest],
+        fallback: Optional[Callable[[NexusRequest], Awaitable[NexusResponse]]] = None
+    ) -> List[NexusResponse]:
+        """
+        Analysiert bis zu BULK_MAX_ROWS Probleme in einem gemeinsamen Prompt. Der Aufruf
+        läuft über dieselbe Anbieter-Reihe (mit Circuit Breakern) wie analyze_problem.
+        Kontext und Ziele werden pro Problem mitgegeben; jede Analyse ist auf das
+        kleinste max_tokens der Gruppe begrenzt, die gesamte Antwort auf dieses Budget
+        mal Anzahl der Probleme. Scheitern alle Anbieter oder lässt sich die Antwort
+        nicht zuordnen, wird jede Anfrage einzeln mit fallback analysiert
+        (Standard: analyze_problem).
+        """
+        start_time = time.time()
+        # Ohne Angabe gilt wie in den Anbieter-Methoden ein Budget von 2000 Tokens
+        max_tokens = min(request.max_tokens or 2000 for request in requests)
+        
+        prompt_parts = [
+            "# Analysiere die folgenden Probleme einzeln.\n\n"
+            f"Beende jede Analyse mit einer eigenen Zeile \"{BULK_DELIMITER}\" "
+            "und halte die Reihenfolge der Probleme ein. "
+            f"Jede Analyse darf höchstens {max_tokens} Tokens lang sein.\n"
+        ]
+        for index, request in enumerate(requests, 1):
+            prompt_parts.append(f"\n## Problem {index}\n{request.query}\n")
+            if request.context:
+                prompt_parts.append(f"\n### Kontext\n{request.context}\n")
+            if request.goals:
+                prompt_parts.append("\n### Ziele\n" + "".join(f"- {goal}\n" for goal in request.goals))
+        packed = NexusRequest(query="".join(prompt_parts), max_tokens=max_tokens * len(requests))
+        
+        response: Optional[NexusResponse] = None
+        try:
+            async with self._inflight:
+                response = await self._run_fallbacks(_ANALYSIS_PROVIDERS, packed)
+        except Exception as e:
+            logger.warning(f"Sammelanalyse fehlgeschlagen: {str(e)}")
+        
+        segments: List[str] = []
+        if response is not None:
+            segments = [segment.strip() for segment in response.solution.split(BULK_DELIMITER)]
+            segments = [segment for segment in segments if segment]
+        
+        if len(segments) != len(requests):
+            # Antwort nicht eindeutig zuordenbar: Probleme einzeln analysieren
+            logger.warning(
+                f"Sammelanalyse lieferte {len(segments)} statt {len(requests)} Antworten, "
+                "analysiere einzeln"
+            )
+            fallback = fallback or self.analyze_problem
+            return list(await asyncio.gather(*(fallback(request) for request in requests)))
+        
+        processing_time = time.time() - start_time
+        return [
+            NexusResponse(
+                solution=segment,
+                steps=self._extract_steps(segment, "analysis"),
+                model=response.model,
+                processing_time=processing_time,
+                model_used=response.model_used
+            )
+            for segment in segments
+        ]
+    
+    def stream_solution(self, request: NexusRequest) -> AsyncIterator[NexusResponse]:
+        """Streamt eine Lösung als Folge wachsender Teilantworten"""
+        return self._stream_response("solution_prompt", "solution", request)
+    
+    def stream_analysis(self, request: NexusRequest) -> AsyncIterator[NexusResponse]:
+        """Streamt eine Analyse als Folge wachsender Teilantworten"""
+        return self._stream_response("analysis_prompt", "analysis", request)
+    
+    def stream_solution_deltas(self, request: NexusRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Streamt eine Lösung als Text-Fragmente mit den jeweils neu gefundenen Schritten"""
+        return self._stream_deltas("solution_prompt", request)
+    
+    def stream_analysis_deltas(self, request: NexusRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Streamt eine Analyse als Text-Fragmente mit den jeweils neu gefundenen Schritten"""
+        return self._stream_deltas("analysis_prompt", request)
+    
+    async def _stream_deltas(self, template_name: str, request: NexusRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streamt die Antwort des primären Modells fragmentweise, sobald es eintrifft.
+        
+        Jedes Ereignis enthält das neue Fragment ("delta"). "partial_steps" ist None,
+        solange kein Markdown-Block (Leerzeile) abgeschlossen wurde, sonst die Schritte
+        aus den neu abgeschlossenen Blöcken. Das letzte Ereignis trägt "done": True,
+        die Schritte des Rests sowie Modell und Verarbeitungszeit.
+        """
+        start_time = time.time()
+        prompt = self.get_template(
+            template_name,
+            query=request.query,
+            context=request.context,
+            goals=request.goals
+        )
+        if not prompt:
+            # Nie einen leeren Prompt an das Modell schicken
+            raise ValueError(f"Template '{template_name}' ist leer oder fehlt")
+        model = api_config.PRIMARY_MODEL
+        pending = ""
+        
+        async with self._inflight:
+            async for delta in self.api_client.stream_openai_answer(prompt, model=model):
+                pending += delta
+                partial_steps = None
+                
+                boundary = pending.rfind("\n\n")
+                if boundary != -1:
+                    # Nur die neu abgeschlossenen Blöcke auswerten; der Rest bleibt im Puffer
+                    partial_steps = list(iter_steps(pending[:boundary]))
+                    pending = pending[boundary + 2:]
+                yield {"delta": delta, "partial_steps": partial_steps}
+        
+        yield {
+            "delta": "",
+            "partial_steps": list(iter_steps(pending)),
+            "done": True,
+            "model": model,
+            "processing_time": time.time() - start_time
+        }
+    
+    async def _stream_response(
+        self,
+        template_name: str,
+        mode: str,
+        request: NexusRequest
+    ) -> AsyncIterator[NexusResponse]:
+        """
+        Streamt die Antwort des primären Modells und liefert nach jedem abgeschlossenen
+        Markdown-Block (Leerzeile) eine Teilantwort mit dem bisherigen Text und allen
+        bisher gefundenen Schritten.
+        """
+        model = api_config.PRIMARY_MODEL
+        parts: List[str] = []
+        steps: List[str] = []
+        
+        async for event in self._stream_deltas(template_name, request):
+            parts.append(event["delta"])
+            if event.get("done"):
+                steps.extend(event["partial_steps"])
+                yield NexusResponse(
+                    solution="".join(parts),
+                    steps=steps or default_steps(mode),
+                    model=event["model"],
+                    processing_time=event["processing_time"],
+                    model_used=event["model"]
+                )
+            elif event["partial_steps"] is not None:
+                steps.extend(event["partial_steps"])
+                yield NexusResponse(
+                    solution="".join(parts),
+                    steps=list(steps),
+                    model=model,
+                    model_used=model
+                )
+
+    async def _generate_solution(self, request: NexusRequest) -> NexusResponse:
         """
         Generate a solution based on the request.
         Fallback-Reihe: 
@@ -134,28 +819,9 @@ Strukturiere deine Antwort mit Markdown für bessere Lesbarkeit."""
         3. 4o-mini
         4. Insight Core (Reserve)
         """
-        try:
-            # Erster Versuch: Perplexity
-            return await self._generate_with_perplexity(request)
-        except Exception as e:
-            logger.warning(f"Perplexity API failed: {str(e)}. Falling back to O1 mini.")
-            
-            try:
-                # Zweiter Versuch: O1 mini
-                return await self._generate_with_o1_mini(request)
-            except Exception as e:
-                logger.warning(f"O1 mini API failed: {str(e)}. Falling back to 4o-mini.")
-                
-                try:
-                    # Dritter Versuch: 4o-mini
-                    return await self._generate_with_4o_mini(request)
-                except Exception as e:
-                    logger.warning(f"4o-mini API failed: {str(e)}. Falling back to Insight Core.")
-                    
-                    # Letzter Fallback: Insight Core
-                    return await self._generate_with_insight_core(request)
+        return await self._run_fallbacks(_SOLUTION_PROVIDERS, request)
     
-    async def analyze_problem(self, request: NexusRequest) -> NexusResponse:
+    async def _analyze_problem(self, request: NexusRequest) -> NexusResponse:
         """
         Analyze a problem based on the request.
         Fallback-Reihe: 
@@ -164,68 +830,107 @@ Strukturiere deine Antwort mit Markdown für bessere Lesbarkeit."""
         3. 4o-mini
         4. Insight Core (Reserve)
         """
-        try:
-            # Erster Versuch: Perplexity
-            return await self._analyze_with_perplexity(request)
-        except Exception as e:
-            logger.warning(f"Perplexity API failed: {str(e)}. Falling back to O1 mini.")
-            
+        return await self._run_fallbacks(_ANALYSIS_PROVIDERS, request)
+    
+    async def _run_fallbacks(
+        self,
+        providers: Tuple[Tuple[str, str], ...],
+        request: NexusRequest
+    ) -> NexusResponse:
+        """
+        Arbeitet die Anbieter-Reihe ab. Mit NEXUS_HEDGED_FALLBACK startet der nächste
+        Anbieter bereits, wenn der laufende nach FALLBACK_HEDGE_DELAY Sekunden noch
+        nicht geantwortet hat; die erste erfolgreiche Antwort gewinnt.
+        """
+        # Nicht implementierte Stufen werden übersprungen, ohne den Circuit Breaker zu belasten
+        providers = tuple(
+            (name, method_name) for name, method_name in providers
+            if getattr(self, method_name, None) is not None
+        )
+        if not providers:
+            raise RuntimeError("Keine Anbieter verfügbar")
+        
+        if api_config.NEXUS_HEDGED_FALLBACK:
+            tiers = [
+                (name, partial(self._call_provider, name, method_name, request))
+                for name, method_name in providers
+            ]
+            used, response = await run_hedged(tiers, api_config.FALLBACK_HEDGE_DELAY, first_wins=True)
+            if response is None:
+                raise RuntimeError("Alle Anbieter sind fehlgeschlagen")
+            logger.debug(f"Antwort von {used}")
+            return response
+        
+        for index, (name, method_name) in enumerate(providers):
             try:
-                # Zweiter Versuch: O1 mini
-                return await self._analyze_with_o1_mini(request)
+                return await self._call_provider(name, method_name, request)
             except Exception as e:
-                logger.warning(f"O1 mini API failed: {str(e)}. Falling back to 4o-mini.")
-                
-                try:
-                    # Dritter Versuch: 4o-mini
-                    return await self._analyze_with_4o_mini(request)
-                except Exception as e:
-                    logger.warning(f"4o-mini API failed: {str(e)}. Falling back to Insight Core.")
-                    
-                    # Letzter Fallback: Insight Core
-                    return await self._analyze_with_insight_core(request)
-    
-    def _extract_steps(self, text: str) -> List[str]:
-        """Extrahiert Schritte aus dem generierten Text (basierend auf Überschriften und Listen)"""
-        steps = []
-        
-        # Markdown-Überschriften extrahieren
-        heading_patterns = [
-            r'^#+\s+(.*?)$',  # Überschriften (# Überschrift)
-            r'^(\d+\.\s+.*?)$',  # Nummerierte Listen (1. Schritt)
-            r'^[-*]\s+(.*?)$'  # Aufzählungslisten (- Schritt)
-        ]
-        
-        for line in text.split('\n'):
-            line = line.strip()
-            for pattern in heading_patterns:
-                import re
-                match = re.match(pattern, line)
-                if match:
-                    step_text = match.group(1).strip()
-                    # Nur sinnvolle Schritte hinzufügen (mindestens 3 Zeichen, nicht "Einleitung", etc.)
-                    if len(step_text) > 3 and step_text not in ["Einleitung", "Fazit", "Zusammenfassung", "Übersicht"]:
-                        steps.append(step_text)
-        
-        # Wenn keine Schritte gefunden wurden, Standard-Schritte zurückgeben
-        if not steps:
-            if "Analyse" in text[:100]:
-                steps = ["Problemanalyse", "Kontextuelle Einordnung", "Dimensionale Bewertung", "Schlussfolgerung"]
-            else:
-                steps = ["Problemdefinition", "Lösungsstrategie", "Umsetzungsschritte", "Ergebnisvalidierung"]
+                if index == len(providers) - 1:
+                    raise
+                logger.warning(f"{name} API failed: {str(e)}. Falling back to {providers[index + 1][0]}.")
+    
+    async def _call_provider(self, name: str, method_name: str, request: NexusRequest) -> NexusResponse:
+        """
+        Ruft die Anbieter-Methode über ihren Circuit Breaker auf. Ist er offen,
+        schlägt der Aufruf sofort fehl und die Fallback-Reihe geht weiter.
+        """
+        breaker = self._breakers.get(method_name)
+        if breaker is None:
+            breaker = self._breakers[method_name] = CircuitBreaker(
+                api_config.CIRCUIT_BREAKER_THRESHOLD,
+                api_config.CIRCUIT_BREAKER_RESET_TIMEOUT
+            )
+        if not breaker.allow_request():
+            raise ProviderUnavailable(f"{name} vorübergehend deaktiviert (Circuit Breaker offen)")
         
-        return steps
+        try:
+            response = await getattr(self, method_name)(request)
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        self._last_success = time.monotonic()
+        return response
+    
+    def _extract_steps(self, text: str, mode: str, max_steps: Optional[int] = None) -> List[str]:
+        """
+        Extrahiert Schritte aus dem generierten Text (basierend auf Überschriften und Listen).
+        mode ("analysis" oder "solution") bestimmt die Standard-Schritte, falls keine gefunden werden.
+        Mit max_steps endet die Suche, sobald genügend Schritte gefunden wurden.
+        """
+        return extract_steps(text, mode, max_steps)
 
     async def is_available(self) -> bool:
-        """Prüft, ob der Service verfügbar ist"""
-        try:
-            # Teste eine einfache Anfrage
-            test_query = "Test der API-Verfügbarkeit"
-            response = await self.api_client.generate_answer(test_query)
-            return response is not None
-        except Exception as e:
-            logger.error(f"Service nicht verfügbar: {str(e)}")
-            return False
+        """
+        Prüft, ob der Service verfügbar ist. Nach einer erfolgreichen Modellantwort gilt
+        er NEXUS_AVAILABILITY_TTL Sekunden lang ohne Prüfung als verfügbar; danach werden
+        die konfigurierten Anbieter ohne Modellaufruf angepingt.
+        """
+        if time.monotonic() - self._last_success < api_config.NEXUS_AVAILABILITY_TTL:
+            return True
+        
+        targets = set()
+        for provider, (_, base_url) in _OPENAI_PROVIDERS.items():
+            api_key = self._provider_keys[provider]
+            if not api_key:
+                continue
+            if base_url is None:
+                targets.add((f"{api_config.OPENAI_API_BASE}/models", api_key))
+            else:
+                targets.add((base_url, None))
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._ping(url, api_key), api_config.STATUS_PROBE_TIMEOUT)
+              for url, api_key in targets),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Service nicht verfügbar: {str(result) or type(result).__name__}")
+        return any(result is True for result in results)
             
     async def get_service_status(self) -> Dict[str, Any]:
         """Gibt detaillierte Statusinformationen über verfügbare Modelle zurück"""
@@ -242,89 +947,48 @@ Strukturiere deine Antwort mit Markdown für bessere Lesbarkeit."""
             }
         }
         
-        try:
-            # Teste Perplexity API
-            if api_config.PERPLEXITY_API_KEY:
-                test_query = "Test der API-Verfügbarkeit"
-                facts = await self.api_client.fetch_facts(test_query)
-                status["perplexity_available"] = facts is not None
-            
-            # Teste primäres Modell (o1 mini)
-            if api_config.OPENAI_API_KEY:
-                test_query = "Kurzer Test"
-                response = await self.api_client._generate_openai_answer(
-                    test_query, 
-                    model=api_config.PRIMARY_MODEL
-                )
-                status["primary_model_available"] = response is not None
-            
-            # Teste Fallback-Modell (4o mini)
-            if api_config.OPENAI_API_KEY and api_config.ENABLE_MODEL_FALLBACK:
-                test_query = "Kurzer Test"
-                response = await self.api_client._generate_openai_answer(
-                    test_query, 
-                    model=api_config.FALLBACK_MODEL
-                )
-                status["fallback_model_available"] = response is not None
-            
-            # Teste IS Core
-            if api_config.IS_CORE_ENABLED and api_config.ENABLE_INSIGHT_CORE_FALLBACK:
-                test_query = "Kurzer Test"
-                response = await self.api_client._generate_is_core_answer(test_query)
-                status["is_core_available"] = response is not None
-            
-            # System ist online, wenn mindestens ein Modell verfügbar ist
-            status["online"] = (
-                status["primary_model_available"] or 
-                status["fallback_model_available"] or 
-                status["is_core_available"]
+        # Unabhängige Probes ohne Modellaufruf parallel starten; jede ist einzeln zeitlich begrenzt
+        probes: Dict[str, Awaitable[bool]] = {}
+        if api_config.PERPLEXITY_API_KEY:
+            probes["perplexity_available"] = self._ping(api_config.PERPLEXITY_API_BASE)
+        if api_config.OPENAI_API_KEY:
+            # Primär- und Fallback-Modell laufen über denselben Endpunkt
+            probes["primary_model_available"] = self._ping(
+                f"{api_config.OPENAI_API_BASE}/models",
+                api_config.OPENAI_API_KEY
             )
-            
-            return status
-        except Exception as e:
-            logger.error(f"Fehler bei der Statusabfrage: {str(e)}")
-            return status
+        if api_config.IS_CORE_ENABLED and api_config.ENABLE_INSIGHT_CORE_FALLBACK:
+            probes["is_core_available"] = self._ping(api_config.IS_CORE_ENDPOINT)
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(probe, api_config.STATUS_PROBE_TIMEOUT) for probe in probes.values()),
+            return_exceptions=True
+        )
+        for name, result in zip(probes, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Fehler bei der Statusabfrage ({name}): {str(result) or type(result).__name__}")
+            else:
+                status[name] = result
+        if api_config.ENABLE_MODEL_FALLBACK:
+            status["fallback_model_available"] = status["primary_model_available"]
+        
+        # System ist online, wenn mindestens ein Modell verfügbar ist
+        status["online"] = (
+            status["primary_model_available"] or 
+            status["fallback_model_available"] or 
+            status["is_core_available"]
+        )
+        
+        return status
 
     # Demo-Funktionen für Tests ohne Mistral-API
     
     async def generate_demo_solution(self, request: NexusRequest) -> NexusResponse:
         """Generiert eine Demo-Lösung ohne Backend-Verbindung"""
-        await asyncio.sleep(2)  # Simulation der Verarbeitungszeit
+        if self._demo_delay:
+            await asyncio.sleep(self._demo_delay)  # Simulation der Verarbeitungszeit
         
-        solution_text = f"""
-# Lösungsvorschlag für: {request.query}
-
-## Analyse des Problems
-{request.query} stellt ein komplexes Problem dar, das mehrere Facetten hat:
-1. Die Hauptherausforderung liegt in der Strukturierung und Organisation der Daten
-2. Es gibt verschiedene Stakeholder mit unterschiedlichen Interessen
-3. Die Skalierbarkeit der Lösung muss berücksichtigt werden
-
-## Empfohlene Lösung
-Eine mehrstufige Strategie ist hier am sinnvollsten:
-
-1. Zunächst sollten die Anforderungen klar definiert werden
-2. Die Datenstrukturen müssen entsprechend modelliert werden
-3. Ein iterativer Entwicklungsprozess ermöglicht kontinuierliches Feedback
-4. Automatisierte Tests sichern die Qualität
-5. Dokumentation für alle Beteiligten erstellen
-
-## Technische Umsetzung
-```python
-# Beispiel-Implementierung eines zentralen Datenmodells
-class SolutionModel:
-    def __init__(self, id, title, steps):
-        self.id = id
-        self.title = title
-        self.steps = steps
-```
-
-## Nächste Schritte
-1. Erstellen eines Prototyps
-2. Sammeln von Feedback
-3. Iterative Verbesserung
-4. Ausrollen der Lösung
-        """
+        solution_text = _DEMO_SOLUTION_TEMPLATE.format_map({"query": request.query})
         
         steps = [
             "Problem analysieren",
@@ -344,44 +1008,18 @@ class SolutionModel:
     
     async def generate_demo_analysis(self, request: NexusRequest) -> NexusResponse:
         """Generiert eine Demo-Analyse ohne Backend-Verbindung"""
-        await asyncio.sleep(2)  # Simulation der Verarbeitungszeit
+        if self._demo_delay:
+            await asyncio.sleep(self._demo_delay)  # Simulation der Verarbeitungszeit
         
-        analysis_text = f"""
-# Strukturierte Analyse von: {request.query}
-
-## Zerlegung des Problems
-1. **Kernaspekte**:
-   - Hauptfragestellung: {request.query.split('.')[0]}
-   - Komplexitätsgrad: Mittel bis hoch
-   - Domänenspezifisches Wissen erforderlich: Ja
-
-2. **Kontextuelle Faktoren**:
-   {f"- Berücksichtigter Kontext: {request.context}" if request.context else "- Kein spezifischer Kontext angegeben"}
-   - Relevante Einflussfaktoren: Technologie, Marktbedingungen, Ressourcenverfügbarkeit
-
-## Hauptkomponenten der Analyse
-1. **Technische Dimension**:
-   - Erforderliche Technologien: Cloud-Infrastruktur, Datenbanksysteme, API-Management
-   - Skalierbarkeitsanforderungen: Hoch
-   - Integration mit bestehenden Systemen: Mittlerer Komplexitätsgrad
-
-2. **Organisatorische Dimension**:
-   - Stakeholder-Management: 5-7 Hauptbeteiligte
-   - Change-Management-Bedarf: Signifikant
-   - Schulungsbedarf: Moderat
-
-3. **Wirtschaftliche Dimension**:
-   - Investitionsbedarf: Mittel bis hoch
-   - ROI-Zeitrahmen: 18-24 Monate
-   - Risikofaktoren: Technologische Veralterung, Marktveränderungen
-
-## Handlungsempfehlungen
-1. Detaillierte Anforderungsanalyse durchführen
-2. Proof-of-Concept für kritische Komponenten entwickeln
-3. Stakeholder-Workshop zur Validierung der Anforderungen organisieren
-4. Risikomanagement-Plan erstellen
-5. Iterativen Implementierungsplan mit Meilensteinen entwickeln
-        """
+        context_line = (
+            f"- Berücksichtigter Kontext: {request.context}" if request.context
+            else "- Kein spezifischer Kontext angegeben"
+        )
+        analysis_text = _DEMO_ANALYSIS_TEMPLATE.format_map({
+            "query": request.query,
+            "topic": request.query.split('.')[0],
+            "context_line": context_line,
+        })
         
         steps = [
             "Problemzerlegung",
@@ -401,33 +1039,17 @@ class SolutionModel:
 
     async def _generate_with_perplexity(self, request: NexusRequest) -> NexusResponse:
         """Generate a solution using Perplexity API."""
-        from openai import OpenAI
-        import os
-        import time
-        
         start_time = time.time()
         
         try:
-            api_key = os.getenv("PERPLEXITY_API_KEY")
-            if not api_key:
-                raise ValueError("PERPLEXITY_API_KEY not found in environment variables")
-            
             # Erstellen des Clients mit der Perplexity-Basis-URL
-            client = OpenAI(api_key=api_key, base_url="https://api.perplexity.ai")
+            client = self._provider_client("perplexity")
             
             # Erstellen der Nachrichten für die Anfrage
-            system_message = self.get_template("solution_prompt", {
-                "goals": request.goals or "Provide a comprehensive solution",
-                "details": request.context or ""
-            })
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": request.query}
-            ]
+            messages = self._build_messages("solution_prompt", request, "Provide a comprehensive solution")
             
             # API-Aufruf
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="llama-3-sonar-large-32k-online",
                 messages=messages,
                 temperature=0.7,
@@ -436,7 +1058,7 @@ class SolutionModel:
             
             # Verarbeiten der Antwort
             solution_text = response.choices[0].message.content
-            steps = self._extract_steps(solution_text)
+            steps = self._extract_steps(solution_text, "solution")
             
             # Prüfen auf Zitate, falls vorhanden
             references = []
@@ -463,33 +1085,17 @@ class SolutionModel:
 
     async def _generate_with_o1_mini(self, request: NexusRequest) -> NexusResponse:
         """Generate a solution using O1 mini API."""
-        from openai import OpenAI
-        import os
-        import time
-        
         start_time = time.time()
         
         try:
-            api_key = os.getenv("O1_MINI_API_KEY")
-            if not api_key:
-                raise ValueError("O1_MINI_API_KEY not found in environment variables")
-            
             # OpenAI-Client für O1 mini
-            client = OpenAI(api_key=api_key)
+            client = self._provider_client("o1_mini")
             
             # Erstellen der Nachrichten für die Anfrage
-            system_message = self.get_template("solution_prompt", {
-                "goals": request.goals or "Provide a comprehensive solution",
-                "details": request.context or ""
-            })
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": request.query}
-            ]
+            messages = self._build_messages("solution_prompt", request, "Provide a comprehensive solution")
             
             # API-Aufruf (angepasst für O1 mini)
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="o1-mini",  # O1 mini model
                 messages=messages,
                 temperature=0.7,
@@ -498,7 +1104,7 @@ class SolutionModel:
             
             # Verarbeiten der Antwort
             solution_text = response.choices[0].message.content
-            steps = self._extract_steps(solution_text)
+            steps = self._extract_steps(solution_text, "solution")
             
             processing_time = time.time() - start_time
             
@@ -519,33 +1125,17 @@ class SolutionModel:
 
     async def _generate_with_4o_mini(self, request: NexusRequest) -> NexusResponse:
         """Generate a solution using 4o-mini API."""
-        from openai import OpenAI
-        import os
-        import time
-        
         start_time = time.time()
         
         try:
-            api_key = os.getenv("FOUR_O_MINI_API_KEY")
-            if not api_key:
-                raise ValueError("FOUR_O_MINI_API_KEY not found in environment variables")
-            
             # OpenAI-Client für 4o-mini
-            client = OpenAI(api_key=api_key)
+            client = self._provider_client("4o_mini")
             
             # Erstellen der Nachrichten für die Anfrage
-            system_message = self.get_template("solution_prompt", {
-                "goals": request.goals or "Provide a comprehensive solution",
-                "details": request.context or ""
-            })
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": request.query}
-            ]
+            messages = self._build_messages("solution_prompt", request, "Provide a comprehensive solution")
             
             # API-Aufruf (angepasst für 4o-mini)
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="4o-mini",  # 4o-mini model
                 messages=messages,
                 temperature=0.7,
@@ -554,7 +1144,7 @@ class SolutionModel:
             
             # Verarbeiten der Antwort
             solution_text = response.choices[0].message.content
-            steps = self._extract_steps(solution_text)
+            steps = self._extract_steps(solution_text, "solution")
             
             processing_time = time.time() - start_time
             
@@ -575,33 +1165,17 @@ class SolutionModel:
 
     async def _analyze_with_perplexity(self, request: NexusRequest) -> NexusResponse:
         """Analyze a problem using Perplexity API."""
-        from openai import OpenAI
-        import os
-        import time
-        
         start_time = time.time()
         
         try:
-            api_key = os.getenv("PERPLEXITY_API_KEY")
-            if not api_key:
-                raise ValueError("PERPLEXITY_API_KEY not found in environment variables")
-            
             # Erstellen des Clients mit der Perplexity-Basis-URL
-            client = OpenAI(api_key=api_key, base_url="https://api.perplexity.ai")
+            client = self._provider_client("perplexity")
             
             # Erstellen der Nachrichten für die Anfrage
-            system_message = self.get_template("analysis_prompt", {
-                "goals": request.goals or "Provide a comprehensive analysis",
-                "details": request.context or ""
-            })
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": request.query}
-            ]
+            messages = self._build_messages("analysis_prompt", request, "Provide a comprehensive analysis")
             
             # API-Aufruf
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="llama-3-sonar-large-32k-online",
                 messages=messages,
                 temperature=0.7,
@@ -610,7 +1184,7 @@ class SolutionModel:
             
             # Verarbeiten der Antwort
             analysis_text = response.choices[0].message.content
-            steps = self._extract_steps(analysis_text)
+            steps = self._extract_steps(analysis_text, "analysis")
             
             # Prüfen auf Zitate, falls vorhanden
             references = []
@@ -0,0 +1,86 @@
+"""
+Textverarbeitung für Nexus-Antworten (Extraktion von Lösungsschritten).
+
+Das Modul ist vollständig typisiert und kann mit mypyc zu einer C-Erweiterung
+kompiliert werden:
+
+    mypyc app/services/nexus_text_utils.py
+
+Eine kompilierte Erweiterung wird beim Import automatisch anstelle dieser Datei
+geladen; ohne sie läuft die reine Python-Implementierung.
+"""
+
+import io
+from typing import Final, FrozenSet, Iterator, List, Optional
+
+# Überschriften, die keine eigenen Schritte darstellen
+IGNORED_STEPS: Final[FrozenSet[str]] = frozenset({"Einleitung", "Fazit", "Zusammenfassung", "Übersicht"})
+
+
+def iter_steps(text: str) -> Iterator[str]:
+    """
+    Liefert die Schritte eines Markdown-Textes: Überschriften (# Überschrift),
+    nummerierte Listen (1. Schritt) und Aufzählungslisten (- Schritt).
+    Die Zeilenanfänge werden mit einfachen Zeichenprüfungen statt Regex erkannt.
+    """
+    # StringIO liefert die Zeilen einzeln, ohne wie text.split("\n") eine Liste
+    # aller Zeilen anzulegen; bei vorzeitigem Abbruch bleibt der Rest unangetastet
+    for raw_line in io.StringIO(text, newline="\n"):
+        # Fließtext (der Großteil der Zeilen) anhand des ersten Zeichens verwerfen,
+        # bevor für strip() eine neue Zeichenkette angelegt wird
+        first = raw_line[0]
+        if first not in "#-*" and not first.isdigit() and not first.isspace():
+            continue
+
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        first = line[0]
+        step_text: str
+        if first == "#":
+            rest = line.lstrip("#")
+            if not rest[:1].isspace():
+                continue
+            step_text = rest.strip()
+        elif first == "-" or first == "*":
+            if not line[1:2].isspace():
+                continue
+            step_text = line[1:].strip()
+        elif first.isdigit():
+            # Nummerierte Schritte behalten ihre Nummer ("1. Schritt")
+            end = 1
+            while end < len(line) and line[end].isdigit():
+                end += 1
+            if line[end:end + 1] != "." or not line[end + 1:end + 2].isspace():
+                continue
+            step_text = line
+        else:
+            continue
+
+        # Nur sinnvolle Schritte liefern (mindestens 3 Zeichen, nicht "Einleitung", etc.)
+        if len(step_text) > 3 and step_text not in IGNORED_STEPS:
+            yield step_text
+
+
+def default_steps(mode: str) -> List[str]:
+    """Standard-Schritte für Analysen ("analysis") bzw. Lösungen ("solution"), falls im Text keine gefunden wurden"""
+    if mode == "analysis":
+        return ["Problemanalyse", "Kontextuelle Einordnung", "Dimensionale Bewertung", "Schlussfolgerung"]
+    return ["Problemdefinition", "Lösungsstrategie", "Umsetzungsschritte", "Ergebnisvalidierung"]
+
+
+def extract_steps(text: str, mode: str, max_steps: Optional[int] = None) -> List[str]:
+    """
+    Extrahiert Schritte aus dem Text; mit max_steps endet die Suche, sobald genügend
+    Schritte gefunden wurden. Ohne Treffer werden die Standard-Schritte des Modus
+    ("analysis" oder "solution") geliefert.
+    """
+    steps: List[str] = []
+
+    for step_text in iter_steps(text):
+        steps.append(step_text)
+        if max_steps is not None and len(steps) >= max_steps:
+            break
+
+    return steps or default_steps(mode)
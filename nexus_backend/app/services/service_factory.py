@@ -1,8 +1,15 @@
-from .nexus_service import NexusService
+from functools import lru_cache
 
-# Singleton-Instanzen
-nexus_service = NexusService()
+from .nexus_service import NexusService
+from ..core.api_config import api_config
 
-def get_nexus_service():
-    """Liefert die Singleton-Instanz des NexusService zurück"""
-    return nexus_service 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_nexus_service() -> NexusService:
+    """
+    Liefert die Singleton-Instanz des NexusService zurück. Sie wird erst beim
+    ersten Aufruf erstellt, nicht schon beim Import dieses Moduls.
+    """
+    return NexusService(
+        max_batch_size=api_config.NEXUS_MAX_BATCH_SIZE,
+        batch_window_ms=api_config.NEXUS_BATCH_WINDOW_MS
+    )
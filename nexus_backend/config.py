@@ -5,6 +5,7 @@ Stellt Einstellungen für Datenbankverbindungen, API-Endpunkte und LLMs bereit.
 
 import os
 from functools import lru_cache
+from types import MappingProxyType
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from typing import List
@@ -67,11 +68,13 @@ class Settings(BaseSettings):
     language_detection: bool = True
     default_language: str = "de"
     
+    # Unveränderlich: Die Einstellungen werden einmal geladen und nur noch gelesen
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
         "case_sensitive": False,
-        "extra": "allow"
+        "extra": "allow",
+        "frozen": True
     }
 
 
@@ -84,13 +87,20 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache(maxsize=4)
+def _mistral_headers(api_key):
+    """Unveränderliche Header pro API-Schlüssel; wird nur bei einem neuen Schlüssel neu erzeugt"""
+    return MappingProxyType({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    })
+
+
 class MistralConfig:
     API_KEY = os.getenv("MISTRAL_API_KEY")
     API_URL = "https://api.mistral.ai/v1/analyze"
 
     @staticmethod
     def headers():
-        return {
-            "Authorization": f"Bearer {MistralConfig.API_KEY}",
-            "Content-Type": "application/json"
-        } 
\ No newline at end of file
+        # Dieselbe schreibgeschützte Header-Zuordnung für alle Anfragen wiederverwenden
+        return _mistral_headers(MistralConfig.API_KEY)
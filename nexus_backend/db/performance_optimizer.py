@@ -6,33 +6,107 @@ Optimierung der Vektordatenbank-Leistung basierend auf Nutzungsmustern.
 """
 
 import time
+import functools
 import logging
 import asyncio
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Optional, Tuple, Any, Callable, Deque, TYPE_CHECKING
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import psutil
 import threading
 import statistics
 
-from .vector_db import VectorDB
+if TYPE_CHECKING:
+    from .vector_db import VectorDB  # nur für Typangaben; chromadb wird nicht beim Import geladen
 
 
 logger = logging.getLogger(__name__)
 
+# Umrechnung Bytes -> MB als Multiplikation statt Division pro Messung
+_BYTES_TO_MB = 1.0 / (1024 * 1024)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class QueryMetrics:
     """Speichert Metriken für eine einzelne Datenbankabfrage."""
     query_type: str  # 'search', 'add', 'update', 'delete'
     execution_time: float  # in Sekunden
     result_count: int  # Anzahl der zurückgegebenen Ergebnisse
     vector_dimension: int  # Dimensionen des Vektors
-    timestamp: datetime  # Zeitstempel der Abfrage
+    timestamp: float  # Zeitpunkt der Abfrage (time.monotonic())
     memory_usage: float  # Speichernutzung in MB
     query_params: Dict[str, Any]  # Parameter der Abfrage
 
 
+class _MemorySampler:
+    """
+    Liest Prozess- und Systemspeicher höchstens einmal pro Intervall aus.
+    Dazwischen werden die zuletzt gemessenen Werte geliefert, sodass nicht jede
+    Abfrage eigene Systemaufrufe auslöst.
+    """
+    
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.process = psutil.Process()  # Einmal anlegen statt pro Messung
+        self.last_ts = float("-inf")
+        self.last_rss_mb = 0.0
+        self.last_vm_percent = 0.0
+        self._refresh_lock = threading.Lock()
+    
+    def rss_mb(self) -> float:
+        """Aktueller Prozessspeicher in MB (ohne Zwischenspeicherung)."""
+        return self.process.memory_info().rss * _BYTES_TO_MB
+    
+    def sample(self, now: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Liefert (Prozessspeicher in MB, Systemspeicher in Prozent).
+        Ist der letzte Messwert veraltet, misst genau ein Aufrufer neu; parallele
+        Aufrufer warten nicht, sondern erhalten den vorherigen Wert.
+        now (time.monotonic()) kann übergeben werden, wenn der Aufrufer ihn bereits kennt.
+        """
+        if now is None:
+            now = time.monotonic()
+        if now - self.last_ts > self.interval and self._refresh_lock.acquire(blocking=False):
+            try:
+                self.last_rss_mb = self.rss_mb()
+                self.last_vm_percent = psutil.virtual_memory().percent
+                self.last_ts = now
+            finally:
+                self._refresh_lock.release()
+        return self.last_rss_mb, self.last_vm_percent
+
+
+@dataclass
+class TypeStatistics:
+    """Laufende Kennzahlen eines Abfragetyps über die gespeicherte Historie."""
+    count: int = 0
+    sum_time: float = 0.0
+    sum_results: int = 0
+    min_time: float = float("inf")
+    max_time: float = 0.0
+    # Minimum/Maximum sind veraltet, weil der Extremwert aus der Historie gefallen ist
+    extremes_stale: bool = False
+    
+    def add(self, metric: QueryMetrics):
+        """Nimmt eine neue Metrik in O(1) auf."""
+        self.count += 1
+        self.sum_time += metric.execution_time
+        self.sum_results += metric.result_count
+        if metric.execution_time < self.min_time:
+            self.min_time = metric.execution_time
+        if metric.execution_time > self.max_time:
+            self.max_time = metric.execution_time
+    
+    def remove(self, metric: QueryMetrics):
+        """Nimmt eine aus der Historie gefallene Metrik in O(1) heraus."""
+        self.count -= 1
+        self.sum_time -= metric.execution_time
+        self.sum_results -= metric.result_count
+        if metric.execution_time <= self.min_time or metric.execution_time >= self.max_time:
+            self.extremes_stale = True
+
+
 class PerformanceOptimizer:
     """
     Überwacht und optimiert die Leistung der Vektordatenbank.
@@ -43,7 +117,7 @@ class PerformanceOptimizer:
     
     def __init__(
         self, 
-        vector_db: VectorDB,
+        vector_db: "VectorDB",
         optimization_interval: int = 3600,  # 1 Stunde
         metrics_history_size: int = 1000,
         slow_query_threshold: float = 2.0,  # 2 Sekunden
@@ -68,9 +142,18 @@ class PerformanceOptimizer:
         self.memory_alert_threshold = memory_alert_threshold
         self.enable_auto_optimization = enable_auto_optimization
         
-        self.query_metrics: List[QueryMetrics] = []
-        self.optimization_lock = threading.Lock()
+        # Begrenzte Metrikhistorie: beim Anhängen fällt der älteste Eintrag in O(1) heraus
+        self.query_metrics: Deque[QueryMetrics] = deque(maxlen=metrics_history_size)
+        self._time_sum = 0.0  # Summe der Ausführungszeiten in der Historie
+        self._stats_per_type: Dict[str, TypeStatistics] = {}
+        self._memory_sampler = _MemorySampler()
+        # Schützt nur die O(1)-Aktualisierungen von Historie und Zählern
+        self._metrics_lock = threading.Lock()
+        # Verhindert parallele Optimierungsläufe auf dem Event-Loop
+        self.optimization_lock = asyncio.Lock()
+        self._optimizer_task: Optional[asyncio.Task] = None
         self.last_optimization_time = datetime.now()
+        self._last_optimization_at = time.monotonic()  # für Intervallprüfungen im Hot Path
         
         # Statistiken zur Datenbankleistung
         self.stats = {
@@ -87,20 +170,45 @@ class PerformanceOptimizer:
             self._start_auto_optimization()
     
     def _start_auto_optimization(self):
-        """Startet einen Hintergrund-Task für regelmäßige Optimierungen."""
-        optimizer_thread = threading.Thread(
-            target=self._run_optimizer_loop,
-            daemon=True
-        )
-        optimizer_thread.start()
+        """
+        Startet die regelmäßigen Optimierungen als Task auf dem laufenden Event-Loop.
+        Ohne laufenden Loop (z.B. beim Anlegen während des Imports) startet erst start().
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("Kein laufender Event-Loop, automatische Optimierung startet mit start()")
+            return
+        
+        self._optimizer_task = loop.create_task(self._optimizer_loop_async())
         logger.info("Automatische Vektordatenbank-Optimierung wurde gestartet")
     
-    def _run_optimizer_loop(self):
-        """Kontinuierliche Schleife für regelmäßige Optimierungen."""
+    async def start(self):
+        """Startet die automatische Optimierung, falls sie aktiviert ist und noch nicht läuft."""
+        if self.enable_auto_optimization and (self._optimizer_task is None or self._optimizer_task.done()):
+            self._start_auto_optimization()
+    
+    async def stop(self):
+        """Beendet die automatische Optimierung."""
+        if self._optimizer_task is not None:
+            self._optimizer_task.cancel()
+            try:
+                await self._optimizer_task
+            except asyncio.CancelledError:
+                pass
+            self._optimizer_task = None
+    
+    async def _optimizer_loop_async(self):
+        """Kontinuierliche Schleife für regelmäßige Optimierungen auf dem Event-Loop."""
         while True:
-            time.sleep(self.optimization_interval)
-            with self.optimization_lock:
-                asyncio.run(self.optimize_database())
+            await asyncio.sleep(self.optimization_interval)
+            async with self.optimization_lock:
+                await self.optimize_database()
+    
+    def _snapshot_metrics(self) -> List[QueryMetrics]:
+        """Kopie der Metrikhistorie, die unabhängig von parallelen Schreibzugriffen durchlaufen werden kann."""
+        with self._metrics_lock:
+            return list(self.query_metrics)
     
     async def record_query(
         self,
@@ -123,7 +231,8 @@ class PerformanceOptimizer:
             query_params: Parameter der Abfrage
         """
         execution_time = end_time - start_time
-        memory_usage = psutil.Process().memory_info().rss / (1024 * 1024)  # in MB
+        now = time.monotonic()  # einmal pro Aufruf für Zeitstempel, Messung und Intervallprüfung
+        memory_usage, memory_percent = self._memory_sampler.sample(now)  # MB bzw. Prozent
         
         # Neue Abfragemetrik erstellen
         metric = QueryMetrics(
@@ -131,45 +240,86 @@ class PerformanceOptimizer:
             execution_time=execution_time,
             result_count=result_count,
             vector_dimension=vector_dimension,
-            timestamp=datetime.now(),
+            timestamp=now,
             memory_usage=memory_usage,
             query_params=query_params
         )
         
-        # Liste der Metriken aktualisieren
-        with self.optimization_lock:
+        # Metrik anhängen und Zähler in O(1) fortschreiben;
+        # Systemabfragen, Logging und Optimierung laufen außerhalb der Sperre
+        is_slow = execution_time > self.slow_query_threshold
+        with self._metrics_lock:
+            evicted = self.query_metrics[0] if len(self.query_metrics) == self.metrics_history_size else None
             self.query_metrics.append(metric)
-            if len(self.query_metrics) > self.metrics_history_size:
-                self.query_metrics.pop(0)  # Älteste Metrik entfernen
+            self._time_sum += execution_time - (evicted.execution_time if evicted else 0.0)
+            if evicted is not None:
+                self._stats_per_type[evicted.query_type].remove(evicted)
+            type_stats = self._stats_per_type.get(query_type)
+            if type_stats is None:
+                type_stats = self._stats_per_type[query_type] = TypeStatistics()
+            type_stats.add(metric)
             
-            # Statistiken aktualisieren
             self.stats["total_queries"] += 1
-            if execution_time > self.slow_query_threshold:
+            if is_slow:
                 self.stats["slow_queries"] += 1
-                logger.warning(
-                    f"Langsame {query_type}-Abfrage erkannt: {execution_time:.2f}s, "
-                    f"Parameter: {query_params}"
-                )
-            
-            # Durchschnittliche Abfragezeit berechnen
-            all_times = [m.execution_time for m in self.query_metrics]
-            self.stats["avg_query_time"] = sum(all_times) / len(all_times)
             
             # Höchste Speichernutzung überwachen
             if memory_usage > self.stats["peak_memory_usage"]:
                 self.stats["peak_memory_usage"] = memory_usage
+        
+        if is_slow:
+            # %-Formatierung: die Meldung wird nur formatiert, wenn sie tatsächlich ausgegeben wird
+            logger.warning(
+                "Langsame %s-Abfrage erkannt: %.2fs, Parameter: %s",
+                query_type, execution_time, query_params
+            )
+        
+        # Speicherwarnung ausgeben, wenn nötig
+        if memory_percent > self.memory_alert_threshold:
+            logger.warning(
+                "Hohe Speicherauslastung erkannt: %.1f%% (%.1f MB für Prozess)",
+                memory_percent, memory_usage
+            )
             
-            # Speicherwarnung ausgeben, wenn nötig
-            memory_percent = psutil.virtual_memory().percent
-            if memory_percent > self.memory_alert_threshold:
-                logger.warning(
-                    f"Hohe Speicherauslastung erkannt: {memory_percent:.1f}% "
-                    f"({memory_usage:.1f} MB für Prozess)"
-                )
-                
-                # Bei hoher Speichernutzung sofortige Optimierung durchführen
-                if datetime.now() - self.last_optimization_time > timedelta(minutes=5):
-                    await self.optimize_database(force=True)
+            # Bei hoher Speichernutzung sofortige Optimierung durchführen; die Sperre
+            # wird nur genommen, wenn eine Optimierung fällig ist, und danach erneut
+            # geprüft, da ein paralleler Aufruf sie inzwischen ausgeführt haben kann
+            if self._emergency_optimization_due(now):
+                async with self.optimization_lock:
+                    if self._emergency_optimization_due(now):
+                        await self.optimize_database(force=True)
+    
+    def _emergency_optimization_due(self, now: float) -> bool:
+        """Prüft, ob seit der letzten Optimierung genug Zeit für eine Notfall-Optimierung vergangen ist."""
+        return now - self._last_optimization_at > 5 * 60
+    
+    def _refresh_stale_extremes(self):
+        """
+        Bestimmt Minimum und Maximum der Typen neu, deren Extremwert aus der Historie
+        gefallen ist. Nur dann wird die Historie durchlaufen; Aufruf unter _metrics_lock.
+        """
+        stale = {
+            query_type: type_stats
+            for query_type, type_stats in self._stats_per_type.items()
+            if type_stats.extremes_stale
+        }
+        if not stale:
+            return
+        
+        for type_stats in stale.values():
+            type_stats.min_time = float("inf")
+            type_stats.max_time = 0.0
+            type_stats.extremes_stale = False
+        for metric in self.query_metrics:
+            type_stats = stale.get(metric.query_type)
+            if type_stats is not None:
+                type_stats.min_time = min(type_stats.min_time, metric.execution_time)
+                type_stats.max_time = max(type_stats.max_time, metric.execution_time)
+    
+    def _avg_query_time(self) -> float:
+        """Durchschnittliche Ausführungszeit über die gespeicherte Historie."""
+        count = len(self.query_metrics)
+        return self._time_sum / count if count else 0.0
         
     async def optimize_database(self, force: bool = False):
         """
@@ -195,7 +345,7 @@ class PerformanceOptimizer:
             # 2. Verwaiste Vektoren entfernen
             orphaned_count = await self._clean_orphaned_vectors()
             if orphaned_count > 0:
-                logger.info(f"{orphaned_count} verwaiste Vektoren wurden entfernt")
+                logger.info("%d verwaiste Vektoren wurden entfernt", orphaned_count)
                 optimizations_applied.append("orphaned_vectors_removed")
             
             # 3. Cache-Optimierung basierend auf häufigen Anfragen
@@ -205,13 +355,14 @@ class PerformanceOptimizer:
             
             # Statistiken aktualisieren
             self.last_optimization_time = datetime.now()
+            self._last_optimization_at = time.monotonic()
             self.stats["optimization_count"] += 1
             self.stats["last_optimization"] = self.last_optimization_time
             
             optimization_time = time.time() - optimization_start_time
             logger.info(
-                f"Vektordatenbank-Optimierung abgeschlossen in {optimization_time:.2f}s. "
-                f"Angewendete Optimierungen: {', '.join(optimizations_applied)}"
+                "Vektordatenbank-Optimierung abgeschlossen in %.2fs. Angewendete Optimierungen: %s",
+                optimization_time, ", ".join(optimizations_applied)
             )
             
             return {
@@ -221,7 +372,7 @@ class PerformanceOptimizer:
             }
         
         except Exception as e:
-            logger.error(f"Fehler bei der Datenbankoptimierung: {str(e)}", exc_info=True)
+            logger.error("Fehler bei der Datenbankoptimierung: %s", e, exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -234,12 +385,13 @@ class PerformanceOptimizer:
         Returns:
             True, wenn eine Neuindexierung empfohlen wird
         """
-        if not self.query_metrics:
+        query_metrics = self._snapshot_metrics()
+        if not query_metrics:
             return False
         
-        # Leistungskennzahlen analysieren
-        recent_metrics = [m for m in self.query_metrics 
-                         if (datetime.now() - m.timestamp) < timedelta(hours=24)]
+        # Leistungskennzahlen der letzten 24 Stunden analysieren
+        cutoff = time.monotonic() - 24 * 3600
+        recent_metrics = [m for m in query_metrics if m.timestamp > cutoff]
         
         if not recent_metrics:
             return False
@@ -297,38 +449,65 @@ class PerformanceOptimizer:
         Returns:
             Wörterbuch mit Leistungsstatistiken
         """
-        with self.optimization_lock:
+        with self._metrics_lock:
             # Aktuelle Statistiken in einem neuen Wörterbuch kopieren
             stats = dict(self.stats)
+            stats["avg_query_time"] = self._avg_query_time()
             
-            # Hinzufügen detaillierterer Statistiken nach Abfragetyp
+            # Statistiken pro Abfragetyp aus den laufenden Kennzahlen ableiten
             if self.query_metrics:
-                # Nach Abfragetyp gruppieren
-                metrics_by_type = {}
-                for metric in self.query_metrics:
-                    if metric.query_type not in metrics_by_type:
-                        metrics_by_type[metric.query_type] = []
-                    metrics_by_type[metric.query_type].append(metric)
-                
-                # Statistiken pro Abfragetyp berechnen
-                stats["metrics_by_type"] = {}
-                for query_type, metrics in metrics_by_type.items():
-                    times = [m.execution_time for m in metrics]
-                    counts = [m.result_count for m in metrics]
-                    
-                    stats["metrics_by_type"][query_type] = {
-                        "count": len(metrics),
-                        "avg_time": statistics.mean(times) if times else 0,
-                        "max_time": max(times) if times else 0,
-                        "min_time": min(times) if times else 0,
-                        "avg_result_count": statistics.mean(counts) if counts else 0
+                self._refresh_stale_extremes()
+                stats["metrics_by_type"] = {
+                    query_type: {
+                        "count": type_stats.count,
+                        "avg_time": type_stats.sum_time / type_stats.count,
+                        "max_time": type_stats.max_time,
+                        "min_time": type_stats.min_time,
+                        "avg_result_count": type_stats.sum_results / type_stats.count
                     }
-                
-                # Aktuelle Speichernutzung
-                stats["current_memory_usage"] = psutil.Process().memory_info().rss / (1024 * 1024)
-                stats["system_memory_percent"] = psutil.virtual_memory().percent
-            
-            return stats
+                    for query_type, type_stats in self._stats_per_type.items()
+                    if type_stats.count
+                }
+        
+        if "metrics_by_type" in stats:
+            # Aktuelle Speichernutzung
+            stats["current_memory_usage"] = self._memory_sampler.rss_mb()
+            stats["system_memory_percent"] = psutil.virtual_memory().percent
+        
+        return stats
+
+
+def _search_params(args, kwargs) -> Dict[str, Any]:
+    """Abfrageparameter einer Suche."""
+    query_params = {}
+    if args and isinstance(args[0], str):
+        query_params["query"] = args[0]
+    if "limit" in kwargs:
+        query_params["limit"] = kwargs["limit"]
+    return query_params
+
+
+def _write_params(args, kwargs) -> Dict[str, Any]:
+    """Abfrageparameter beim Hinzufügen oder Aktualisieren eines Dokuments."""
+    content = getattr(args[0], "content", None) if args else None
+    return {"content_length": len(content)} if content is not None else {}
+
+
+def _delete_params(args, kwargs) -> Dict[str, Any]:
+    """Abfrageparameter beim Löschen eines Dokuments."""
+    return {"id": args[0]} if args else {}
+
+
+def _no_params(args, kwargs) -> Dict[str, Any]:
+    return {}
+
+
+_PARAM_EXTRACTORS: Dict[str, Callable[[tuple, dict], Dict[str, Any]]] = {
+    "search": _search_params,
+    "add": _write_params,
+    "update": _write_params,
+    "delete": _delete_params,
+}
 
 
 # Decorator für die Leistungsüberwachung von VectorDB-Methoden
@@ -336,6 +515,9 @@ def monitor_performance(query_type: str, vector_dimension: int = 384):
     """
     Decorator zum Überwachen der Leistung von VectorDB-Methoden.
     
+    Parameter-Extraktion und Ergebniszählung werden beim Dekorieren einmal für den
+    Abfragetyp ausgewählt, statt sie bei jedem Aufruf über Fallunterscheidungen zu bestimmen.
+    
     Args:
         query_type: Art der Abfrage (search, add, update, delete)
         vector_dimension: Dimensionalität der verwendeten Vektoren
@@ -343,23 +525,16 @@ def monitor_performance(query_type: str, vector_dimension: int = 384):
     Returns:
         Decorierte Funktion, die Leistungsmetriken aufzeichnet
     """
+    extract_params = _PARAM_EXTRACTORS.get(query_type, _no_params)
+    is_search = query_type == "search"
+    # Schreibende Abfragen betreffen genau ein Dokument
+    fixed_result_count = 1 if query_type in ("add", "update", "delete") else 0
+    
     def decorator(func):
+        @functools.wraps(func)
         async def wrapper(self, *args, **kwargs):
             # Abfrageparameter extrahieren
-            query_params = {}
-            
-            # Für verschiedene Abfragetypen die relevanten Parameter extrahieren
-            if query_type == "search":
-                if args and isinstance(args[0], str):
-                    query_params["query"] = args[0]
-                if "limit" in kwargs:
-                    query_params["limit"] = kwargs["limit"]
-            elif query_type in ["add", "update"]:
-                if args and hasattr(args[0], "content"):
-                    query_params["content_length"] = len(args[0].content)
-            elif query_type == "delete":
-                if args:
-                    query_params["id"] = args[0]
+            query_params = extract_params(args, kwargs)
             
             # Zeit messen
             start_time = time.time()
@@ -367,17 +542,16 @@ def monitor_performance(query_type: str, vector_dimension: int = 384):
             end_time = time.time()
             
             # Wenn die Instanz einen Performance-Optimizer hat, Metriken aufzeichnen
-            if hasattr(self, "performance_optimizer"):
-                result_count = 0
-                
-                # Bestimmen der Ergebnisanzahl je nach Abfragetyp
-                if query_type == "search" and hasattr(result, "results"):
-                    result_count = len(result.results)
-                elif query_type in ["add", "update", "delete"]:
-                    result_count = 1
+            optimizer = getattr(self, "performance_optimizer", None)
+            if optimizer is not None:
+                result_count = fixed_result_count
+                if is_search:
+                    results = getattr(result, "results", None)
+                    if results is not None:
+                        result_count = len(results)
                 
                 # Metriken aufzeichnen
-                await self.performance_optimizer.record_query(
+                await optimizer.record_query(
                     query_type=query_type,
                     start_time=start_time,
                     end_time=end_time, 
@@ -388,4 +562,4 @@ def monitor_performance(query_type: str, vector_dimension: int = 384):
             
             return result
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
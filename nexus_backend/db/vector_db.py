@@ -3,34 +3,105 @@ Vector-Datenbank-Implementierung für das Nexus-Backend.
 Verwendet ChromaDB und Sentence-Transformers für Embedding und semantische Suche.
 """
 
+import copy
 import os
-from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union, Sequence, TYPE_CHECKING
 import logging
 from pathlib import Path
 
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-from langchain.schema import Document
-from langchain.vectorstores import Chroma
-from langchain.embeddings import HuggingFaceEmbeddings
+
+from nexus_backend.utils import json_utils
+from nexus_backend.utils.semantic_cache import SemanticCache, NUMPY_AVAILABLE
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=None)
+def _load_document_class():
+    """Importiert langchain erst bei der ersten Verwendung (schwerer Import)."""
+    from langchain.schema import Document
+    return Document
+
+
+@lru_cache(maxsize=None)
+def _load_sentence_transformer(model_name: str):
+    """
+    Lädt ein Sentence-Transformers-Modell einmal pro Prozess. Auf der GPU läuft es
+    in FP16, was Speicherbedarf und Bandbreite des Modells halbiert.
+    """
+    from sentence_transformers import SentenceTransformer
+    try:
+        import torch
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        device = "cpu"
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        model.half()
+    return model
+
+
+class SentenceTransformerEmbeddings:
+    """
+    Embedding-Funktion auf Basis eines geteilten Sentence-Transformers-Modells.
+    Erfüllt sowohl die Schnittstelle von ChromaDB (Aufruf mit einer Liste von Texten)
+    als auch die von Langchain (embed_documents/embed_query), sodass beide
+    dasselbe Modell verwenden, statt es jeweils separat zu laden.
+    Mit normalize werden die Embeddings auf Länge 1 normiert.
+    """
+    
+    def __init__(self, model_name: str, batch_size: int = 64, normalize: bool = False):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.model = _load_sentence_transformer(model_name)
+    
+    def encode(self, texts: Sequence[str]):
+        """Berechnet die Embeddings als numpy-Array."""
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize
+        )
+    
+    def __call__(self, input: Sequence[str]) -> List[List[float]]:
+        return self.encode(input).tolist()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
 class VectorDB:
     """
     Vektordatenbank für semantische Suche und Wissensrückgewinnung.
     Basiert auf ChromaDB mit Sentence-Transformers als Embedding-Modell.
     """
     
+    COLLECTION_METADATA = {"description": "Nexus Knowledge Base"}
+    # Markiert Collections, deren Embeddings normiert gespeichert werden
+    NORMALIZATION_KEY = "embedding_normalization"
+    # Batch-Größe für collection.add, wenn der Client keine Obergrenze nennt
+    DEFAULT_MAX_BATCH_SIZE = 100
+    
     def __init__(
         self, 
         persist_directory: str = "./data/vector_db",
         collection_name: str = "knowledge_base",
         embedding_model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
-        create_if_not_exists: bool = True
+        create_if_not_exists: bool = True,
+        search_cache_size: int = 0,
+        search_cache_threshold: float = 0.98
     ):
         """
         Initialisiert die Vektordatenbank.
@@ -40,6 +111,12 @@ class VectorDB:
             collection_name: Name der Kollektion in der Datenbank
             embedding_model_name: Name des Embedding-Modells von HuggingFace
             create_if_not_exists: Datenbank erstellen, falls sie nicht existiert
+            search_cache_size: Anzahl gecachter Suchergebnisse (Standard 0: kein Cache).
+                Der Cache wird nur von dieser Instanz bei add_documents/delete_collection
+                geleert; schreiben andere Prozesse in dasselbe Verzeichnis, können Treffer
+                bis zum Ablauf der TTL veraltet sein
+            search_cache_threshold: Mindest-Kosinus-Ähnlichkeit, ab der eine frühere Suche wiederverwendet wird
+                (auch Anfragen, die sich nur durch eine Verneinung unterscheiden, können darüber liegen)
         """
         self.persist_directory = os.path.abspath(persist_directory)
         self.collection_name = collection_name
@@ -49,48 +126,71 @@ class VectorDB:
         if create_if_not_exists:
             os.makedirs(self.persist_directory, exist_ok=True)
         
-        # HuggingFace-Embedding-Funktion initialisieren
-        self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
+        # Embedding-Funktion initialisieren (für ChromaDB und Langchain-kompatible Aufrufer)
+        self.embeddings = SentenceTransformerEmbeddings(embedding_model_name)
         logger.info(f"Embedding-Modell '{embedding_model_name}' initialisiert")
         
+        # Optionaler semantischer Cache für Suchergebnisse: nahezu gleiche Anfragen (z.B.
+        # wiederholte Fragen in Chat-Verläufen) werden ohne erneute Index-Suche beantwortet
+        self._search_cache: Optional[SemanticCache] = None
+        if search_cache_size > 0 and NUMPY_AVAILABLE:
+            self._search_cache = SemanticCache(
+                self.embeddings.embed_query,
+                maxsize=search_cache_size,
+                threshold=search_cache_threshold
+            )
+        
         # ChromaDB-Client initialisieren
         self.client = chromadb.PersistentClient(
             path=self.persist_directory,
             settings=Settings(anonymized_telemetry=False)
         )
         
-        # Collection abrufen oder erstellen
-        try:
-            self.collection = self.client.get_collection(name=self.collection_name)
-            logger.info(f"Collection '{collection_name}' gefunden mit {self.collection.count()} Dokumenten")
-        except ValueError:
-            # Collection existiert nicht, erstelle sie
-            if create_if_not_exists:
-                self.create_collection()
-                logger.info(f"Neue Collection '{collection_name}' erstellt")
-            else:
+        # Collection abrufen oder erstellen; get_or_create_collection vermeidet den
+        # Umweg über eine Exception und das Rennen mehrerer Worker beim Anlegen
+        if create_if_not_exists:
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                embedding_function=self.embeddings,
+                metadata=self.COLLECTION_METADATA
+            )
+        else:
+            try:
+                self.collection = self.client.get_collection(
+                    name=self.collection_name,
+                    embedding_function=self.embeddings
+                )
+            except ValueError:
                 logger.error(f"Collection '{collection_name}' existiert nicht und create_if_not_exists=False")
                 raise
-        
-        # Langchain-Chroma-Integration für erweiterte Funktionalität
-        self._langchain_db = Chroma(
-            persist_directory=self.persist_directory,
-            collection_name=self.collection_name,
-            embedding_function=self.embeddings
-        )
+        self._configure_normalization()
+        logger.info(f"Collection '{collection_name}' geöffnet mit {self.collection.count()} Dokumenten")
         
     def create_collection(self):
         """Erstellt eine neue Collection in der Datenbank."""
-        embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=self.embedding_model_name
-        )
         self.collection = self.client.create_collection(
             name=self.collection_name,
-            embedding_function=embedding_func,
-            metadata={"description": "Nexus Knowledge Base"}
+            embedding_function=self.embeddings,
+            metadata={**self.COLLECTION_METADATA, self.NORMALIZATION_KEY: "l2"}
         )
+        self.embeddings.normalize = True
+    
+    def _configure_normalization(self):
+        """
+        Normiert Embeddings nur für Collections, die dafür markiert sind. Eine leere
+        Collection wird markiert; bestehende Collections mit nicht normierten Vektoren
+        bleiben unverändert, da gemischte Normen die L2-Rangfolge verfälschen würden.
+        """
+        metadata = dict(self.collection.metadata or {})
+        if metadata.get(self.NORMALIZATION_KEY) != "l2" and self.collection.count() == 0:
+            metadata[self.NORMALIZATION_KEY] = "l2"
+            # hnsw-Parameter lassen sich nach dem Anlegen nicht ändern
+            self.collection.modify(metadata={
+                key: value for key, value in metadata.items() if not key.startswith("hnsw:")
+            })
+        self.embeddings.normalize = metadata.get(self.NORMALIZATION_KEY) == "l2"
         
-    def add_documents(self, documents: List[Union[Dict[str, Any], Document]]) -> List[str]:
+    def add_documents(self, documents: List[Union[Dict[str, Any], "Document"]]) -> List[str]:
         """
         Fügt Dokumente zur Vektordatenbank hinzu.
         
@@ -100,44 +200,63 @@ class VectorDB:
         Returns:
             Liste von IDs der hinzugefügten Dokumente
         """
-        doc_ids = []
+        if not documents:
+            return []
         
-        # Batch-weise verarbeiten für bessere Performance
-        batch_size = 100
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i+batch_size]
-            
-            # Langchain-Dokumente konvertieren
-            if isinstance(batch[0], Document):
-                # Document-Objekte in ChromaDB-Format konvertieren
-                ids = [f"doc_{i+j}" for j in range(len(batch))]
-                texts = [doc.page_content for doc in batch]
-                metadatas = [doc.metadata for doc in batch]
-                
-                # In ChromaDB einfügen
-                self.collection.add(
-                    ids=ids,
-                    documents=texts,
-                    metadatas=metadatas
-                )
-                doc_ids.extend(ids)
+        # IDs, Texte und Metadaten in einem Durchlauf extrahieren
+        doc_ids = []
+        texts = []
+        metadatas = []
+        for i, doc in enumerate(documents):
+            # Alles außer Dictionaries wird als langchain Document behandelt,
+            # sodass hier kein Import von langchain nötig ist
+            if isinstance(doc, dict):
+                doc_ids.append(doc.get("id", f"doc_{i}"))
+                texts.append(doc["content"])
+                metadatas.append(doc.get("metadata", {}))
             else:
-                # Direktes Hinzufügen als Dictionaries
-                ids = [doc.get("id", f"doc_{i+j}") for j, doc in enumerate(batch)]
-                texts = [doc["content"] for doc in batch]
-                metadatas = [doc.get("metadata", {}) for doc in batch]
-                
-                # In ChromaDB einfügen
-                self.collection.add(
-                    ids=ids,
-                    documents=texts,
-                    metadatas=metadatas
-                )
-                doc_ids.extend(ids)
+                doc_ids.append(f"doc_{i}")
+                texts.append(doc.page_content)
+                metadatas.append(doc.metadata)
+        
+        # Embeddings vorab in Batches berechnen, sodass ChromaDB sie nicht erneut erzeugt
+        embeddings = self.embeddings.embed_documents(texts)
+        
+        # Möglichst in einem Aufruf einfügen; nur oberhalb der Obergrenze des Clients wird aufgeteilt
+        max_batch_size = self._max_batch_size()
+        for start in range(0, len(doc_ids), max_batch_size):
+            end = start + max_batch_size
+            self.collection.add(
+                ids=doc_ids[start:end],
+                documents=texts[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end]
+            )
                 
+        # Gecachte Suchergebnisse berücksichtigen die neuen Dokumente nicht
+        self._clear_search_cache()
         logger.info(f"{len(doc_ids)} Dokumente zur Collection hinzugefügt")
         return doc_ids
     
+    def _max_batch_size(self) -> int:
+        """
+        Liefert die Obergrenze des Clients für einen collection.add-Aufruf: bevorzugt
+        get_max_batch_size(), sonst das Attribut max_batch_size (ältere ChromaDB-Versionen),
+        sonst DEFAULT_MAX_BATCH_SIZE.
+        """
+        size = None
+        get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+        if callable(get_max_batch_size):
+            try:
+                size = get_max_batch_size()
+            except Exception as e:
+                logger.warning(f"Maximale Batch-Größe nicht abrufbar: {str(e)}")
+        if not isinstance(size, int) or size <= 0:
+            size = getattr(self.client, "max_batch_size", None)
+        if isinstance(size, int) and size > 0:
+            return size
+        return self.DEFAULT_MAX_BATCH_SIZE
+    
     def search(
         self, 
         query: str, 
@@ -155,16 +274,35 @@ class VectorDB:
         Returns:
             Dictionary mit Suchergebnissen
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=filter_criteria
-        )
+        if self._search_cache is None:
+            results = self.collection.query(
+                query_texts=[query],
+                n_results=n_results,
+                where=filter_criteria
+            )
+        else:
+            # Das Embedding wird nur einmal berechnet: normiert als Cache-Schlüssel,
+            # für die Suche so, wie die Collection ihre Vektoren speichert
+            query_embedding = self.embeddings.embed_query(query)
+            embedding = self._search_cache.normalize(query_embedding)
+            namespace = json_utils.dumps_bytes([n_results, filter_criteria], sort_keys=True)
+            # Aufrufer erhalten stets eine eigene Kopie, damit Änderungen am Ergebnis
+            # weder den Cache noch andere Aufrufer betreffen
+            cached = self._search_cache.get(namespace, embedding)
+            if cached is not None:
+                results = copy.deepcopy(cached)
+            else:
+                results = self.collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    where=filter_criteria
+                )
+                self._search_cache.set(namespace, embedding, copy.deepcopy(results))
         
         logger.info(f"Suche nach '{query}' ergab {len(results['documents'][0])} Ergebnisse")
         return results
     
-    def search_with_langchain(self, query: str, k: int = 5) -> List[Document]:
+    def search_with_langchain(self, query: str, k: int = 5) -> List["Document"]:
         """
         Führt eine semantische Suche mit Langchain-Integration durch.
         
@@ -175,7 +313,13 @@ class VectorDB:
         Returns:
             Liste von Langchain-Document-Objekten
         """
-        docs = self._langchain_db.similarity_search(query, k=k)
+        # Über den nativen Client suchen und die Treffer als Langchain-Dokumente liefern
+        Document = _load_document_class()
+        results = self.search(query, n_results=k)
+        docs = [
+            Document(page_content=text, metadata=metadata or {})
+            for text, metadata in zip(results["documents"][0], results["metadatas"][0])
+        ]
         logger.info(f"Langchain-Suche nach '{query}' ergab {len(docs)} Ergebnisse")
         return docs
     
@@ -183,8 +327,14 @@ class VectorDB:
         """Löscht die gesamte Collection aus der Datenbank."""
         if hasattr(self, 'collection'):
             self.client.delete_collection(self.collection_name)
+            self._clear_search_cache()
             logger.warning(f"Collection '{self.collection_name}' wurde gelöscht")
     
+    def _clear_search_cache(self):
+        """Verwirft alle gecachten Suchergebnisse, z.B. nach Änderungen an der Collection."""
+        if self._search_cache is not None:
+            self._search_cache.clear()
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Gibt Statistiken über die Vektordatenbank zurück.
@@ -8,11 +8,14 @@ Dieses Skript zeigt die verschiedenen Funktionen des adaptiven Debugging-Systems
 3. Generierung von Debuggingberichten
 """
 
+import io
 import os
 import sys
 import time
 import random
 import argparse
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
 from typing import Dict, List, Any, Optional
 
 # Stelle sicher, dass das Root-Verzeichnis im Python-Pfad ist
@@ -33,6 +36,23 @@ def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
+@contextmanager
+def buffered_output():
+    """
+    Sammelt die Ausgabe eines Demo-Abschnitts und schreibt sie am Ende in einem
+    Aufruf, statt für jedes print() einzeln zu schreiben. Auch die Ausgaben des
+    Debugging-Systems werden erfasst, sodass die Reihenfolge erhalten bleibt.
+    Kann auch als Decorator verwendet werden.
+    """
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            yield
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
 def show_header(title: str):
     """Zeigt eine formatierte Überschrift an."""
     print("\n" + "=" * 60)
@@ -40,6 +60,7 @@ def show_header(title: str):
     print("=" * 60 + "\n")
 
 
+@buffered_output()
 def demonstrate_basic_debugging():
     """Demonstriert grundlegende Debugging-Funktionen."""
     show_header("Demonstration grundlegender Debugging-Funktionen")
@@ -83,19 +104,27 @@ def fix_function(a, b):
         print(f"  Fehler: {e}")
 
 
+@buffered_output()
 def demonstrate_error_patterns():
     """Demonstriert Fehlermuster und Analysen."""
     show_header("Fehlermuster und Analysefunktionen")
     
     print("Generiere verschiedene Fehlertypen für die Analyse...")
     
-    # Verwende unreliable_network_call, um verschiedene Fehler zu erzeugen
+    # Verwende unreliable_network_call, um verschiedene Fehler zu erzeugen;
+    # gleiche Fehlertypen werden gezählt und einmal zusammengefasst ausgegeben
+    successes = 0
+    failures = Counter()
     for i in range(5):
         try:
-            result = unreliable_network_call(f"api.example.com/endpoint{i}", timeout=0.1)
-            print(f"  Aufruf {i+1}: Erfolgreich")
+            unreliable_network_call(f"api.example.com/endpoint{i}", timeout=0.1)
+            successes += 1
         except Exception as e:
-            print(f"  Aufruf {i+1}: Fehler - {type(e).__name__}")
+            failures[type(e).__name__] += 1
+    
+    print(f"  Erfolgreiche Aufrufe: {successes}")
+    for error_type, count in failures.most_common():
+        print(f"  Fehler - {error_type} x {count}")
     
     # Generiere weitere Fehlertypen
     errors = [
@@ -106,11 +135,17 @@ def demonstrate_error_patterns():
         lambda: open("nicht_existierende_datei.txt"),  # FileNotFoundError
     ]
     
+    # Identische Fehler (Typ und Meldung) nur einmal ausgeben
+    seen = set()
     for i, error_func in enumerate(errors):
         try:
             error_func()
         except Exception as e:
-            print(f"  Fehler {i+1}: {type(e).__name__} - {e}")
+            key = (type(e).__name__, str(e))
+            if key in seen:
+                continue
+            seen.add(key)
+            print(f"  Fehler {i+1}: {key[0]} - {key[1]}")
     
     print("\nEin Debug-Bericht wird erstellt...")
     report = get_debug_report()
@@ -118,6 +153,7 @@ def demonstrate_error_patterns():
     print(f"  Kritische Fehler: {len(report['critical_errors'])}")
 
 
+@buffered_output()
 def demonstrate_analyzer():
     """Demonstriert den Debug-Analyzer."""
     show_header("Debug-Analyzer Funktionen")
@@ -141,6 +177,7 @@ def demonstrate_analyzer():
     print(f"  Bericht wurde nach {report_path} exportiert")
 
 
+@buffered_output()
 def demonstrate_full_cycle():
     """Demonstriert den vollständigen Debugging-Zyklus."""
     show_header("Vollständiger adaptiver Debugging-Zyklus")
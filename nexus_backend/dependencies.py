@@ -5,42 +5,188 @@ Dieses Modul definiert Abhängigkeiten, die in FastAPI-Endpunkten verwendet werd
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 import jwt
-from typing import Annotated
+from typing import Annotated, TYPE_CHECKING
 
 from settings import Settings, get_settings
-from db.vector_db import VectorDB
-from services.auth_service import AuthService
-from services.llm_service import LLMService
-from services.experts_service import ExpertsService
-from services.discussion_service import DiscussionService
-from services.fact_checking_service import FactCheckingService
-from services.cognitive_service import CognitiveService
 
-logger = logging.getLogger(__name__)
+# Die Service-Module (Embedding-Modelle, LLM-Clients) werden erst beim ersten Aufbau
+# des jeweiligen Services importiert, damit Endpunkte ohne diese Services schneller starten
+if TYPE_CHECKING:
+    from db.vector_db import VectorDB
+    from services.auth_service import AuthService
+    from services.llm_service import LLMService
+    from services.experts_service import ExpertsService
+    from services.discussion_service import DiscussionService
+    from services.fact_checking_service import FactCheckingService
+    from services.cognitive_service import CognitiveService
 
-# Singletons für Services
-_vector_db = None
-_auth_service = None
-_llm_service = None
-_experts_service = None
-_discussion_service = None
-_fact_checking_service = None
-_cognitive_service = None
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = "your_secret_key"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Schlüssel, Decoder und Algorithmenliste werden einmal erzeugt statt bei jeder Anfrage
+_SECRET_BYTES = SECRET_KEY.encode("utf-8")
+_JWT = jwt.PyJWT()
+_JWT_ALGORITHMS = ["HS256"]
+
+# Bereits geprüfte Tokens; die HS256-Prüfung ist deterministisch, daher kann das
+# Ergebnis bis zum Ablauf des Tokens (höchstens _TOKEN_CACHE_TTL Sekunden) wiederverwendet werden
+_TOKEN_CACHE_SIZE = 1024
+_TOKEN_CACHE_TTL = 300
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
 def verify_token(token: str = Depends(oauth2_scheme)):
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                _token_cache.move_to_end(token)
+                return payload
+            del _token_cache[token]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return payload
+        payload = _JWT.decode(token, _SECRET_BYTES, algorithms=_JWT_ALGORITHMS)
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Ungültiger Token")
 
-def get_vector_db(settings: Annotated[Settings, Depends(get_settings)]) -> VectorDB:
+    expires_at = now + _TOKEN_CACHE_TTL
+    if isinstance(payload.get("exp"), (int, float)):
+        expires_at = min(expires_at, payload["exp"])
+    with _token_cache_lock:
+        _token_cache[token] = (expires_at, payload)
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+def _singleton_builder(builder):
+    """
+    Cacht die zuletzt gebaute Instanz eines Builders (wie lru_cache(maxsize=1)) und
+    stellt sicher, dass sie auch bei parallelen Anfragen nur einmal erzeugt wird.
+    Der Treffer kommt ohne Sperre aus; nur der Aufbau läuft unter einer Sperre pro
+    Builder mit erneuter Prüfung. cache_clear() verwirft die Instanz.
+    """
+    lock = threading.Lock()
+    slot = None  # (args, instance)
+
+    @wraps(builder)
+    def wrapper(*args):
+        nonlocal slot
+        current = slot
+        if current is not None and current[0] == args:
+            return current[1]
+        with lock:
+            if slot is None or slot[0] != args:
+                slot = (args, builder(*args))
+            return slot[1]
+
+    def cache_clear():
+        nonlocal slot
+        with lock:
+            slot = None
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+# Die Services werden in gecachten Buildern erzeugt. Sie erhalten nur die Werte, von
+# denen die Instanz abhängt (Einstellungen bzw. die bereits gecachten Services), sodass
+# jede weitere Auflösung durch FastAPI nur noch ein Cache-Treffer ist.
+
+@_singleton_builder
+def _build_vector_db(persist_directory: str, embedding_model_name: str) -> "VectorDB":
+    from db.vector_db import VectorDB
+    logger.info("Initialisiere Vector-Datenbank")
+    return VectorDB(
+        persist_directory=persist_directory,
+        embedding_model_name=embedding_model_name
+    )
+
+
+@_singleton_builder
+def _build_auth_service(secret_key: str, token_expire_minutes: int) -> "AuthService":
+    from services.auth_service import AuthService
+    logger.info("Initialisiere Auth-Service")
+    return AuthService(
+        secret_key=secret_key,
+        token_expire_minutes=token_expire_minutes
+    )
+
+
+@_singleton_builder
+def _build_llm_service(mistral_api_key: str, model_name: str) -> "LLMService":
+    from services.llm_service import LLMService
+    logger.info("Initialisiere LLM-Service")
+    return LLMService(
+        mistral_api_key=mistral_api_key,
+        model_name=model_name
+    )
+
+
+@_singleton_builder
+def _build_experts_service(llm_service: "LLMService", vector_db: "VectorDB") -> "ExpertsService":
+    from services.experts_service import ExpertsService
+    logger.info("Initialisiere Experts-Service")
+    return ExpertsService(
+        llm_service=llm_service,
+        vector_db=vector_db
+    )
+
+
+@_singleton_builder
+def _build_discussion_service(
+    llm_service: "LLMService",
+    vector_db: "VectorDB",
+    experts_service: "ExpertsService"
+) -> "DiscussionService":
+    from services.discussion_service import DiscussionService
+    logger.info("Initialisiere Discussion-Service")
+    return DiscussionService(
+        llm_service=llm_service,
+        vector_db=vector_db,
+        experts_service=experts_service
+    )
+
+
+@_singleton_builder
+def _build_fact_checking_service(llm_service: "LLMService") -> "FactCheckingService":
+    from services.fact_checking_service import FactCheckingService
+    logger.info("Initialisiere FactCheckingService")
+    # Hier Perplexity API integrieren, wenn vorhanden
+    try:
+        from utils.perplexity_api import get_perplexity_api
+        perplexity_api = get_perplexity_api()
+        if perplexity_api:
+            logger.info("Perplexity API erfolgreich initialisiert")
+        else:
+            logger.warning("Perplexity API nicht verfügbar, verwende LLM-Fallback für Faktenchecks")
+    except Exception as e:
+        logger.warning(f"Fehler bei der Initialisierung der Perplexity API: {str(e)}")
+        perplexity_api = None
+        
+    return FactCheckingService(llm_service, perplexity_api)
+
+
+@_singleton_builder
+def _build_cognitive_service(llm_service: "LLMService", experts_service: "ExpertsService") -> "CognitiveService":
+    from services.cognitive_service import CognitiveService
+    logger.info("Initialisiere CognitiveService")
+    return CognitiveService(llm_service, experts_service)
+
+
+def get_vector_db(settings: Annotated[Settings, Depends(get_settings)]) -> "VectorDB":
     """
     Gibt eine Instanz der VectorDB zurück, die für Vektorsuche und Wissensspeicherung verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -51,17 +197,10 @@ def get_vector_db(settings: Annotated[Settings, Depends(get_settings)]) -> Vecto
     Returns:
         VectorDB-Instanz
     """
-    global _vector_db
-    if _vector_db is None:
-        logger.info("Initialisiere Vector-Datenbank")
-        _vector_db = VectorDB(
-            persist_directory=settings.vector_db_path,
-            embedding_model_name=settings.embedding_model
-        )
-    return _vector_db
+    return _build_vector_db(settings.vector_db_path, settings.embedding_model)
 
 
-def get_auth_service(settings: Annotated[Settings, Depends(get_settings)]) -> AuthService:
+def get_auth_service(settings: Annotated[Settings, Depends(get_settings)]) -> "AuthService":
     """
     Gibt eine Instanz des AuthService zurück, der für Authentifizierung und Autorisierung verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -72,17 +211,10 @@ def get_auth_service(settings: Annotated[Settings, Depends(get_settings)]) -> Au
     Returns:
         AuthService-Instanz
     """
-    global _auth_service
-    if _auth_service is None:
-        logger.info("Initialisiere Auth-Service")
-        _auth_service = AuthService(
-            secret_key=settings.secret_key,
-            token_expire_minutes=settings.token_expire_minutes
-        )
-    return _auth_service
+    return _build_auth_service(settings.secret_key, settings.token_expire_minutes)
 
 
-def get_llm_service(settings: Annotated[Settings, Depends(get_settings)]) -> LLMService:
+def get_llm_service(settings: Annotated[Settings, Depends(get_settings)]) -> "LLMService":
     """
     Gibt eine Instanz des LLMService zurück, der für Interaktionen mit dem Sprachmodell verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -93,20 +225,13 @@ def get_llm_service(settings: Annotated[Settings, Depends(get_settings)]) -> LLM
     Returns:
         LLMService-Instanz
     """
-    global _llm_service
-    if _llm_service is None:
-        logger.info("Initialisiere LLM-Service")
-        _llm_service = LLMService(
-            mistral_api_key=settings.mistral_api_key,
-            model_name=settings.llm_model
-        )
-    return _llm_service
+    return _build_llm_service(settings.mistral_api_key, settings.llm_model)
 
 
 def get_experts_service(
-    llm_service: Annotated[LLMService, Depends(get_llm_service)],
-    vector_db: Annotated[VectorDB, Depends(get_vector_db)]
-) -> ExpertsService:
+    llm_service: Annotated["LLMService", Depends(get_llm_service)],
+    vector_db: Annotated["VectorDB", Depends(get_vector_db)]
+) -> "ExpertsService":
     """
     Gibt eine Instanz des ExpertsService zurück, der für die Verwaltung virtueller Experten verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -118,21 +243,14 @@ def get_experts_service(
     Returns:
         ExpertsService-Instanz
     """
-    global _experts_service
-    if _experts_service is None:
-        logger.info("Initialisiere Experts-Service")
-        _experts_service = ExpertsService(
-            llm_service=llm_service,
-            vector_db=vector_db
-        )
-    return _experts_service
+    return _build_experts_service(llm_service, vector_db)
 
 
 def get_discussion_service(
-    llm_service: Annotated[LLMService, Depends(get_llm_service)],
-    vector_db: Annotated[VectorDB, Depends(get_vector_db)],
-    experts_service: Annotated[ExpertsService, Depends(get_experts_service)]
-) -> DiscussionService:
+    llm_service: Annotated["LLMService", Depends(get_llm_service)],
+    vector_db: Annotated["VectorDB", Depends(get_vector_db)],
+    experts_service: Annotated["ExpertsService", Depends(get_experts_service)]
+) -> "DiscussionService":
     """
     Gibt eine Instanz des DiscussionService zurück, der für die Verwaltung von Diskussionen verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -145,19 +263,12 @@ def get_discussion_service(
     Returns:
         DiscussionService-Instanz
     """
-    global _discussion_service
-    if _discussion_service is None:
-        logger.info("Initialisiere Discussion-Service")
-        _discussion_service = DiscussionService(
-            llm_service=llm_service,
-            vector_db=vector_db,
-            experts_service=experts_service
-        )
-    return _discussion_service
+    return _build_discussion_service(llm_service, vector_db, experts_service)
+
 
 def get_fact_checking_service(
-    llm_service: Annotated[LLMService, Depends(get_llm_service)]
-) -> FactCheckingService:
+    llm_service: Annotated["LLMService", Depends(get_llm_service)]
+) -> "FactCheckingService":
     """
     Gibt eine Instanz des FactCheckingService zurück, der für Faktenchecks verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -168,30 +279,13 @@ def get_fact_checking_service(
     Returns:
         FactCheckingService-Instanz
     """
-    global _fact_checking_service
-    
-    if _fact_checking_service is None:
-        logger.info("Initialisiere FactCheckingService")
-        # Hier Perplexity API integrieren, wenn vorhanden
-        try:
-            from utils.perplexity_api import get_perplexity_api
-            perplexity_api = get_perplexity_api()
-            if perplexity_api:
-                logger.info("Perplexity API erfolgreich initialisiert")
-            else:
-                logger.warning("Perplexity API nicht verfügbar, verwende LLM-Fallback für Faktenchecks")
-        except Exception as e:
-            logger.warning(f"Fehler bei der Initialisierung der Perplexity API: {str(e)}")
-            perplexity_api = None
-            
-        _fact_checking_service = FactCheckingService(llm_service, perplexity_api)
-        
-    return _fact_checking_service
+    return _build_fact_checking_service(llm_service)
+
 
 def get_cognitive_service(
-    llm_service: Annotated[LLMService, Depends(get_llm_service)],
-    experts_service: Annotated[ExpertsService, Depends(get_experts_service)]
-) -> CognitiveService:
+    llm_service: Annotated["LLMService", Depends(get_llm_service)],
+    experts_service: Annotated["ExpertsService", Depends(get_experts_service)]
+) -> "CognitiveService":
     """
     Gibt eine Instanz des CognitiveService zurück, der für kognitive Analysen verwendet wird.
     Stellt sicher, dass nur eine Instanz erstellt wird (Singleton).
@@ -203,10 +297,4 @@ def get_cognitive_service(
     Returns:
         CognitiveService-Instanz
     """
-    global _cognitive_service
-    
-    if _cognitive_service is None:
-        logger.info("Initialisiere CognitiveService")
-        _cognitive_service = CognitiveService(llm_service, experts_service)
-        
-    return _cognitive_service 
\ No newline at end of file
+    return _build_cognitive_service(llm_service, experts_service)
@@ -7,6 +7,7 @@ import socket
 import json
 import subprocess
 import signal
+import threading
 import time
 from pathlib import Path
 
@@ -14,19 +15,31 @@ from pathlib import Path
 CONFIG_PATH = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) / "shared_config.json"
 
 def find_free_port(start_port=8000, max_attempts=10):
-    """Findet einen freien Port, beginnend bei start_port."""
-    print(f"Suche freien Port, beginnend bei {start_port}...")
-    
-    for i in range(max_attempts):
-        port = start_port + i
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.bind(('localhost', port))
-            sock.close()
-            print(f"Freier Port gefunden: {port}")
+    """
+    Findet einen freien Port, beginnend bei start_port. Der Standardbereich ab 8000
+    entspricht den Ports, die das Frontend ohne shared_config.json abfragt
+    (insight_synergy_app/lib/utils/dynamic_config.dart). Mit start_port=0 wählt das
+    Betriebssystem mit einem einzigen bind() einen freien Port.
+    """
+    # Ein Socket für alle Versuche (ein fehlgeschlagenes bind() lässt ihn ungebunden).
+    # Bewusst ohne SO_REUSEADDR: unter macOS/BSD und Windows ließe sich damit auch
+    # ein belegter Port binden, der dann fälschlich als frei gälte
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        if start_port == 0:
+            sock.bind(('localhost', 0))
+            port = sock.getsockname()[1]
+            print(f"Freier Port vom Betriebssystem zugewiesen: {port}")
             return port
-        except OSError:
-            print(f"Port {port} ist bereits belegt, versuche nächsten Port...")
+        
+        print(f"Suche freien Port, beginnend bei {start_port}...")
+        for i in range(max_attempts):
+            port = start_port + i
+            try:
+                sock.bind(('localhost', port))
+                print(f"Freier Port gefunden: {port}")
+                return port
+            except OSError:
+                print(f"Port {port} ist bereits belegt, versuche nächsten Port...")
     
     raise RuntimeError(f"Konnte keinen freien Port im Bereich {start_port}-{start_port+max_attempts-1} finden")
 
@@ -41,8 +54,19 @@ def save_config(port):
     }
     
     print(f"Speichere Konfiguration in {CONFIG_PATH}")
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(config, f, indent=2)
+    # In einem Schreibvorgang in eine temporäre Datei schreiben und diese dann atomar
+    # ersetzen, sodass Leser nie eine halb geschriebene Konfiguration sehen
+    data = json.dumps(config, indent=2).encode('utf-8')
+    tmp_path = CONFIG_PATH.with_name(f"{CONFIG_PATH.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_PATH)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     return config
 
@@ -62,13 +86,13 @@ def run_backend(port):
     # Setze Ausführungsrechte für das Skript
     os.chmod(script_path, 0o755)
     
-    # Starte das Backend als Subprocess
+    # Starte das Backend als Subprocess; die Pipes bleiben binär, da forward_output
+    # die Ausgabe blockweise als Bytes weiterreicht, ohne sie zu dekodieren
     backend_process = subprocess.Popen(
         [sys.executable, script_path],
         env=env,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        stderr=subprocess.PIPE
     )
     
     # Warte kurz, um zu sehen, ob der Prozess sofort beendet wird
@@ -76,13 +100,40 @@ def run_backend(port):
     if backend_process.poll() is not None:
         stdout, stderr = backend_process.communicate()
         print(f"Backend konnte nicht gestartet werden:")
-        print(f"STDOUT: {stdout}")
-        print(f"STDERR: {stderr}")
+        print(f"STDOUT: {stdout.decode(errors='replace')}")
+        print(f"STDERR: {stderr.decode(errors='replace')}")
         return None
     
     print(f"Backend erfolgreich gestartet (PID: {backend_process.pid})")
     return backend_process
 
+def forward_output(stream, prefix="BACKEND: ", chunk_size=64 * 1024, target=None):
+    """
+    Leitet die Ausgabe des Backends blockweise weiter: Es wird gelesen, was bis zu
+    chunk_size Bytes verfügbar ist, und alle darin enthaltenen Zeilen werden mit
+    Präfix in einem Aufruf geschrieben statt mit einem print() pro Zeile.
+    Ziel ist target (Standard: sys.stdout).
+    """
+    fd = stream.fileno()
+    prefix = prefix.encode()
+    out = (target or sys.stdout).buffer
+    pending = b""
+    
+    while True:
+        chunk = os.read(fd, chunk_size)
+        if not chunk:
+            break
+        
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()  # Unvollständige letzte Zeile für den nächsten Block aufheben
+        if lines:
+            out.write(b"".join(prefix + line.strip() + b"\n" for line in lines))
+            out.flush()
+    
+    if pending.strip():
+        out.write(prefix + pending.strip() + b"\n")
+        out.flush()
+
 def main():
     print("=== Dynamischer Backend-Starter ===")
     
@@ -109,13 +160,23 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    # stderr parallel leeren: Sonst blockiert das Backend, sobald der Pipe-Puffer
+    # von stderr voll ist, da der Hauptthread nur stdout liest
+    stderr_thread = threading.Thread(
+        target=forward_output,
+        args=(backend_process.stderr,),
+        kwargs={"target": sys.stderr},
+        daemon=True
+    )
+    stderr_thread.start()
+    
     print(f"Backend läuft auf Port {port}.")
     print("Drücke Ctrl+C zum Beenden.")
     
     try:
         # Leite Backend-Output weiter
-        for line in backend_process.stdout:
-            print(f"BACKEND: {line.strip()}")
+        sys.stdout.flush()
+        forward_output(backend_process.stdout)
     except KeyboardInterrupt:
         print("\nBeende Backend...")
         backend_process.terminate()
@@ -9,4 +9,5 @@ if __name__ == "__main__":
     # Server starten mit Host und Port aus Umgebungsvariablen oder Standardwerten
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run("app.main:app", host=host, port=port, reload=True) 
\ No newline at end of file
+    # loop="auto" verwendet uvloop, sofern installiert (uvicorn[standard])
+    uvicorn.run("app.main:app", host=host, port=port, reload=True, loop="auto") 
\ No newline at end of file
@@ -13,6 +13,9 @@ from typing import Dict, List, Optional, Any, Union
 import logging
 from dotenv import load_dotenv
 
+from ..utils import json_utils
+from ..utils.http_utils import HTTP2_AVAILABLE
+
 # Lokale .env-Datei laden
 load_dotenv()
 
@@ -43,6 +46,55 @@ class OpenAIService:
             logger.warning("OPENAI_API_KEY nicht gefunden. OpenAI-Dienste sind nicht verfügbar.")
         else:
             logger.info(f"OpenAI Service initialisiert mit Primärmodell: {self.primary_model}")
+        
+        # Gemeinsamer HTTP-Client (Connection-Pool), wird beim ersten Aufruf erstellt
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Header sind für alle Anfragen gleich und werden nur einmal gebaut
+        self._request_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Liefert den gemeinsamen HTTP-Client und erstellt ihn bei Bedarf neu."""
+        if self._client is None or self._client.is_closed:
+            # Mit HTTP/2 teilen sich gleichzeitige Anfragen eine Verbindung pro Host
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                http2=HTTP2_AVAILABLE
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Schließt den gemeinsamen HTTP-Client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    def _headers(self) -> Dict[str, str]:
+        """Liefert die Header für Anfragen an die OpenAI API."""
+        return self._request_headers
+    
+    async def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sendet eine JSON-Anfrage über den gemeinsamen HTTP-Client.
+        
+        Args:
+            endpoint: Pfad relativ zur Basis-URL (z.B. "chat/completions")
+            payload: Der JSON-Body der Anfrage
+            
+        Returns:
+            Die dekodierte JSON-Antwort
+        """
+        response = await self._get_client().post(
+            f"{self.base_url}/{endpoint}",
+            headers=self._headers(),
+            content=json_utils.dumps_bytes(payload)
+        )
+        response.raise_for_status()
+        return json_utils.loads(response.content)
     
     async def get_completion(
         self, 
@@ -76,12 +128,6 @@ class OpenAIService:
         temperature = temperature if temperature is not None else float(os.getenv("OPENAI_TEMPERATURE", "0.2"))
         max_tokens = max_tokens or int(os.getenv("OPENAI_MAX_TOKENS", "4000"))
         
-        # API-Anfrage vorbereiten
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         # Nachrichten-Array erstellen
         messages = []
         
@@ -110,26 +156,19 @@ class OpenAIService:
         
         while attempts < self.max_retries:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if stream:
-                        response = await client.post(
-                            f"{self.base_url}/chat/completions",
-                            headers=headers,
-                            json=payload,
-                            stream=True
-                        )
-                        response.raise_for_status()
-                        return response.aiter_lines()
-                    else:
-                        response = await client.post(
-                            f"{self.base_url}/chat/completions",
-                            headers=headers,
-                            json=payload
-                        )
-                        response.raise_for_status()
-                        result = response.json()
-                        return result["choices"][0]["message"]["content"]
-            
+                if stream:
+                    response = await self._get_client().post(
+                        f"{self.base_url}/chat/completions",
+                        headers=self._headers(),
+                        json=payload,
+                        stream=True
+                    )
+                    response.raise_for_status()
+                    return response.aiter_lines()
+                else:
+                    result = await self._post("chat/completions", payload)
+                    return result["choices"][0]["message"]["content"]
+        
             except Exception as e:
                 attempts += 1
                 last_error = e
@@ -166,12 +205,6 @@ class OpenAIService:
         if not texts:
             return []
         
-        # API-Anfrage vorbereiten
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model,
             "input": texts
@@ -183,19 +216,12 @@ class OpenAIService:
         
         while attempts < self.max_retries:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        f"{self.base_url}/embeddings",
-                        headers=headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    
-                    # Einbettungen extrahieren
-                    embeddings = [item["embedding"] for item in result["data"]]
-                    return embeddings
-            
+                result = await self._post("embeddings", payload)
+                
+                # Einbettungen extrahieren
+                embeddings = [item["embedding"] for item in result["data"]]
+                return embeddings
+        
             except Exception as e:
                 attempts += 1
                 last_error = e
@@ -269,34 +295,21 @@ class OpenAIService:
         if not self.api_key:
             raise ValueError("OpenAI API Key nicht konfiguriert.")
         
-        # API-Anfrage vorbereiten
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "input": text
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/moderations",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Moderationsergebnis extrahieren
-                moderation_result = result["results"][0]
-                return {
-                    "flagged": moderation_result["flagged"],
-                    "categories": moderation_result["categories"],
-                    "category_scores": moderation_result["category_scores"]
-                }
-                
+            result = await self._post("moderations", payload)
+            
+            # Moderationsergebnis extrahieren
+            moderation_result = result["results"][0]
+            return {
+                "flagged": moderation_result["flagged"],
+                "categories": moderation_result["categories"],
+                "category_scores": moderation_result["category_scores"]
+            }
+            
         except Exception as e:
             logger.error(f"Fehler bei der Inhaltsmoderation: {str(e)}")
             # Standardwerte zurückgeben
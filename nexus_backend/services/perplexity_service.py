@@ -13,6 +13,9 @@ from typing import Dict, List, Optional, Any, Union
 import logging
 from dotenv import load_dotenv
 
+from ..utils import json_utils
+from ..utils.http_utils import HTTP2_AVAILABLE
+
 # Lokale .env-Datei laden
 load_dotenv()
 
@@ -40,6 +43,26 @@ class PerplexityService:
             logger.warning("PERPLEXITY_API_KEY nicht gefunden. Perplexity-Dienste sind nicht verfügbar.")
         else:
             logger.info(f"Perplexity Service initialisiert mit Modell: {self.model}")
+        
+        # Gemeinsamer HTTP-Client (Connection-Pool), wird beim ersten Aufruf erstellt
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Liefert den gemeinsamen HTTP-Client und erstellt ihn bei Bedarf neu."""
+        if self._client is None or self._client.is_closed:
+            # Mit HTTP/2 teilen sich gleichzeitige Anfragen eine Verbindung pro Host
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                http2=HTTP2_AVAILABLE
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Schließt den gemeinsamen HTTP-Client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
     
     async def get_completion(
         self, 
@@ -93,18 +116,18 @@ class PerplexityService:
         
         while attempts < self.max_retries:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        f"{self.base_url}/chat/completions",
-                        headers=headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    
-                    # Antwort extrahieren
-                    return result["choices"][0]["message"]["content"]
-            
+                client = self._get_client()
+                response = await client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    content=json_utils.dumps_bytes(payload)
+                )
+                response.raise_for_status()
+                result = json_utils.loads(response.content)
+                
+                # Antwort extrahieren
+                return result["choices"][0]["message"]["content"]
+        
             except Exception as e:
                 attempts += 1
                 last_error = e
@@ -0,0 +1,561 @@
+"""
+Tests für den APIClient des Nexus-Backends.
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from ..app.services.api_client import (
+    APIClient,
+    RateLimiter,
+    ResponseCache,
+    SharedRateLimiter,
+    get_rate_limiter,
+    _ENCODINGS,
+    _load_encodings,
+    _parse_retry_after,
+    _sleep_before_retry,
+    _split_context,
+    api_config,
+)
+from ..utils.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def api_client():
+    """Erstellt eine Instanz des APIClient für Tests."""
+    return APIClient()
+
+
+class TestAPIClientSession:
+    """Tests für die gemeinsame HTTP-Session des APIClient."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self, api_client):
+        """Mehrere Aufrufe sollten dieselbe Session (und denselben Pool) verwenden."""
+        session1 = await api_client._get_session()
+        session2 = await api_client._get_session()
+
+        assert session1 is session2
+        assert not session1.closed
+
+        await api_client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_and_recreate(self, api_client):
+        """Nach close() sollte beim nächsten Aufruf eine neue Session erstellt werden."""
+        session1 = await api_client._get_session()
+        await api_client.close()
+
+        assert session1.closed
+        assert api_client._session is None
+
+        session2 = await api_client._get_session()
+        assert session2 is not session1
+
+        await api_client.close()
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager(self):
+        """Der Client sollte als async Context-Manager nutzbar sein."""
+        async with APIClient() as client:
+            session = await client._get_session()
+            assert not session.closed
+
+        assert session.closed
+
+
+class TestRateLimiter:
+    """Tests für den Token-Bucket-RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity(self):
+        """Anfragen bis zur Kapazität sollten ohne Wartezeit durchgehen."""
+        limiter = RateLimiter(max_requests=10, time_window=60)
+        start = time.monotonic()
+
+        for _ in range(10):
+            await limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
+        assert limiter.tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_waits_when_bucket_empty(self):
+        """Bei leerem Bucket sollte auf das nächste Token gewartet werden."""
+        limiter = RateLimiter(max_requests=2, time_window=1)
+        start = time.monotonic()
+
+        for _ in range(3):
+            await limiter.acquire()
+
+        # Das dritte Token wird nach ca. 1/rate = 0.5s nachgefüllt
+        assert time.monotonic() - start >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_are_spaced(self):
+        """Gleichzeitig wartende Aufrufer sollten nacheinander im Abstand 1/rate durchgelassen werden."""
+        limiter = RateLimiter(max_requests=1, time_window=0.1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        passed = []
+
+        async def call():
+            await limiter.acquire()
+            passed.append(loop.time() - start)
+
+        await asyncio.gather(*(call() for _ in range(4)))
+
+        # Ein Token sofort, danach je eines pro 0.1s statt alle gemeinsam nach 0.1s
+        assert passed[-1] >= 0.29
+        assert [b - a >= 0.09 for a, b in zip(passed[1:], passed[2:])] == [True, True]
+
+    def test_limiter_is_shared_per_upstream(self):
+        """Alle Clients eines Prozesses sollten denselben Limiter pro Dienst verwenden."""
+        assert APIClient().openai_limiter is APIClient().openai_limiter
+        assert get_rate_limiter("openai", 100) is not get_rate_limiter("perplexity", 100)
+
+
+class TestSharedRateLimiter:
+    """Tests für den prozessübergreifenden Token-Bucket."""
+
+    @pytest.fixture
+    def limiter_name(self, tmp_path, monkeypatch):
+        """Legt die Zustandsdateien in ein temporäres Verzeichnis."""
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        return "test"
+
+    @pytest.mark.asyncio
+    async def test_instances_share_bucket(self, limiter_name):
+        """Zwei Instanzen (wie zwei Worker) sollten sich die Tokens teilen."""
+        first = SharedRateLimiter(limiter_name, max_requests=2, time_window=60)
+        second = SharedRateLimiter(limiter_name, max_requests=2, time_window=60)
+
+        await first.acquire()
+        await second.acquire()
+
+        # Der Bucket ist leer, auch für die erste Instanz
+        assert first._take() > 0
+
+    @pytest.mark.asyncio
+    async def test_waits_when_bucket_empty(self, limiter_name):
+        """Bei leerem Bucket sollte auf das nächste Token gewartet werden."""
+        limiter = SharedRateLimiter(limiter_name, max_requests=2, time_window=1)
+        start = time.monotonic()
+
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert time.monotonic() - start >= 0.4
+
+    def test_clock_going_back_does_not_drain_bucket(self, limiter_name):
+        """Ein Zeitstempel aus der Zukunft (z.B. nach Uhrumstellung) sollte keine Wartezeit erzeugen."""
+        limiter = SharedRateLimiter(limiter_name, max_requests=2, time_window=60)
+        limiter._STATE.pack_into(limiter._state, 0, 2.0, time.time() + 3600)
+
+        assert limiter._take() == 0
+        limiter.close()
+
+    @pytest.mark.asyncio
+    async def test_contended_lock_does_not_block_loop(self, limiter_name):
+        """Hält ein anderer Worker die Sperre, sollte die Event-Loop weiterlaufen."""
+        limiter = SharedRateLimiter(limiter_name, max_requests=2, time_window=60)
+        other = SharedRateLimiter(limiter_name, max_requests=2, time_window=60)
+
+        with other._locked():
+            acquire = asyncio.create_task(limiter.acquire())
+            # Die Loop läuft weiter, während acquire() auf die Sperre wartet
+            await asyncio.sleep(0.05)
+            assert not acquire.done()
+        await asyncio.wait_for(acquire, 1)
+
+        limiter.close()
+        other.close()
+
+
+class TestResponseCache:
+    """Tests für den Antwort-Cache des APIClient."""
+
+    def test_lru_eviction(self):
+        """Der älteste Eintrag sollte bei voller Kapazität verdrängt werden."""
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_ttl_expiry(self):
+        """Abgelaufene Einträge sollten nicht mehr geliefert werden."""
+        cache = ResponseCache(maxsize=10, ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_make_key_is_stable(self):
+        """Gleiche Parameter sollten unabhängig von der Reihenfolge denselben Schlüssel ergeben."""
+        key1 = ResponseCache.make_key({"model": "m", "query": "q"})
+        key2 = ResponseCache.make_key({"query": "q", "model": "m"})
+        key3 = ResponseCache.make_key({"query": "andere", "model": "m"})
+
+        assert key1 == key2
+        assert key1 != key3
+
+    @pytest.mark.asyncio
+    async def test_fetch_facts_uses_cache(self, api_client):
+        """Eine wiederholte Anfrage sollte die API nur einmal aufrufen."""
+        api_client._fetch_facts = AsyncMock(return_value="## RECHERCHEERGEBNISSE:\n\nFakten")
+
+        first = await api_client.fetch_facts("Testanfrage")
+        second = await api_client.fetch_facts("Testanfrage")
+
+        assert first == second
+        api_client._fetch_facts.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_response_not_cached(self, api_client):
+        """Fehlgeschlagene Anfragen (None) sollten nicht gecacht werden."""
+        api_client._fetch_facts = AsyncMock(return_value=None)
+
+        await api_client.fetch_facts("Testanfrage")
+        await api_client.fetch_facts("Testanfrage")
+
+        assert api_client._fetch_facts.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, api_client):
+        """Gleichzeitige identische Anfragen sollten sich einen API-Aufruf teilen."""
+        calls = 0
+
+        async def slow_fetch(query):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "Fakten"
+
+        api_client._fetch_facts = slow_fetch
+        results = await asyncio.gather(*(api_client.fetch_facts("Testanfrage") for _ in range(5)))
+
+        assert results == ["Fakten"] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_request_cancelled_with_last_waiter(self, api_client):
+        """Die gemeinsame Anfrage sollte erst abbrechen, wenn kein Aufrufer mehr wartet."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_fetch(query):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        api_client._fetch_facts = slow_fetch
+        first = asyncio.ensure_future(api_client.fetch_facts("Testanfrage"))
+        second = asyncio.ensure_future(api_client.fetch_facts("Testanfrage"))
+        await started.wait()
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+
+        second.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert api_client._inflight == {}
+        assert api_client._inflight_waiters == {}
+
+
+VOCABULARY = ("klima", "wandel", "folgen", "energie", "preise")
+
+
+def bag_of_words(text):
+    """Einfaches Embedding für Tests: Wortanzahlen über ein festes Vokabular."""
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(word)) for word in VOCABULARY]
+
+
+class TestSemanticCache:
+    """Tests für den semantischen Cache."""
+
+    def test_similar_text_hits(self):
+        """Ähnliche Texte sollten denselben Eintrag liefern, unähnliche nicht."""
+        cache = SemanticCache(bag_of_words, maxsize=4, ttl=60, threshold=0.95)
+        cache.set("ns", cache.embedding("Klima Wandel Folgen"), "antwort")
+
+        assert cache.get("ns", cache.embedding("Folgen Klima Wandel?")) == "antwort"
+        assert cache.get("ns", cache.embedding("Energie Preise")) is None
+        assert cache.get("anderer", cache.embedding("Klima Wandel Folgen")) is None
+
+    def test_best_match_wins(self):
+        """Bei mehreren Treffern sollte der ähnlichste Eintrag geliefert werden."""
+        cache = SemanticCache(bag_of_words, maxsize=4, ttl=60, threshold=0.5)
+        cache.set("ns", cache.embedding("Klima Wandel"), "ungefähr")
+        cache.set("ns", cache.embedding("Klima Wandel Folgen"), "genau")
+
+        assert cache.get("ns", cache.embedding("Klima Wandel Folgen")) == "genau"
+
+    def test_ring_eviction_and_ttl(self):
+        """Der älteste Eintrag sollte überschrieben werden; abgelaufene gelten nicht."""
+        cache = SemanticCache(bag_of_words, maxsize=2, ttl=60)
+        for text in ("Klima", "Energie", "Preise"):
+            cache.set("ns", cache.embedding(text), text)
+
+        assert len(cache) == 2
+        assert cache.get("ns", cache.embedding("Klima")) is None
+        assert cache.get("ns", cache.embedding("Preise")) == "Preise"
+
+        expired = SemanticCache(bag_of_words, maxsize=2, ttl=0)
+        expired.set("ns", expired.embedding("Klima"), "alt")
+        assert expired.get("ns", expired.embedding("Klima")) is None
+
+
+class TestRetryBackoff:
+    """Tests für das Backoff zwischen Wiederholungsversuchen."""
+
+    def test_parse_retry_after(self):
+        """Retry-After in Sekunden wird gelesen, andere Formate ignoriert."""
+        assert _parse_retry_after("2") == 2.0
+        assert _parse_retry_after("0.5") == 0.5
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honored(self):
+        """Ein Retry-After-Wert sollte statt des Backoffs verwendet werden."""
+        deadline = asyncio.get_running_loop().time() + 10
+        start = time.monotonic()
+
+        assert await _sleep_before_retry(5, 0.05, deadline) is True
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_retries(self):
+        """Würde die Wartezeit die Deadline überschreiten, wird nicht gewartet."""
+        deadline = asyncio.get_running_loop().time() + 0.1
+        start = time.monotonic()
+
+        assert await _sleep_before_retry(10, None, deadline) is False
+        assert time.monotonic() - start < 0.05
+
+
+class _FakeStreamResponse:
+    """Minimale aiohttp-Antwort mit zeilenweisem SSE-Body."""
+
+    def __init__(self, lines, status=200):
+        self.status = status
+        self.content = self._iter(lines)
+
+    async def text(self):
+        return "Fehler"
+
+    @staticmethod
+    async def _iter(lines):
+        for line in lines:
+            yield line
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestStreaming:
+    """Tests für das Streaming von OpenAI-Antworten."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self, api_client):
+        """SSE-Frames sollten als einzelne Text-Fragmente geliefert werden."""
+        lines = [
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}\n',
+            b"\n",
+            b'data: {"choices": [{"delta": {"content": "Hallo"}}]}\n',
+            b": keep-alive\n",
+            b'data: {"choices": [{"delta": {"content": " Welt"}}]}\n',
+            b"data: [DONE]\n",
+            b'data: {"choices": [{"delta": {"content": "ignoriert"}}]}\n',
+        ]
+        session = AsyncMock()
+        session.post = lambda *args, **kwargs: _FakeStreamResponse(lines)
+        api_client._get_session = AsyncMock(return_value=session)
+
+        with patch.object(api_config, "OPENAI_API_KEY", "test-key"):
+            chunks = [chunk async for chunk in api_client.stream_openai_answer("Frage")]
+
+        assert chunks == ["Hallo", " Welt"]
+
+    @pytest.mark.asyncio
+    async def test_stream_has_no_total_timeout(self, api_client):
+        """Nur die Lesepause zwischen Fragmenten sollte begrenzt sein, nicht die Gesamtdauer."""
+        calls = []
+
+        def post(*args, **kwargs):
+            calls.append(kwargs)
+            return _FakeStreamResponse([b"data: [DONE]\n"])
+
+        session = AsyncMock()
+        session.post = post
+        api_client._get_session = AsyncMock(return_value=session)
+
+        with patch.object(api_config, "OPENAI_API_KEY", "test-key"):
+            assert [chunk async for chunk in api_client.stream_openai_answer("Frage")] == []
+
+        timeout = calls[0]["timeout"]
+        assert timeout.total is None
+        assert timeout.sock_read == api_config.OPENAI_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_stream_errors_are_raised(self, api_client):
+        """Ein Fehlerstatus sollte den Stream mit einer Ausnahme statt still beenden."""
+        session = AsyncMock()
+        session.post = lambda *args, **kwargs: _FakeStreamResponse([], status=500)
+        api_client._get_session = AsyncMock(return_value=session)
+
+        with patch.object(api_config, "OPENAI_API_KEY", "test-key"):
+            with pytest.raises(RuntimeError):
+                async for _ in api_client.stream_openai_answer("Frage"):
+                    pass
+
+
+class _FakeEncoding:
+    """Tokenizer-Ersatz: jedes Zeichen ist ein Token."""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class TestSplitContext:
+    """Tests für die Aufteilung langer Kontexte."""
+
+    def test_splits_at_token_windows(self):
+        """Mit Tokenizer sollte exakt in Fenster der maximalen Token-Anzahl geteilt werden."""
+        with patch("nexus_backend.app.services.api_client._get_encoding", return_value=_FakeEncoding()), \
+                patch.object(api_config, "MAX_CONTEXT_TOKENS", 4):
+            assert _split_context("abcdefghij", "gpt-4o-mini") == ["abcd", "efgh", "ij"]
+            assert _split_context("abc", "gpt-4o-mini") == ["abc"]
+
+    def test_falls_back_to_paragraphs(self):
+        """Ohne Tokenizer sollte nach Absätzen anhand der Zeichenlänge geteilt werden."""
+        with patch("nexus_backend.app.services.api_client._get_encoding", return_value=None), \
+                patch.object(api_config, "MAX_CONTEXT_LENGTH", 12):
+            parts = _split_context("aaaa\n\nbbbb\n\ncccc", "gpt-4o-mini")
+
+        assert parts == ["aaaa\n\nbbbb\n\n", "cccc\n\n"]
+
+    def test_failed_tokenizer_download_falls_back(self):
+        """Ein fehlgeschlagener Download der Kodierung darf nicht durchschlagen; geteilt wird nach Zeichen."""
+        with patch("nexus_backend.app.services.api_client.tiktoken.get_encoding",
+                   side_effect=ConnectionError("offline")), \
+                patch.dict(_ENCODINGS, clear=True), \
+                patch.object(api_config, "MAX_CONTEXT_LENGTH", 12):
+            _load_encodings()
+
+            assert _ENCODINGS == {}
+            assert _split_context("aaaa\n\nbbbb\n\ncccc", "unbekanntes-modell") == ["aaaa\n\nbbbb\n\n", "cccc\n\n"]
+
+
+def _tier(name, delay, result, calls):
+    """Erstellt eine Fallback-Stufe, die nach delay Sekunden result liefert."""
+    async def run():
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return result
+    return name, run
+
+
+class TestHedgedFallback:
+    """Tests für die gestaffelt parallele Fallback-Ausführung."""
+
+    @pytest.mark.asyncio
+    async def test_primary_preferred(self, api_client):
+        """Eine schnellere Fallback-Antwort sollte die primäre nicht verdrängen."""
+        calls = []
+        tiers = [
+            _tier("primary", 0.1, {"id": "p"}, calls),
+            _tier("fallback", 0.01, {"id": "f"}, calls),
+        ]
+
+        used, response = await api_client._run_hedged(tiers, hedge_delay=0)
+
+        assert used == "primary"
+        assert response == {"id": "p"}
+        assert calls == ["primary", "fallback"]
+
+    @pytest.mark.asyncio
+    async def test_failure_starts_next_tier(self, api_client):
+        """Schlägt eine Stufe fehl, sollte sofort die nächste gestartet werden."""
+        calls = []
+        tiers = [
+            _tier("primary", 0, None, calls),
+            _tier("fallback", 0, None, calls),
+            _tier("core", 0, {"id": "c"}, calls),
+        ]
+
+        start = time.monotonic()
+        used, response = await api_client._run_hedged(tiers, hedge_delay=10)
+
+        assert used == "core"
+        assert response == {"id": "c"}
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_not_started_when_primary_fast(self, api_client):
+        """Antwortet die primäre Stufe vor der Hedging-Verzögerung, startet kein Fallback."""
+        calls = []
+        tiers = [
+            _tier("primary", 0, {"id": "p"}, calls),
+            _tier("fallback", 0, {"id": "f"}, calls),
+        ]
+
+        used, _ = await api_client._run_hedged(tiers, hedge_delay=10)
+
+        assert used == "primary"
+        assert calls == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_all_tiers_fail(self, api_client):
+        """Schlagen alle Stufen fehl, wird keine Antwort geliefert."""
+        calls = []
+        tiers = [_tier("primary", 0, None, calls), _tier("fallback", 0, None, calls)]
+
+        assert await api_client._run_hedged(tiers, hedge_delay=10) == (None, None)
+
+
+class TestOpenAIPayload:
+    """Tests für die vorab serialisierten OpenAI-Payloads."""
+
+    def test_payload_matches_full_serialization(self, api_client):
+        """Der zusammengesetzte Payload sollte einem vollständig serialisierten entsprechen."""
+        messages = [{"role": "user", "content": 'Frage mit "Anführungszeichen" und Ümlauten'}]
+
+        body = api_client._build_openai_payload("gpt-4o-mini", messages)
+
+        assert json.loads(body) == {
+            "model": "gpt-4o-mini",
+            "temperature": api_config.OPENAI_TEMPERATURE,
+            "max_tokens": api_config.OPENAI_MAX_TOKENS,
+            "messages": [APIClient.OPENAI_SYSTEM_MESSAGE] + messages,
+        }
+
+    def test_prefix_is_reused(self, api_client):
+        """Der statische Teil sollte pro Modell und Modus nur einmal serialisiert werden."""
+        api_client._build_openai_payload("gpt-4o-mini", [])
+        api_client._build_openai_payload("gpt-4o-mini", [{"role": "user", "content": "Q"}])
+        streamed = api_client._build_openai_payload("gpt-4o-mini", [], stream=True)
+
+        assert len(api_client._openai_payload_prefixes) == 2
+        assert json.loads(streamed)["stream"] is True
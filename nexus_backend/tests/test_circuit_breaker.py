@@ -0,0 +1,64 @@
+"""
+Tests für den Circuit Breaker der Anbieteraufrufe.
+"""
+
+import time
+
+from ..utils.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests für die Zustandsübergänge des Circuit Breakers."""
+
+    def test_opens_after_threshold(self):
+        """Nach failure_threshold Fehlern in Folge sollten Aufrufe abgelehnt werden."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failures(self):
+        """Ein Erfolg sollte die Fehlerzählung zurücksetzen."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self, monkeypatch):
+        """Nach der Abkühlzeit sollte genau ein Probeaufruf durchgelassen werden."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        now[0] += 31
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] += 31
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_cancelled_probe_is_released(self, monkeypatch):
+        """Ein abgebrochener Probeaufruf sollte einen neuen Probeaufruf erlauben."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        now[0] += 31
+
+        assert breaker.allow_request()
+        breaker.record_cancelled()
+        assert breaker.allow_request()
@@ -0,0 +1,817 @@
+"""
+Tests für den NexusService des Nexus-Backends.
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from ..app.core.api_config import api_config
+from ..app.services.nexus_service import (
+    NexusRequest,
+    NexusResponse,
+    NexusService,
+    BULK_MAX_ROWS,
+    _compile_template,
+    _fill_template,
+    _load_templates_file,
+    _template_fields,
+)
+from ..utils.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def nexus_service():
+    """Erstellt eine Instanz des NexusService mit den Standard-Templates."""
+    service = NexusService()
+    service.templates = dict(service._get_default_templates())
+    return service
+
+
+class TestGetTemplate:
+    """Tests für das Ausfüllen der Prompt-Templates."""
+
+    def test_fills_sections(self, nexus_service):
+        """Kontext und Ziele sollten als Markdown-Abschnitte eingesetzt werden."""
+        prompt = nexus_service.get_template(
+            "solution_prompt",
+            query="Testproblem",
+            context="Testkontext",
+            goals=["Ziel 1", "Ziel 2"]
+        )
+
+        assert "Testproblem" in prompt
+        assert "## Kontext\nTestkontext" in prompt
+        assert "## Ziele\n- Ziel 1\n- Ziel 2" in prompt
+
+    def test_accepts_values_mapping(self, nexus_service):
+        """Werte können auch als Dictionary übergeben werden."""
+        prompt = nexus_service.get_template("analysis_prompt", {"query": "Testproblem"})
+
+        assert "Testproblem" in prompt
+        assert "## Kontext" not in prompt
+
+    def test_unknown_placeholder_is_empty(self, nexus_service):
+        """Platzhalter ohne Wert sollten leer ersetzt statt KeyError auszulösen."""
+        nexus_service.templates["custom"] = "Frage: {query}{unbekannt}"
+
+        assert nexus_service.get_template("custom", query="Q") == "Frage: Q"
+
+    def test_escaped_braces_and_format_specs(self, nexus_service):
+        """Doppelte Klammern und Formatangaben sollten wie bei str.format behandelt werden."""
+        nexus_service.templates["json"] = '{{"frage": "{query}"}}'
+        nexus_service.templates["spec"] = "{query:>5}|{query!r}"
+
+        assert nexus_service.get_template("json", query="Q") == '{"frage": "Q"}'
+        assert nexus_service.get_template("spec", query="Q") == "    Q|'Q'"
+
+    def test_template_fields(self):
+        """Die verwendeten Platzhalter sollten einmalig aus dem Template gelesen werden."""
+        assert _template_fields("{query} und {context_section}") == frozenset({"query", "context_section"})
+        assert _template_fields("Keine Platzhalter, nur {{Klammern}}") == frozenset()
+
+    def test_repeated_fill_is_cached(self, nexus_service):
+        """Identische Werte sollten den gecachten Prompt liefern; Dicts ohne Cache funktionieren."""
+        nexus_service.templates["custom"] = "{query}|{goals_section}|{extra}"
+        _fill_template.cache_clear()
+
+        first = nexus_service.get_template("custom", query="Q", goals=["A", "B"], extra="x")
+        second = nexus_service.get_template("custom", {"goals": ["A", "B"], "extra": "x"}, query="Q")
+
+        assert first == second == "Q|## Ziele\n- A\n- B\n\n|x"
+        assert _fill_template.cache_info().hits == 1
+        assert nexus_service.get_template("custom", query="Q", extra={"a": 1}) == "Q||{'a': 1}"
+
+    def test_missing_template(self, nexus_service):
+        """Ein unbekanntes Template sollte einen Leerstring liefern."""
+        assert nexus_service.get_template("gibt_es_nicht", query="Q") == ""
+
+
+class TestLoadTemplates:
+    """Tests für das Laden der Template-Datei."""
+
+    def test_templates_file_is_read_once(self):
+        """Mehrere Service-Instanzen sollten dieselbe geladene Template-Datei teilen."""
+        first = NexusService()
+        second = NexusService()
+
+        assert first.templates is second.templates
+        assert _load_templates_file.cache_info().currsize >= 1
+
+    def test_default_templates_are_shared(self, tmp_path):
+        """Ohne Template-Datei sollten alle Instanzen die schreibgeschützten Standard-Templates teilen."""
+        first = NexusService()
+        second = NexusService()
+        first.templates_path = second.templates_path = str(tmp_path / "fehlt.json")
+
+        templates = first._load_templates()
+
+        assert templates is second._load_templates()
+        with pytest.raises(TypeError):
+            templates["solution_prompt"] = ""
+
+    def test_changed_file_is_reloaded(self, tmp_path):
+        """Eine geänderte Template-Datei sollte neu eingelesen werden."""
+        path = tmp_path / "templates.json"
+        path.write_text('{"a": "alt"}', encoding="utf-8")
+        service = NexusService()
+        service.templates_path = str(path)
+
+        assert service._load_templates()["a"] == "alt"
+
+        path.write_text('{"a": "neu"}', encoding="utf-8")
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+
+        assert service._load_templates()["a"] == "neu"
+
+    def test_loaded_templates_are_read_only(self):
+        """Die gemeinsam genutzten Templates dürfen nicht verändert werden können."""
+        service = NexusService()
+
+        with pytest.raises(TypeError):
+            service.templates["solution"] = "geändert"
+
+
+class TestBatching:
+    """Tests für das Micro-Batching eingehender Anfragen."""
+
+    @staticmethod
+    def _response(query):
+        return NexusResponse(solution=query, steps=[], model="test")
+
+    @pytest.mark.asyncio
+    async def test_requests_within_window_share_batch(self):
+        """Gleichzeitige Anfragen sollten in einem Batch gemeinsam gestartet werden."""
+        service = NexusService(max_batch_size=4, batch_window_ms=20)
+        batches = []
+        original_run_batch = service._run_batch
+
+        async def record_batch(batch):
+            batches.append(len(batch))
+            await original_run_batch(batch)
+
+        async def handler(request):
+            return self._response(request.query)
+
+        service._run_batch = record_batch
+        service._generate_solution = handler
+
+        results = await asyncio.gather(
+            *(service.generate_solution(NexusRequest(query=f"Q{i}")) for i in range(6))
+        )
+
+        assert [r.solution for r in results] == [f"Q{i}" for i in range(6)]
+        assert batches == [4, 2]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_analysis_requests_are_packed(self, monkeypatch):
+        """Mit NEXUS_BATCH_PACK sollten Analysen eines Batches einen gemeinsamen Prompt teilen."""
+        monkeypatch.setattr(api_config, "NEXUS_BATCH_PACK", True)
+        service = NexusService(max_batch_size=8, batch_window_ms=20)
+        prompts = []
+
+        async def analyze(request):
+            prompts.append(request.query)
+            rows = request.query.count("## Problem ")
+            return self._response("\n---END---\n".join(f"Analyse {i + 1}" for i in range(rows)))
+
+        async def solve(request):
+            return self._response(request.query)
+
+        service._analyze_with_perplexity = analyze
+        service._generate_solution = solve
+
+        results = await asyncio.gather(
+            service.analyze_problem(NexusRequest(query="A1")),
+            service.generate_solution(NexusRequest(query="S")),
+            service.analyze_problem(NexusRequest(query="A2")),
+        )
+
+        assert [r.solution for r in results] == ["Analyse 1", "S", "Analyse 2"]
+        assert len(prompts) == 1
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_per_request(self):
+        """Ein Fehler in einer Anfrage sollte die übrigen des Batches nicht betreffen."""
+        service = NexusService(max_batch_size=2, batch_window_ms=20)
+
+        async def handler(request):
+            if request.query == "fehler":
+                raise ValueError("kaputt")
+            return self._response(request.query)
+
+        service._analyze_problem = handler
+
+        ok, failed = await asyncio.gather(
+            service.analyze_problem(NexusRequest(query="ok")),
+            service.analyze_problem(NexusRequest(query="fehler")),
+            return_exceptions=True
+        )
+
+        assert ok.solution == "ok"
+        assert isinstance(failed, ValueError)
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_inflight_limit(self):
+        """Es sollten nie mehr Anfragen gleichzeitig laufen als erlaubt."""
+        service = NexusService(max_batch_size=8, batch_window_ms=10)
+        service._inflight = asyncio.Semaphore(2)
+        running = peak = 0
+
+        async def handler(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return self._response(request.query)
+
+        service._generate_solution = handler
+
+        await asyncio.gather(*(service.generate_solution(NexusRequest(query=f"L{i}")) for i in range(6)))
+
+        assert peak == 2
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_batching_disabled_by_default(self):
+        """Ohne Batch-Größe sollte die Anfrage direkt ausgeführt werden."""
+        service = NexusService()
+
+        async def handler(request):
+            return self._response(request.query)
+
+        service._generate_solution = handler
+
+        assert (await service.generate_solution(NexusRequest(query="Q"))).solution == "Q"
+        assert service._batch_worker_task is None
+
+
+class TestResponseCache:
+    """Tests für den Cache vollständiger Nexus-Antworten."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_are_cached(self):
+        """Identische Anfragen sollten nur einmal generiert werden."""
+        service = NexusService()
+        calls = []
+
+        async def handler(request):
+            calls.append(request.query)
+            return NexusResponse(solution=request.query, steps=[], model="test", processing_time=5.0)
+
+        service._generate_solution = handler
+
+        first = await service.generate_solution(NexusRequest(query="Q"))
+        second = await service.generate_solution(NexusRequest(query="Q"))
+        await service.generate_solution(NexusRequest(query="Q", goals=["anders"]))
+
+        assert calls == ["Q", "Q"]
+        assert second.solution == first.solution
+        assert second.processing_time < first.processing_time
+
+    @pytest.mark.asyncio
+    async def test_solution_and_analysis_cached_separately(self):
+        """Lösung und Analyse derselben Anfrage dürfen sich keinen Eintrag teilen."""
+        service = NexusService()
+
+        async def solve(request):
+            return NexusResponse(solution="lösung", steps=[], model="test")
+
+        async def analyze(request):
+            return NexusResponse(solution="analyse", steps=[], model="test")
+
+        service._generate_solution = solve
+        service._analyze_problem = analyze
+
+        assert (await service.generate_solution(NexusRequest(query="Q"))).solution == "lösung"
+        assert (await service.analyze_problem(NexusRequest(query="Q"))).solution == "analyse"
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_hit_for_rephrased_query(self):
+        """Umformulierte Anfragen sollten über den semantischen Cache beantwortet werden."""
+        service = NexusService()
+        vocabulary = ("klima", "wandel", "folgen", "energie")
+        service._semantic_cache = SemanticCache(
+            lambda text: [float(text.lower().split().count(word)) for word in vocabulary]
+        )
+        calls = []
+
+        async def handler(request):
+            calls.append(request.query)
+            return NexusResponse(solution=request.query, steps=[], model="test")
+
+        service._generate_solution = handler
+        service._analyze_problem = handler
+
+        await service.generate_solution(NexusRequest(query="Klima Wandel Folgen"))
+        hit = await service.generate_solution(NexusRequest(query="Folgen Wandel Klima"))
+        await service.generate_solution(NexusRequest(query="Energie"))
+        await service.analyze_problem(NexusRequest(query="Klima Wandel Folgen"))
+
+        assert hit.solution == "Klima Wandel Folgen"
+        assert calls == ["Klima Wandel Folgen", "Energie", "Klima Wandel Folgen"]
+
+
+class TestWarmup:
+    """Tests für das Vorwärmen beim Start."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_prepares_templates_and_session(self):
+        """warmup sollte Templates zerlegen und die Session öffnen, ohne Testanfrage."""
+        service = NexusService()
+        _compile_template.cache_clear()
+        pings = []
+
+        async def is_available():
+            pings.append(True)
+            return True
+
+        service.is_available = is_available
+        await service.warmup(ping=False)
+
+        assert _compile_template.cache_info().currsize == len(service.templates)
+        assert service.api_client._session is not None
+        assert pings == []
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_warmup_ping(self):
+        """Mit ping=True sollte eine Testanfrage gesendet werden."""
+        service = NexusService()
+        pings = []
+
+        async def is_available():
+            pings.append(True)
+            return True
+
+        service.is_available = is_available
+        await service.warmup(ping=True)
+
+        assert pings == [True]
+        await service.close()
+
+
+class TestBulkAnalyze:
+    """Tests für die Sammelanalyse mehrerer Probleme."""
+
+    @staticmethod
+    def _provider(answer, requests=None):
+        """Erster Anbieter der Analyse-Reihe, der die gepackte Anfrage aufzeichnet."""
+        async def provider(request):
+            if requests is not None:
+                requests.append(request)
+            return NexusResponse(solution=answer(request.query), steps=[], model="test-model", model_used="Test")
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_splits_combined_answer(self):
+        """Eine Antwort mit Trennzeichen sollte auf die Anfragen verteilt werden."""
+        service = NexusService()
+        requests = []
+        service._analyze_with_perplexity = self._provider(
+            lambda prompt: "# Analyse A\n- Punkt eins\n---END---\n# Analyse B\n---END---\n", requests
+        )
+
+        results = await service.bulk_analyze([
+            NexusRequest(query="A", goals=["Ziel A"], max_tokens=500),
+            NexusRequest(query="B", context="K", max_tokens=800),
+        ])
+
+        assert len(requests) == 1
+        prompt = requests[0].query
+        assert "## Problem 2\nB" in prompt and "### Kontext\nK" in prompt
+        assert "### Ziele\n- Ziel A" in prompt
+        # Jede Analyse ist auf das kleinste Budget der Gruppe begrenzt
+        assert "höchstens 500 Tokens" in prompt and requests[0].max_tokens == 1000
+        assert [r.solution.splitlines()[0] for r in results] == ["# Analyse A", "# Analyse B"]
+        assert results[0].steps == ["Analyse A", "Punkt eins"]
+        assert results[0].model == "test-model" and results[0].model_used == "Test"
+
+    @pytest.mark.asyncio
+    async def test_chunks_large_batches(self):
+        """Mehr als BULK_MAX_ROWS Anfragen sollten auf mehrere Prompts verteilt werden."""
+        service = NexusService()
+        requests = []
+        service._analyze_with_perplexity = self._provider(
+            lambda prompt: "\n---END---\n".join(f"Analyse {i}" for i in range(prompt.count("## Problem "))),
+            requests
+        )
+
+        results = await service.bulk_analyze([NexusRequest(query=f"Q{i}") for i in range(BULK_MAX_ROWS + 2)])
+
+        assert len(requests) == 2
+        assert len(results) == BULK_MAX_ROWS + 2
+
+    @pytest.mark.asyncio
+    async def test_uses_provider_fallbacks(self, monkeypatch):
+        """Die Sammelanalyse sollte wie analyze_problem auf den nächsten Anbieter ausweichen."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", False)
+        service = NexusService()
+
+        async def failing(request):
+            raise RuntimeError("Perplexity fehlgeschlagen")
+
+        service._analyze_with_perplexity = failing
+        service._analyze_with_o1_mini = self._provider(lambda prompt: "A\n---END---\nB")
+
+        results = await service.bulk_analyze([NexusRequest(query="A"), NexusRequest(query="B")])
+
+        assert [r.solution for r in results] == ["A", "B"]
+        assert service._breakers["_analyze_with_perplexity"]._failures == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_analysis(self):
+        """Passt die Anzahl der Antworten nicht, sollte einzeln analysiert werden."""
+        service = NexusService()
+        service._analyze_with_perplexity = self._provider(lambda prompt: "Nur eine Antwort ohne Trennzeichen")
+
+        async def analyze(request):
+            return NexusResponse(solution=f"einzeln {request.query}", steps=[], model="test")
+
+        service._analyze_problem = analyze
+
+        results = await service.bulk_analyze([NexusRequest(query="A"), NexusRequest(query="B")])
+
+        assert [r.solution for r in results] == ["einzeln A", "einzeln B"]
+
+
+class TestFallbacks:
+    """Tests für die Fallback-Reihe der Anbieter."""
+
+    @staticmethod
+    def _provider(name, delay=0.0, fail=False, calls=None):
+        async def provider(request):
+            if calls is not None:
+                calls.append(name)
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError(f"{name} fehlgeschlagen")
+            return NexusResponse(solution=name, steps=[], model=name)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_hedged_fallback_starts_after_delay(self, monkeypatch):
+        """Ein langsamer Anbieter sollte nach der Verzögerung vom nächsten überholt werden."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", True)
+        monkeypatch.setattr(api_config, "FALLBACK_HEDGE_DELAY", 0.05)
+        service = NexusService()
+        service._generate_with_perplexity = self._provider("perplexity", delay=5)
+        service._generate_with_o1_mini = self._provider("o1")
+
+        start = asyncio.get_running_loop().time()
+        response = await service._generate_solution(NexusRequest(query="Q"))
+
+        assert response.solution == "o1"
+        assert asyncio.get_running_loop().time() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_strict_fallback_is_sequential(self, monkeypatch):
+        """Ohne Hedging sollten Anbieter erst nach einem Fehler nacheinander versucht werden."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", False)
+        service = NexusService()
+        calls = []
+        service._analyze_with_perplexity = self._provider("perplexity", fail=True, calls=calls)
+        service._analyze_with_o1_mini = self._provider("o1", calls=calls)
+        service._analyze_with_4o_mini = self._provider("4o", calls=calls)
+
+        response = await service._analyze_problem(NexusRequest(query="Q"))
+
+        assert response.solution == "o1"
+        assert calls == ["perplexity", "o1"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("hedged", [True, False])
+    async def test_all_providers_failing_raises(self, monkeypatch, hedged):
+        """Scheitern alle Anbieter, sollte eine Exception ausgelöst werden."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", hedged)
+        service = NexusService()
+        service._generate_with_perplexity = self._provider("perplexity", fail=True)
+        service._generate_with_o1_mini = self._provider("o1", fail=True)
+        service._generate_with_4o_mini = self._provider("4o", fail=True)
+
+        with pytest.raises(Exception):
+            await service._generate_solution(NexusRequest(query="Q"))
+
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_provider(self, monkeypatch):
+        """Nach wiederholten Fehlern sollte ein Anbieter sofort übersprungen werden."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", False)
+        monkeypatch.setattr(api_config, "CIRCUIT_BREAKER_THRESHOLD", 2)
+        service = NexusService()
+        calls = []
+        service._generate_with_perplexity = self._provider("perplexity", fail=True, calls=calls)
+        service._generate_with_o1_mini = self._provider("o1", calls=calls)
+
+        for _ in range(3):
+            response = await service._generate_solution(NexusRequest(query="Q"))
+            assert response.solution == "o1"
+
+        assert calls == ["perplexity", "o1", "perplexity", "o1", "o1"]
+
+    @pytest.mark.asyncio
+    async def test_analysis_failures_keep_solution_providers(self, monkeypatch):
+        """Fehlschlagende Analysen sollten die Lösungs-Anbieter nicht sperren."""
+        monkeypatch.setattr(api_config, "NEXUS_HEDGED_FALLBACK", False)
+        monkeypatch.setattr(api_config, "CIRCUIT_BREAKER_THRESHOLD", 2)
+        service = NexusService()
+        service._analyze_with_perplexity = self._provider("perplexity", fail=True)
+        service._generate_with_perplexity = self._provider("perplexity", fail=True)
+        service._generate_with_o1_mini = self._provider("o1")
+
+        for _ in range(3):
+            with pytest.raises(Exception):
+                await service._analyze_problem(NexusRequest(query="Q"))
+
+        response = await service._generate_solution(NexusRequest(query="Q"))
+        assert response.solution == "o1"
+        assert "_analyze_with_o1_mini" not in service._breakers
+
+
+class TestServiceStatus:
+    """Tests für Statusabfrage und Verfügbarkeitsprüfung."""
+
+    @pytest.mark.asyncio
+    async def test_probes_run_in_parallel_with_timeout(self, monkeypatch):
+        """Probes sollten parallel laufen; hängende Probes gelten nach dem Zeitlimit als nicht verfügbar."""
+        for name, value in {
+            "PERPLEXITY_API_KEY": "key",
+            "OPENAI_API_KEY": "key",
+            "ENABLE_MODEL_FALLBACK": True,
+            "IS_CORE_ENABLED": True,
+            "ENABLE_INSIGHT_CORE_FALLBACK": True,
+            "STATUS_PROBE_TIMEOUT": 0.3,
+        }.items():
+            monkeypatch.setattr(api_config, name, value)
+        service = NexusService()
+        pinged = []
+
+        async def ping(url, api_key=None):
+            pinged.append(url)
+            if url == api_config.IS_CORE_ENDPOINT:
+                await asyncio.sleep(5)
+            await asyncio.sleep(0.2)
+            return True
+
+        service._ping = ping
+
+        start = asyncio.get_running_loop().time()
+        status = await service.get_service_status()
+
+        assert asyncio.get_running_loop().time() - start < 0.6
+        assert len(pinged) == 3
+        assert status["perplexity_available"] and status["primary_model_available"]
+        assert status["fallback_model_available"]
+        assert not status["is_core_available"]
+        assert status["online"]
+
+    @pytest.mark.asyncio
+    async def test_is_available_uses_recent_success(self, monkeypatch):
+        """Nach einer erfolgreichen Modellantwort sollte is_available ohne Ping True liefern."""
+        monkeypatch.setattr(api_config, "NEXUS_AVAILABILITY_TTL", 30)
+        service = NexusService()
+        pinged = []
+
+        async def ping(url, api_key=None):
+            pinged.append(url)
+            return False
+
+        async def provider(request):
+            return NexusResponse(solution="ok", steps=[], model="test")
+
+        service._ping = ping
+        service._provider_keys = {"perplexity": "pplx", "o1_mini": "sk", "4o_mini": "sk"}
+        service._generate_with_perplexity = provider
+
+        assert not await service.is_available()
+        assert sorted(pinged) == [f"{api_config.OPENAI_API_BASE}/models", "https://api.perplexity.ai"]
+
+        await service._generate_solution(NexusRequest(query="Q"))
+        pinged.clear()
+        assert await service.is_available()
+        assert pinged == []
+
+
+class TestAnalyzeAndSolve:
+    """Tests für die kombinierte Lösung und Analyse."""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_parallel(self):
+        """Lösung und Analyse sollten gleichzeitig statt nacheinander laufen."""
+        service = NexusService()
+
+        async def slow(kind):
+            await asyncio.sleep(0.2)
+            return NexusResponse(solution=kind, steps=[], model="test")
+
+        service._generate_solution = lambda request: slow("lösung")
+        service._analyze_problem = lambda request: slow("analyse")
+
+        start = asyncio.get_running_loop().time()
+        solution, analysis = await service.analyze_and_solve(NexusRequest(query="Q"))
+
+        assert (solution.solution, analysis.solution) == ("lösung", "analyse")
+        assert asyncio.get_running_loop().time() - start < 0.35
+
+
+class TestOpenAIClients:
+    """Tests für die wiederverwendeten OpenAI-kompatiblen Clients."""
+
+    @pytest.mark.asyncio
+    async def test_clients_are_cached_and_share_pool(self):
+        """Clients sollten pro Key/URL wiederverwendet werden und einen Pool teilen."""
+        service = NexusService()
+
+        first = service._get_openai_client("key-a")
+        assert service._get_openai_client("key-a") is first
+
+        perplexity = service._get_openai_client("key-a", base_url="https://api.perplexity.ai")
+        assert perplexity is not first
+        assert first._client is perplexity._client is service._http_client
+
+        await service.close()
+        assert service._http_client is None
+        assert not service._openai_clients
+
+    @pytest.mark.asyncio
+    async def test_provider_clients_use_keys_read_once(self, monkeypatch):
+        """Anbieter-Clients sollten die beim Start gelesenen Keys verwenden."""
+        monkeypatch.setenv("PERPLEXITY_API_KEY", "pplx-key")
+        monkeypatch.delenv("O1_MINI_API_KEY", raising=False)
+        service = NexusService()
+        monkeypatch.setenv("PERPLEXITY_API_KEY", "other-key")
+
+        client = service._provider_client("perplexity")
+        assert client is service._provider_client("perplexity")
+        assert client.api_key == "pplx-key"
+        assert str(client.base_url).startswith("https://api.perplexity.ai")
+
+        with pytest.raises(ValueError, match="O1_MINI_API_KEY"):
+            service._provider_client("o1_mini")
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_provider_calls_do_not_block_event_loop(self):
+        """Gleichzeitige Modellaufrufe sollten sich überlappen statt die Event-Loop zu blockieren."""
+        service = NexusService()
+
+        async def create(**kwargs):
+            await asyncio.sleep(0.2)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="# Lösung"))],
+                usage=SimpleNamespace(total_tokens=3),
+            )
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        service._provider_client = lambda provider: client
+
+        start = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            *(service._generate_with_4o_mini(NexusRequest(query=f"Q{i}")) for i in range(5))
+        )
+
+        assert [r.solution for r in results] == ["# Lösung"] * 5
+        assert asyncio.get_running_loop().time() - start < 0.5
+
+
+class TestExtractSteps:
+    """Tests für das Extrahieren von Schritten aus Markdown."""
+
+    def test_headings_and_lists(self, nexus_service):
+        """Überschriften, nummerierte und Aufzählungslisten sollten erkannt werden."""
+        text = (
+            "# Einleitung\n"
+            "Ein Absatz ohne Schritt.\n"
+            "## Analyse des Problems  \r\n"
+            "   1. Anforderungen definieren\n"
+            "* Prototyp bauen\n"
+            "- ok\n"
+            "#\n"
+            "Folgezeile\n"
+        )
+
+        assert nexus_service._extract_steps(text, "solution") == [
+            "Analyse des Problems",
+            "1. Anforderungen definieren",
+            "Prototyp bauen",
+        ]
+
+    def test_stops_at_max_steps(self, nexus_service):
+        """Mit max_steps sollte die Suche nach genügend Schritten abbrechen."""
+        text = "\n".join(f"- Schritt {i}" for i in range(100))
+
+        assert nexus_service._extract_steps(text, "solution", max_steps=10) == [f"Schritt {i}" for i in range(10)]
+        assert len(nexus_service._extract_steps(text, "solution")) == 100
+
+    def test_default_steps(self, nexus_service):
+        """Ohne erkennbare Schritte sollten die Standard-Schritte des Modus geliefert werden."""
+        assert nexus_service._extract_steps("Freitext", "analysis")[0] == "Problemanalyse"
+        assert nexus_service._extract_steps("Analyse einer Lösung", "solution")[0] == "Problemdefinition"
+
+
+class TestStreaming:
+    """Tests für gestreamte Lösungen."""
+
+    @pytest.mark.asyncio
+    async def test_partial_responses_per_block(self, nexus_service):
+        """Nach jedem abgeschlossenen Block sollte eine Teilantwort mit Schritten folgen."""
+        chunks = ["# Schritt", " eins\n\nText", "\n\n- Schritt zwei", "\n- Schritt drei"]
+
+        async def fake_stream(prompt, model=None):
+            for chunk in chunks:
+                yield chunk
+
+        nexus_service.api_client.stream_openai_answer = fake_stream
+
+        responses = [r async for r in nexus_service.stream_solution(NexusRequest(query="Q"))]
+
+        assert [r.steps for r in responses] == [
+            ["Schritt eins"],
+            ["Schritt eins"],
+            ["Schritt eins", "Schritt zwei", "Schritt drei"],
+        ]
+        assert responses[-1].solution == "".join(chunks)
+        assert responses[-1].processing_time is not None
+
+    @pytest.mark.asyncio
+    async def test_prompt_with_shipped_templates(self):
+        """Mit der ausgelieferten Template-Datei sollte der Prompt die Anfrage enthalten."""
+        service = NexusService()
+        assert "solution_prompt" not in service.templates
+        prompts = []
+
+        async def fake_stream(prompt, model=None):
+            prompts.append(prompt)
+            yield "Antwort"
+
+        service.api_client.stream_openai_answer = fake_stream
+
+        responses = [r async for r in service.stream_solution(NexusRequest(query="Testproblem"))]
+
+        assert responses[-1].solution == "Antwort"
+        assert "Testproblem" in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_delta_events(self, nexus_service):
+        """Jedes Fragment sollte sofort als Delta mit den neu gefundenen Schritten folgen."""
+        chunks = ["# Schritt", " eins\n\nText", "\n\n- Schritt zwei"]
+
+        async def fake_stream(prompt, model=None):
+            for chunk in chunks:
+                yield chunk
+
+        nexus_service.api_client.stream_openai_answer = fake_stream
+
+        events = [e async for e in nexus_service.stream_analysis_deltas(NexusRequest(query="Q"))]
+
+        assert [e["delta"] for e in events] == chunks + [""]
+        assert [e["partial_steps"] for e in events] == [None, ["Schritt eins"], [], ["Schritt zwei"]]
+        assert events[-1]["done"] and "processing_time" in events[-1]
+
+    @pytest.mark.asyncio
+    async def test_delta_prompt_with_shipped_templates(self):
+        """Auch der Delta-Stream sollte mit der ausgelieferten Template-Datei einen vollständigen Prompt senden."""
+        service = NexusService()
+        prompts = []
+
+        async def fake_stream(prompt, model=None):
+            prompts.append(prompt)
+            yield "Antwort"
+
+        service.api_client.stream_openai_answer = fake_stream
+
+        events = [e async for e in service.stream_analysis_deltas(NexusRequest(query="Testproblem"))]
+
+        assert events[-1]["done"]
+        assert "Testproblem" in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_empty_prompt_is_not_sent(self, nexus_service):
+        """Ein leeres Template sollte einen Fehler auslösen statt einen leeren Prompt zu senden."""
+        nexus_service.templates = {"leer": ""}
+        nexus_service.api_client.stream_openai_answer = None
+
+        with pytest.raises(ValueError):
+            async for _ in nexus_service._stream_deltas("leer", NexusRequest(query="Q")):
+                pass
+
+
+class TestDemo:
+    """Tests für die Demo-Antworten."""
+
+    @pytest.mark.asyncio
+    async def test_demo_without_delay(self, nexus_service):
+        """Ohne konfigurierte Verzögerung sollten Demo-Antworten sofort zurückkommen."""
+        start = asyncio.get_running_loop().time()
+
+        solution = await nexus_service.generate_demo_solution(NexusRequest(query="Q"))
+        analysis = await nexus_service.generate_demo_analysis(NexusRequest(query="Q"))
+
+        assert "Q" in solution.solution and "Q" in analysis.solution
+        assert asyncio.get_running_loop().time() - start < 0.5
@@ -0,0 +1,140 @@
+"""
+Tests für den Leistungsoptimierer der Vektordatenbank.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from ..db.performance_optimizer import PerformanceOptimizer, monitor_performance
+
+
+class TestPerformanceOptimizer:
+    """Testsuite für die Metrikerfassung des PerformanceOptimizer."""
+
+    @pytest.fixture
+    def optimizer(self):
+        """Erstellt einen Optimierer mit kleiner Historie und ohne Hintergrund-Thread."""
+        return PerformanceOptimizer(
+            vector_db=MagicMock(),
+            metrics_history_size=3,
+            enable_auto_optimization=False
+        )
+
+    async def _record(self, optimizer, query_type, execution_time, result_count=1):
+        await optimizer.record_query(
+            query_type=query_type,
+            start_time=0.0,
+            end_time=execution_time,
+            result_count=result_count,
+            vector_dimension=384,
+            query_params={}
+        )
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self, optimizer):
+        """Die Historie behält nur die neuesten Metriken."""
+        for execution_time in (0.1, 0.2, 0.3, 0.4):
+            await self._record(optimizer, "search", execution_time)
+
+        assert [m.execution_time for m in optimizer.query_metrics] == [0.2, 0.3, 0.4]
+        stats = optimizer.get_statistics()
+        assert stats["total_queries"] == 4
+        assert stats["avg_query_time"] == pytest.approx(0.3)
+
+    @pytest.mark.asyncio
+    async def test_statistics_by_type_follow_eviction(self, optimizer):
+        """Kennzahlen pro Typ berücksichtigen herausgefallene Metriken, auch Minimum und Maximum."""
+        await self._record(optimizer, "search", 0.9, result_count=5)
+        await self._record(optimizer, "add", 0.2)
+        await self._record(optimizer, "search", 0.3, result_count=1)
+        await self._record(optimizer, "search", 0.5, result_count=3)
+
+        by_type = optimizer.get_statistics()["metrics_by_type"]
+        assert by_type["search"] == {
+            "count": 2,
+            "avg_time": pytest.approx(0.4),
+            "max_time": 0.5,
+            "min_time": 0.3,
+            "avg_result_count": 2
+        }
+        assert by_type["add"]["count"] == 1
+
+        # Nach dem Herausfallen der letzten add-Metrik erscheint der Typ nicht mehr
+        await self._record(optimizer, "search", 0.1)
+        assert "add" not in optimizer.get_statistics()["metrics_by_type"]
+
+    @pytest.mark.asyncio
+    async def test_auto_optimization_runs_on_event_loop(self):
+        """Die automatische Optimierung läuft als Task auf dem Event-Loop und lässt sich beenden."""
+        optimizer = PerformanceOptimizer(
+            vector_db=MagicMock(),
+            optimization_interval=0,
+            enable_auto_optimization=True
+        )
+        calls = []
+
+        async def fake_optimize(force=False):
+            calls.append(force)
+
+        optimizer.optimize_database = fake_optimize
+        await asyncio.sleep(0.01)
+        await optimizer.stop()
+
+        assert calls
+        assert optimizer._optimizer_task is None
+
+    @pytest.mark.asyncio
+    async def test_memory_alert_optimizes_once(self, optimizer):
+        """Parallele Abfragen bei hoher Speicherauslastung lösen nur eine Optimierung aus."""
+        optimizer.memory_alert_threshold = -1.0
+        optimizer._last_optimization_at = time.monotonic() - 3600
+        calls = []
+
+        async def fake_optimize(force=False):
+            calls.append(force)
+            await asyncio.sleep(0)
+            optimizer._last_optimization_at = time.monotonic()
+
+        optimizer.optimize_database = fake_optimize
+        await asyncio.gather(*(self._record(optimizer, "search", 0.1) for _ in range(5)))
+
+        assert calls == [True]
+
+
+class TestMonitorPerformance:
+    """Testsuite für den Decorator monitor_performance."""
+
+    @pytest.mark.asyncio
+    async def test_records_search_metrics(self):
+        """Suchanfragen werden mit Anfrage und Trefferzahl aufgezeichnet."""
+
+        class FakeDB:
+            def __init__(self):
+                self.performance_optimizer = MagicMock()
+                self.performance_optimizer.record_query = AsyncMock()
+
+            @monitor_performance("search")
+            async def search(self, query, limit=5):
+                return MagicMock(results=[1, 2, 3])
+
+        db = FakeDB()
+        await db.search("Berlin", limit=3)
+
+        kwargs = db.performance_optimizer.record_query.await_args.kwargs
+        assert kwargs["query_type"] == "search"
+        assert kwargs["result_count"] == 3
+        assert kwargs["query_params"] == {"query": "Berlin", "limit": 3}
+        assert FakeDB.search.__name__ == "search"
+
+    @pytest.mark.asyncio
+    async def test_without_optimizer(self):
+        """Ohne Optimierer liefert die Methode nur ihr Ergebnis."""
+
+        class FakeDB:
+            @monitor_performance("delete")
+            async def delete(self, doc_id):
+                return True
+
+        assert await FakeDB().delete("doc_1") is True
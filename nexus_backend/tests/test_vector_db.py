@@ -8,6 +8,8 @@ import tempfile
 import shutil
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 from ..db.vector_db import VectorDB
 from ..models.schemas import DocumentCreate, MetadataBase, DocumentResponse
 
@@ -170,4 +172,131 @@ class TestVectorDB:
                 assert isinstance(result, DocumentResponse)
                 assert result.content == "Dies ist ein aktualisiertes Testdokument"
                 assert result.metadata.source_name == "Test aktualisiert"
-                assert "aktualisiert" in result.metadata.tags 
\ No newline at end of file
+                assert "aktualisiert" in result.metadata.tags 
+
+class _FakeModel:
+    """Sentence-Transformers-Ersatz: Embedding aus Textlänge und Wortanzahl."""
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=False):
+        vectors = np.array([[float(len(text)), float(len(text.split()))] for text in texts])
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+class _FakeCollection:
+    """Minimale ChromaDB-Collection, die Aufrufe aufzeichnet."""
+
+    def __init__(self, metadata=None, count=0):
+        self.metadata = metadata
+        self._count = count
+        self.batches = []
+        self.queries = []
+
+    def count(self):
+        return self._count
+
+    def modify(self, metadata):
+        self.metadata = metadata
+
+    def add(self, ids, documents, embeddings, metadatas):
+        self.batches.append(list(ids))
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {"ids": [["d1"]], "documents": [["Inhalt"]], "metadatas": [[{"quelle": "test"}]], "distances": [[0.1]]}
+
+
+class _FakeClient:
+    """Minimaler ChromaDB-Client ohne Angabe einer Batch-Obergrenze."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_or_create_collection(self, name, embedding_function, metadata):
+        return self.collection
+
+
+class TestVectorDBWithFakeClient:
+    """Tests der VectorDB gegen einen Client-Ersatz (ohne Modell und Datenbank)."""
+
+    @pytest.fixture
+    def make_db(self, tmp_path):
+        def make(client, **kwargs):
+            with patch("nexus_backend.db.vector_db.chromadb.PersistentClient", return_value=client), \
+                    patch("nexus_backend.db.vector_db._load_sentence_transformer", return_value=_FakeModel()):
+                return VectorDB(persist_directory=str(tmp_path), **kwargs)
+        return make
+
+    @staticmethod
+    def _documents(count):
+        return [{"id": f"d{i}", "content": f"Text {i}"} for i in range(count)]
+
+    def test_uses_client_batch_limit(self, make_db):
+        """get_max_batch_size() des Clients sollte Vorrang vor dem Attribut haben."""
+        client = _FakeClient(_FakeCollection())
+        client.get_max_batch_size = lambda: 2
+        client.max_batch_size = 99
+        db = make_db(client)
+
+        db.add_documents(self._documents(5))
+
+        assert client.collection.batches == [["d0", "d1"], ["d2", "d3"], ["d4"]]
+
+    def test_falls_back_to_batch_size_attribute(self, make_db):
+        """Ohne get_max_batch_size() sollte das Attribut max_batch_size gelten."""
+        client = _FakeClient(_FakeCollection())
+        client.max_batch_size = 3
+        db = make_db(client)
+
+        db.add_documents(self._documents(5))
+
+        assert [len(batch) for batch in client.collection.batches] == [3, 2]
+
+    def test_default_batch_size(self, make_db):
+        """Nennt der Client keine Obergrenze, sollte nie alles in einem Aufruf eingefügt werden."""
+        client = _FakeClient(_FakeCollection())
+        db = make_db(client)
+
+        db.add_documents(self._documents(250))
+
+        assert [len(batch) for batch in client.collection.batches] == [100, 100, 50]
+
+    def test_empty_collection_is_normalized(self, make_db):
+        """Eine leere Collection sollte markiert und mit normierten Embeddings befüllt werden."""
+        collection = _FakeCollection(metadata={"hnsw:space": "l2"})
+        db = make_db(_FakeClient(collection))
+
+        assert collection.metadata == {VectorDB.NORMALIZATION_KEY: "l2"}
+        assert db.embeddings.normalize
+        assert np.isclose(np.linalg.norm(db.embeddings.embed_query("ein Text")), 1.0)
+
+    def test_filled_unmarked_collection_is_not_normalized(self, make_db):
+        """Bestehende, nicht markierte Collections sollten unverändert bleiben."""
+        collection = _FakeCollection(metadata={"description": "alt"}, count=3)
+        db = make_db(_FakeClient(collection))
+
+        assert collection.metadata == {"description": "alt"}
+        assert not db.embeddings.normalize
+
+    def test_search_cache_returns_copies(self, make_db):
+        """Wiederholte Suchen sollten aus dem Cache kommen, ohne dass Änderungen durchschlagen."""
+        collection = _FakeCollection()
+        db = make_db(_FakeClient(collection), search_cache_size=4)
+
+        first = db.search("Wie hoch ist der Preis?")
+        first["documents"][0].append("geändert")
+        second = db.search("Wie hoch ist der Preis?")
+
+        assert len(collection.queries) == 1
+        assert second["documents"] == [["Inhalt"]]
+
+    def test_search_without_cache_queries_by_text(self, make_db):
+        """Ohne Cache (Standard) sollte jede Suche die Collection direkt abfragen."""
+        collection = _FakeCollection()
+        db = make_db(_FakeClient(collection))
+
+        db.search("Frage")
+        db.search("Frage")
+
+        assert [query["query_texts"] for query in collection.queries] == [["Frage"], ["Frage"]]
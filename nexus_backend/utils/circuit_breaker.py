@@ -0,0 +1,66 @@
+"""
+Circuit Breaker für Aufrufe externer Anbieter.
+Nach mehreren Fehlern in Folge wird ein Anbieter für eine Abkühlzeit übersprungen,
+statt bei jeder Anfrage erneut auf dessen Timeout zu warten.
+"""
+
+import time
+
+
+class ProviderUnavailable(Exception):
+    """Der Anbieter wird übersprungen, weil sein Circuit Breaker offen ist."""
+
+
+class CircuitBreaker:
+    """
+    Einfacher Circuit Breaker mit den Zuständen geschlossen, offen und halb offen.
+
+    Nach failure_threshold Fehlern in Folge öffnet der Breaker. Nach reset_timeout
+    Sekunden wird genau ein Probeaufruf durchgelassen (halb offen): Gelingt er,
+    schließt der Breaker wieder, sonst bleibt er für weitere reset_timeout Sekunden offen.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._failures < self.failure_threshold:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Prüft, ob ein Aufruf erlaubt ist; im halb offenen Zustand nur ein Probeaufruf"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        """Ein erfolgreicher Aufruf schließt den Breaker"""
+        self._failures = 0
+        self._probing = False
+
+    def record_cancelled(self):
+        """Ein abgebrochener Aufruf zählt nicht als Fehler, gibt aber den Probeaufruf frei"""
+        self._probing = False
+
+    def record_failure(self):
+        """Zählt einen Fehler und öffnet den Breaker beim Erreichen des Schwellwerts"""
+        self._failures += 1
+        self._probing = False
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
@@ -0,0 +1,10 @@
+"""
+HTTP-Hilfsfunktionen für das Nexus-Backend.
+Prüft einmalig, ob httpx HTTP/2 verwenden kann (optionales Paket h2).
+"""
+
+try:
+    import h2  # noqa: F401  (HTTP/2-Unterstützung für httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
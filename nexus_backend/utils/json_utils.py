@@ -0,0 +1,35 @@
+"""
+JSON-Hilfsfunktionen für das Nexus-Backend.
+Verwendet orjson, falls installiert, und fällt sonst auf das json-Modul der Standardbibliothek zurück.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialisiert ein Objekt als UTF-8-kodiertes JSON (mit sort_keys in stabiler Schlüsselreihenfolge)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialisiert ein Objekt als JSON-String."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Deserialisiert JSON aus Bytes oder einem String."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
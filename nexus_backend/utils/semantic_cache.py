@@ -0,0 +1,86 @@
+"""
+Semantischer Cache: findet gespeicherte Ergebnisse inhaltlich ähnlicher Anfragen
+über die Kosinus-Ähnlichkeit normierter Embeddings.
+"""
+
+import time
+from typing import Any, Callable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class SemanticCache:
+    """
+    Cache für inhaltlich gleiche Anfragen: Einträge werden über normierte Embeddings
+    gefunden und gelten als Treffer, wenn die Kosinus-Ähnlichkeit den Schwellwert
+    erreicht. Die Embeddings liegen in einer Matrix, die als Ringpuffer gefüllt
+    wird; eine Suche ist ein einziges Matrix-Vektor-Produkt.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[str], Any],
+        maxsize: int = 1024,
+        ttl: int = 3600,
+        threshold: float = 0.95
+    ):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Der semantische Cache benötigt numpy")
+        self.embed = embed
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._matrix = None  # wird beim ersten Eintrag mit der Embedding-Dimension angelegt
+        self._namespaces: List[Optional[str]] = [None] * maxsize
+        self._expires = np.zeros(maxsize, dtype=np.float64)
+        self._values: List[Any] = [None] * maxsize
+        self._next = 0
+        self._count = 0
+    
+    def embedding(self, text: str):
+        """Berechnet das normierte Embedding eines Textes (float32)"""
+        return self.normalize(self.embed(text))
+    
+    @staticmethod
+    def normalize(vector):
+        """Normiert ein bereits berechnetes Embedding auf Länge 1 (float32)"""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, namespace: str, embedding) -> Optional[Any]:
+        """Liefert den ähnlichsten gültigen Eintrag im Namensraum oder None"""
+        if self._count == 0:
+            return None
+        scores = self._matrix[:self._count] @ embedding
+        scores[self._expires[:self._count] < time.monotonic()] = -1.0
+        hits = np.flatnonzero(scores >= self.threshold)
+        for index in hits[np.argsort(-scores[hits])]:
+            if self._namespaces[index] == namespace:
+                return self._values[index]
+        return None
+    
+    def set(self, namespace: str, embedding, value: Any):
+        """Speichert einen Eintrag und überschreibt bei vollem Cache den ältesten"""
+        if self._matrix is None:
+            self._matrix = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.float32)
+        index = self._next
+        self._matrix[index] = embedding
+        self._namespaces[index] = namespace
+        self._expires[index] = time.monotonic() + self.ttl
+        self._values[index] = value
+        self._next = (index + 1) % self.maxsize
+        self._count = min(self._count + 1, self.maxsize)
+    
+    def clear(self):
+        self._namespaces = [None] * self.maxsize
+        self._values = [None] * self.maxsize
+        self._next = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
@@ -6,6 +6,8 @@ import sys
 import json
 import time
 import requests
+import shutil
+import socket
 import subprocess
 import signal
 import threading
@@ -30,7 +32,9 @@ MISTRAL_MODEL = "mistral"
 CONFIG_PATH = WORKSPACE_DIR / "shared_config.json"
 BACKEND_PORT = 8001
 BACKEND_URL = f"http://localhost:{BACKEND_PORT}"
-OLLAMA_API_URL = "http://localhost:11434/api"
+OLLAMA_HOST = "127.0.0.1"
+OLLAMA_PORT = 11434
+OLLAMA_API_URL = f"http://localhost:{OLLAMA_PORT}/api"
 
 # Backend-Prozess und Ollama-Prozess
 backend_process = None
@@ -51,9 +55,8 @@ def check_ollama_installed():
     """Prüft, ob Ollama installiert ist"""
     print_colored("Prüfe, ob Ollama installiert ist...", Colors.BLUE)
     try:
-        result = subprocess.run(['which', 'ollama'], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
+        # PATH direkt durchsuchen, statt dafür 'which' als Prozess zu starten
+        if shutil.which('ollama') is None:
             print_colored("Ollama ist nicht installiert. Bitte installiere Ollama von https://ollama.com", Colors.RED)
             print_colored("Anleitung: curl -fsSL https://ollama.com/install.sh | sh", Colors.YELLOW)
             return False
@@ -63,6 +66,14 @@ def check_ollama_installed():
         print_colored(f"Fehler beim Prüfen der Ollama-Installation: {e}", Colors.RED)
         return False
 
+def ollama_running():
+    """Prüft per TCP-Verbindung auf den Ollama-Port, ob der Ollama-Server läuft"""
+    try:
+        socket.create_connection((OLLAMA_HOST, OLLAMA_PORT), timeout=0.2).close()
+        return True
+    except OSError:
+        return False
+
 def start_ollama():
     """Startet Ollama im Hintergrund"""
     global ollama_process
@@ -70,14 +81,9 @@ def start_ollama():
     print_colored("Starte Ollama im Hintergrund...", Colors.BLUE)
     
     # Prüfe, ob Ollama bereits läuft
-    try:
-        response = requests.get(f"{OLLAMA_API_URL}/tags", timeout=2)
-        if response.status_code == 200:
-            print_colored("Ollama läuft bereits.", Colors.GREEN)
-            return True
-    except:
-        # Ollama läuft nicht, starte es
-        pass
+    if ollama_running():
+        print_colored("Ollama läuft bereits.", Colors.GREEN)
+        return True
     
     try:
         ollama_process = subprocess.Popen(
@@ -110,11 +116,16 @@ def check_mistral_model():
     try:
         response = requests.get(f"{OLLAMA_API_URL}/tags", timeout=5)
         if response.status_code == 200:
-            models = response.json().get("models", [])
-            for model in models:
-                if model.get("name") == MISTRAL_MODEL:
-                    print_colored("Mistral-Modell ist verfügbar.", Colors.GREEN)
-                    return True
+            # Ollama meldet Namen mit Tag (z.B. "mistral:latest"); verglichen wird
+            # daher sowohl mit dem vollen Namen als auch mit dem Namen ohne Tag
+            names = set()
+            for model in response.json().get("models", []):
+                name = model.get("name", "")
+                names.add(name)
+                names.add(name.split(":", 1)[0])
+            if MISTRAL_MODEL in names:
+                print_colored("Mistral-Modell ist verfügbar.", Colors.GREEN)
+                return True
             
             print_colored("Mistral-Modell nicht gefunden. Lade das Modell herunter...", Colors.YELLOW)
             print_colored("Dieser Vorgang kann einige Minuten dauern...", Colors.YELLOW)